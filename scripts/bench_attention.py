@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""FLOPs and latency of the cross-attention block vs a one-pass formulation of it.
+
+The one-pass variant scores ``X = [C, R]`` against ``[W | W with row halves swapped]``
+and pools both streams with one batched matmul. It gives the same outputs from the same
+weights, but the FLOPs are identical and on CPU TensorFlow it is not faster, so
+``build_model`` keeps the reference block; this script is here to re-check that on
+other backends.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from src.models.dual_attention_model import DualStreamConfig, build_model
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the cross-attention block")
+    parser.add_argument("--seq-length", type=int, default=100)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 32, 256])
+    parser.add_argument("--repeats", type=int, default=30)
+    return parser.parse_args()
+
+
+def _attention_flops(batch_size: int, seq_length: int, stream_dim: int, units: int) -> int:
+    """Multiply-adds x2 of the block's matmuls (the TF profiler does not count Einsum).
+
+    Reference: two (T x 2d) @ (2d x h) scorings + two (h x T) @ (T x 2d) pools.
+    One-pass: one (T x 2d) @ (2d x 2h) scoring + one (2h x T) @ (T x 2d) pool -- the same work.
+    """
+    scoring = 2 * seq_length * (2 * stream_dim) * units
+    pooling = 2 * units * seq_length * (2 * stream_dim)
+    return batch_size * 2 * (scoring + pooling)
+
+
+def _reference_block(dense: tf.keras.layers.Dense):
+    def block(c, r):
+        context_cross, response_cross = tf.concat([c, r], -1), tf.concat([r, c], -1)
+        cw, rw = tf.nn.softmax(dense(context_cross)), tf.nn.softmax(dense(response_cross))  # Dense applies tanh
+        return tf.einsum("bth,btd->bhd", cw, context_cross), tf.einsum("bth,btd->bhd", rw, response_cross)
+
+    return block
+
+
+def _one_pass_block(dense: tf.keras.layers.Dense):
+    kernel, bias = dense.kernel, dense.bias
+    stream_dim, units = kernel.shape[0] // 2, kernel.shape[1]
+
+    def block(c, r):
+        cross = tf.concat([c, r], -1)
+        swapped = tf.concat([kernel[stream_dim:], kernel[:stream_dim]], 0)
+        logits = tf.reshape(cross @ tf.concat([kernel, swapped], 1), (-1, tf.shape(cross)[1], 2, units)) + bias
+        weights = tf.reshape(tf.nn.softmax(tf.tanh(logits)), (-1, tf.shape(cross)[1], 2 * units))
+        pooled = tf.einsum("btw,btd->bwd", weights, cross)
+        response_vec = tf.concat([pooled[:, units:, stream_dim:], pooled[:, units:, :stream_dim]], -1)
+        return pooled[:, :units], response_vec
+
+    return block
+
+
+def _p50_ms(fn, *args, repeats: int) -> float:
+    fn(*args)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000)
+
+
+def main() -> None:
+    args = parse_args()
+    config = DualStreamConfig(seq_length=args.seq_length)
+    model = build_model(config, compile=False)
+    dense = next(layer for layer in model.layers if isinstance(layer, tf.keras.layers.Dense))
+    stream_dim = 2 * config.lstm_units
+    blocks = {"reference": tf.function(_reference_block(dense)), "one-pass": tf.function(_one_pass_block(dense))}
+    rng = np.random.default_rng(0)
+
+    for batch_size in args.batch_sizes:
+        streams = [tf.constant(rng.normal(size=(batch_size, args.seq_length, stream_dim)), tf.float32) for _ in range(2)]
+        expected = blocks["reference"](*streams)
+        flops = _attention_flops(batch_size, args.seq_length, stream_dim, dense.units)
+        row = [f"batch={batch_size:>4}  {flops / 1e6:8.1f} MFLOP"]
+        for name, block in blocks.items():
+            error = max(float(tf.reduce_max(tf.abs(a - b))) for a, b in zip(block(*streams), expected))
+            row.append(f"{name}: {_p50_ms(block, *streams, repeats=args.repeats):7.2f}ms (max abs diff {error:.1e})")
+        print("  ".join(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""CPU docs/s of the HuggingFace pipeline call vs BertSentimentBaseline's length-sorted batches."""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from transformers import pipeline
+
+from src.models.bert_baseline import BertSentimentBaseline
+
+VOCAB = "i look ugly awful great fine everyone stares at my skin nose face party friends happy sad never okay".split()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the BERT baseline on CPU")
+    parser.add_argument("--model", default="nlptown/bert-base-multilingual-uncased-sentiment", help="Hub id or local directory")
+    parser.add_argument("--cache-dir", default=None)
+    parser.add_argument("--local-files-only", action="store_true", help="Never touch the network")
+    parser.add_argument("--texts", type=int, default=512)
+    parser.add_argument("--max-words", type=int, default=120, help="Texts have 1..max-words words (skewed short)")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[8, 32])
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    rng = random.Random(0)
+    texts = [" ".join(rng.choice(VOCAB) for _ in range(1 + int(rng.paretovariate(1.2)) % args.max_words)) for _ in range(args.texts)]
+
+    baseline = BertSentimentBaseline(args.model, cache_dir=args.cache_dir, local_files_only=args.local_files_only)
+    legacy = pipeline("sentiment-analysis", model=baseline.model, tokenizer=baseline.tokenizer, device="cpu")
+    legacy(texts[:4])
+    start = time.perf_counter()
+    reference = [1.0 if out["label"].endswith(("4", "5")) else 0.0 for out in legacy(texts, truncation=True)]
+    legacy_s = time.perf_counter() - start
+    print(f"pipeline(list):          {len(texts) / legacy_s:8.1f} docs/s")
+
+    for batch_size in args.batch_sizes:
+        baseline.batch_size = batch_size
+        baseline.window = batch_size * 16
+        baseline.predict(texts[:4])
+        start = time.perf_counter()
+        scores = baseline.predict(texts)
+        elapsed = time.perf_counter() - start
+        print(
+            f"predict_stream batch={batch_size:<3}: {len(texts) / elapsed:8.1f} docs/s  "
+            f"x{legacy_s / elapsed:.1f}  same labels: {scores == reference}"
+        )
+
+
+if __name__ == "__main__":
+    main()
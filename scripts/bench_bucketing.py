@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Epoch time and inference latency: fixed seq_length padding vs length-bucketed masked batches."""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from src.models.bucketing import DEFAULT_BOUNDARIES, bucket_widths, make_bucketed_dataset, predict_bucketed
+from src.models.dual_attention_model import DualStreamConfig, build_model
+from src.utils import seed_everything
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark length bucketing")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--epochs", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--seq-length", type=int, default=100)
+    parser.add_argument("--min-tokens", type=int, default=5)
+    parser.add_argument("--max-tokens", type=int, default=20)
+    parser.add_argument("--predict-batch", type=int, default=256)
+    return parser.parse_args()
+
+
+def _padded(rng: np.random.Generator, rows: int, cfg: DualStreamConfig, lo: int, hi: int) -> np.ndarray:
+    lengths = rng.integers(lo, hi + 1, size=rows)
+    tokens = rng.integers(1, cfg.vocab_size, size=(rows, cfg.seq_length), dtype=np.int32)
+    tokens[np.arange(cfg.seq_length) < (cfg.seq_length - lengths)[:, None]] = 0
+    return tokens
+
+
+def main() -> None:
+    args = parse_args()
+    rng = np.random.default_rng(42)
+    fixed_cfg = DualStreamConfig(seq_length=args.seq_length)
+    masked_cfg = DualStreamConfig(seq_length=args.seq_length, mask_padding=True)
+    context = _padded(rng, args.rows, fixed_cfg, args.min_tokens, args.max_tokens)
+    response = _padded(rng, args.rows, fixed_cfg, args.min_tokens, args.max_tokens)
+    labels = rng.integers(0, 2, size=args.rows).astype(np.float32)
+    print(f"rows={args.rows} tokens/row={args.min_tokens}-{args.max_tokens} seq_length={args.seq_length}")
+
+    for mode, cfg in (("fixed", fixed_cfg), ("bucketed", masked_cfg)):
+        seed_everything(42)
+        model = build_model(cfg)
+        epoch_times = []
+        for _ in range(args.epochs):
+            start = time.perf_counter()
+            if mode == "fixed":
+                model.fit([context, response], labels, batch_size=args.batch_size, epochs=1, verbose=0)
+            else:
+                dataset = make_bucketed_dataset(context, response, labels, batch_size=args.batch_size, seed=42)
+                model.fit(dataset, epochs=1, verbose=0)
+            epoch_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        if mode == "fixed":
+            model.predict([context, response], batch_size=args.predict_batch, verbose=0)
+        else:
+            predict_bucketed(model, context, response, batch_size=args.predict_batch, boundaries=DEFAULT_BOUNDARIES)
+        predict_s = time.perf_counter() - start
+
+        single = [context[:1], response[:1]]
+        if mode == "bucketed":
+            longest = max(np.count_nonzero(single[0]), np.count_nonzero(single[1]))
+            width = int(bucket_widths(np.array([longest]), DEFAULT_BOUNDARIES, args.seq_length)[0])
+            single = [single[0][:, -width:], single[1][:, -width:]]
+        model.predict_on_batch(single)
+        latencies = []
+        for _ in range(50):
+            start = time.perf_counter()
+            model.predict_on_batch(single)
+            latencies.append(time.perf_counter() - start)
+
+        steady = epoch_times[1:] or epoch_times
+        print(
+            f"{mode:>9}: epoch {np.mean(steady):7.2f}s (first {epoch_times[0]:6.2f}s)  "
+            f"predict {args.rows / predict_s:9.1f} rows/s  single-request p50 {np.median(latencies) * 1000:6.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Peak-RSS comparison of whole-file vs streaming dataset ingestion (label + tokenize, plus one
+streamed training epoch)."""
+
+from __future__ import annotations
+
+import argparse
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+VOCAB = (
+    "I am not very really so ugly beautiful terribly bad good happy sad never fine awful "
+    "horrible extremely pretty nice great hate love friends party mirror skin face stare"
+).split()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark dataset ingestion peak RSS")
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--vocab-size", type=int, default=10_000)
+    parser.add_argument("--seq-length", type=int, default=100)
+    parser.add_argument("--mode", choices=["eager", "streaming"], help=argparse.SUPPRESS)
+    parser.add_argument("--csv", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def _write_csv(path: Path, rows: int) -> None:
+    rng = random.Random(42)
+    sentence = lambda lo, hi: " ".join(rng.choice(VOCAB) for _ in range(rng.randint(lo, hi)))  # noqa: E731
+    pd.DataFrame({"Context": [sentence(5, 60) for _ in range(rows)], "Response": [sentence(3, 25) for _ in range(rows)]}).to_csv(
+        path, index=False
+    )
+
+
+def _run_mode(args: argparse.Namespace) -> None:
+    from src.training.dataset import (
+        SPLIT_TRAIN,
+        add_rule_sentiment,
+        load_dataset,
+        load_streaming_corpus,
+        make_streaming_datasets,
+        spill_streaming_corpus,
+        tokenize_streams,
+    )
+
+    baseline_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    start = time.perf_counter()
+    if args.mode == "eager":
+        data = add_rule_sentiment(load_dataset(args.csv))
+        tokenize_streams(data["Context"], data["Response"], vocab_size=args.vocab_size, seq_length=args.seq_length)
+    else:
+        # Label + tokenize once into the per-split memmaps, then read one training epoch from them.
+        spill_dir = Path(args.csv).parent / "spill"
+        spill_streaming_corpus(
+            args.csv,
+            spill_dir,
+            vocab_size=args.vocab_size,
+            seq_length=args.seq_length,
+            chunk_size=args.chunk_size,
+            test_size=0.2,
+            validation_split=0.2,
+            random_state=42,
+        )
+        datasets = make_streaming_datasets(
+            load_streaming_corpus(spill_dir), batch_size=256, block_size=args.chunk_size, shuffle_buffer=10_000, seed=42
+        )
+        for _ in datasets[SPLIT_TRAIN]:
+            pass
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{args.mode:>9}: peak RSS {peak_mb:8.1f} MB (+{peak_mb - baseline_mb:7.1f} MB over imports)  wall {elapsed:7.1f}s")
+
+
+def main() -> None:
+    args = parse_args()
+    if args.mode:
+        _run_mode(args)
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "bench.csv"
+        _write_csv(csv_path, args.rows)
+        print(f"rows={args.rows} csv={csv_path.stat().st_size / 2**20:.1f} MB chunk_size={args.chunk_size}")
+        for mode in ("eager", "streaming"):
+            # Separate processes so each peak RSS is measured from a clean interpreter.
+            subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    "--mode",
+                    mode,
+                    "--csv",
+                    str(csv_path),
+                    "--chunk-size",
+                    str(args.chunk_size),
+                    "--vocab-size",
+                    str(args.vocab_size),
+                    "--seq-length",
+                    str(args.seq_length),
+                ],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Write and analytics-read cost of the binary session event log vs JSON-lines session logs."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.analysis import PilotStatsAccumulator
+from src.game.event_log import SessionEventLog, SessionEventReader
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the columnar session event log")
+    parser.add_argument("--events", type=int, default=2_000_000)
+    parser.add_argument("--flush-every", type=int, default=1024)
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def _size(path: Path) -> int:
+    return sum(item.stat().st_size for item in path.iterdir()) if path.is_dir() else path.stat().st_size
+
+
+def main() -> None:
+    args = parse_args()
+    rng = np.random.default_rng(args.seed)
+    sessions = [f"{code:032x}" for code in rng.integers(0, 2**63, args.sessions)]
+    scenarios = [f"scenario_{index}" for index in range(12)]
+    zones = ["strongly_negative", "mildly_negative", "neutral", "positive"]
+    events = [
+        {
+            "session_id": sessions[index % args.sessions],
+            "step": index // args.sessions,
+            "scenario_id": scenarios[index % len(scenarios)],
+            "choice_id": f"choice_{choice}",
+            "feedback_label": zones[zone],
+            "health_score": int(health),
+            "polarity": float(polarity),
+            "text_length": int(length),
+        }
+        for index, choice, zone, health, polarity, length in zip(
+            range(args.events),
+            rng.integers(0, 3, args.events).tolist(),
+            rng.integers(0, 4, args.events).tolist(),
+            rng.integers(-2, 11, args.events).tolist(),
+            rng.uniform(-1, 1, args.events).astype(np.float32).tolist(),
+            rng.poisson(80, args.events).tolist(),
+        )
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl_path, log_path = Path(tmp) / "session_log.jsonl", Path(tmp) / "events"
+
+        start = time.perf_counter()
+        with open(jsonl_path, "w", encoding="utf-8") as fp:
+            for offset in range(0, args.events, args.flush_every):
+                fp.write("".join(json.dumps(event) + "\n" for event in events[offset : offset + args.flush_every]))
+                fp.flush()
+                os.fsync(fp.fileno())
+        jsonl_write_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with SessionEventLog(log_path, flush_every=args.flush_every, flush_interval_s=None) as log:
+            for event in events:
+                log.append(**event)
+        log_write_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        frame = pd.read_json(jsonl_path, lines=True)
+        frame["sentiment"] = (frame["polarity"] > 0).astype(np.int64)
+        jsonl_tests = PilotStatsAccumulator().update_frame(frame).text_length_tests()
+        jsonl_read_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reader = SessionEventReader(log_path)
+        log_tests = PilotStatsAccumulator().update_frame(reader.analysis_frame()).text_length_tests()
+        log_read_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        feedback_counts = reader.to_frame(["feedback"])["feedback"].value_counts()
+        decode_s = time.perf_counter() - start
+
+        print(f"{args.events:,d} events, flush every {args.flush_every}")
+        print(f"write   jsonl: {args.events / jsonl_write_s:12,.0f} events/s  {_size(jsonl_path) / args.events:6.1f} B/event")
+        print(f"write   log:   {args.events / log_write_s:12,.0f} events/s  {_size(log_path) / args.events:6.1f} B/event")
+        print(f"analyse jsonl: {jsonl_read_s:8.3f} s (read_json + pilot stats)")
+        print(f"analyse log:   {log_read_s:8.3f} s (mmap + pilot stats), {jsonl_read_s / log_read_s:.0f}x faster")
+        print(f"decode feedback ids to Categorical: {decode_s:.3f} s, {len(feedback_counts)} labels")
+        assert len(reader) == args.events
+        assert all(np.isclose(log_tests[key], jsonl_tests[key], equal_nan=True) for key in jsonl_tests), (log_tests, jsonl_tests)
+        print("pilot statistics identical")
+
+
+if __name__ == "__main__":
+    main()
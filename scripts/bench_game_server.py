@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Load benchmark: p50/p99 step latency of SessionManager under many simulated players."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from typing import List
+
+import numpy as np
+
+from src.game.engine import GameEngine
+from src.game.server import SessionManager
+
+THOUGHTS = [
+    "I look ugly",
+    "I'm fine",
+    "Everyone will stare at my skin tonight",
+    "My friends like me for who I am",
+    "I can't go out looking like this",
+    "Photos online are filtered, my face is normal",
+    "Nobody notices my nose as much as I do",
+    "I feel okay about this outfit",
+]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark concurrent game session steps")
+    parser.add_argument("--players", type=int, nargs="+", default=[1_000, 10_000], help="Concurrent player counts")
+    parser.add_argument("--think-ms", type=float, default=5.0, help="Max simulated think time between steps")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+async def _play(manager: SessionManager, rng: random.Random, think_ms: float, latencies: List[float]) -> None:
+    session = manager.create_session()
+    for scenario in manager.engine.scenarios:
+        await asyncio.sleep(rng.random() * think_ms / 1000)
+        choice = rng.randint(1, len(scenario.choices))
+        start = time.perf_counter()
+        await manager.step(session.session_id, rng.choice(THOUGHTS), choice)
+        latencies.append(time.perf_counter() - start)
+    manager.close_session(session.session_id)
+
+
+async def _run(engine: GameEngine, players: int, think_ms: float, seed: int) -> None:
+    manager = SessionManager(engine)
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_play(manager, rng, think_ms, latencies) for _ in range(players)))
+    elapsed = time.perf_counter() - start
+    ms = np.asarray(latencies) * 1000
+    print(
+        f"players={players:>6} steps={len(ms):>7} "
+        f"p50={np.percentile(ms, 50):8.2f}ms p99={np.percentile(ms, 99):8.2f}ms "
+        f"throughput={len(ms) / elapsed:9.1f} steps/s"
+    )
+
+
+def main() -> None:
+    args = parse_args()
+    engine = GameEngine.from_default_assets()
+    try:
+        for players in args.players:
+            asyncio.run(_run(engine, players, args.think_ms, args.seed))
+    finally:
+        engine.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Cold-start cost of the game and training entry points, from ``python -X importtime``.
+
+Exits non-zero when an entry point exceeds its budget or the game imports a heavy framework.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+ENTRY_POINTS = {
+    # name: (module the script imports, setup run after the import, default budget in seconds)
+    "game": ("src.game.ui.cli", "from src.game.engine import GameEngine; GameEngine.from_default_assets()", 0.5),
+    "training": ("src.training.train_model", "pass", 4.0),
+}
+# The game must start without any of these.
+GAME_FORBIDDEN = ("tensorflow", "torch", "keras", "sklearn", "textblob", "nltk", "seaborn", "matplotlib", "statsmodels")
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Import-time budgets for the package entry points")
+    parser.add_argument("--entry", nargs="+", choices=sorted(ENTRY_POINTS), default=sorted(ENTRY_POINTS))
+    parser.add_argument("--budget", nargs="*", default=[], help="override budgets, e.g. game=0.3 training=5")
+    parser.add_argument("--repeats", type=int, default=3, help="runs per entry point; the fastest counts")
+    parser.add_argument("--top", type=int, default=8, help="heaviest top-level packages to list")
+    return parser.parse_args()
+
+
+def measure(module: str, setup: str) -> Tuple[float, float, Dict[str, float]]:
+    """(import seconds, import + setup seconds, cumulative seconds per top-level package)."""
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"import {module}; imported = time.perf_counter(); {setup}; "
+        "print(imported - start, time.perf_counter() - start)"
+    )
+    env = {**os.environ, "PYTHONPATH": os.getcwd(), "TF_CPP_MIN_LOG_LEVEL": "3"}
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, env=env, check=True)
+    import_s, total_s = map(float, proc.stdout.split()[-2:])
+    packages: Dict[str, float] = defaultdict(float)
+    for self_us, cumulative_us, indent, name in _LINE.findall(proc.stderr):
+        # The first import of a package (its shallowest line) carries its whole subtree.
+        root = name.split(".")[0]
+        if name == root:
+            packages[root] = max(packages[root], int(cumulative_us) / 1e6)
+    return import_s, total_s, dict(packages)
+
+
+def main() -> None:
+    args = parse_args()
+    budgets = {name: spec[2] for name, spec in ENTRY_POINTS.items()}
+    budgets.update({key: float(value) for key, value in (item.split("=") for item in args.budget)})
+    failures: List[str] = []
+    for name in args.entry:
+        module, setup, _ = ENTRY_POINTS[name]
+        runs = [measure(module, setup) for _ in range(args.repeats)]
+        import_s, total_s, packages = min(runs, key=lambda run: run[1])
+        heaviest = sorted(packages.items(), key=lambda item: -item[1])[: args.top]
+        print(f"{name}: import {module} {import_s * 1000:.0f} ms, ready {total_s * 1000:.0f} ms (budget {budgets[name] * 1000:.0f} ms)")
+        print("  heaviest packages: " + ", ".join(f"{pkg} {seconds * 1000:.0f} ms" for pkg, seconds in heaviest))
+        if total_s > budgets[name]:
+            failures.append(f"{name} took {total_s:.2f} s > {budgets[name]:.2f} s")
+        if name == "game":
+            loaded = sorted(set(packages) & set(GAME_FORBIDDEN))
+            if loaded:
+                failures.append(f"game imports {', '.join(loaded)}")
+    if failures:
+        print("FAILED: " + "; ".join(failures))
+        sys.exit(1)
+    print("all entry points within budget")
+
+
+if __name__ == "__main__":
+    main()
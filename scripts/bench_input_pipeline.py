@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""CPU steps/sec of model.fit on NumPy arrays (validation_split) vs the tf.data pipeline."""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from src.models.dual_attention_model import DualStreamConfig, build_model
+from src.training.dataset import DatasetSplit
+from src.training.input_pipeline import make_input_datasets
+from src.utils import seed_everything
+
+
+class _StepTimer(tf.keras.callbacks.Callback):
+    """Records steps/sec per epoch so the first (tracing) epoch can be excluded."""
+
+    def __init__(self):
+        super().__init__()
+        self.rates = []
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._steps = 0
+        self._start = time.perf_counter()
+
+    def on_train_batch_end(self, batch, logs=None):
+        self._steps += 1
+
+    def on_epoch_end(self, epoch, logs=None):
+        self.rates.append(self._steps / (time.perf_counter() - self._start))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark training input pipelines")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--epochs", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--seq-length", type=int, default=100)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    cfg = DualStreamConfig(seq_length=args.seq_length)
+    rng = np.random.default_rng(42)
+    tokens = lambda: rng.integers(0, cfg.vocab_size, size=(args.rows, cfg.seq_length), dtype=np.int32)  # noqa: E731
+    split = DatasetSplit(
+        X_train_context=tokens(),
+        X_test_context=np.empty((0, cfg.seq_length), dtype=np.int32),
+        X_train_response=tokens(),
+        X_test_response=np.empty((0, cfg.seq_length), dtype=np.int32),
+        y_train=rng.integers(0, 2, size=args.rows).astype(np.float32),
+        y_test=np.empty(0, dtype=np.float32),
+    )
+
+    for mode in ("numpy", "tfdata"):
+        seed_everything(42)
+        model = build_model(cfg)
+        timer = _StepTimer()
+        if mode == "numpy":
+            model.fit(
+                [split.X_train_context, split.X_train_response],
+                split.y_train,
+                epochs=args.epochs,
+                batch_size=args.batch_size,
+                validation_split=0.2,
+                callbacks=[timer],
+                verbose=0,
+            )
+        else:
+            with tempfile.TemporaryDirectory() as cache_dir:
+                train_ds, val_ds = make_input_datasets(
+                    split, batch_size=args.batch_size, validation_split=0.2, cache_dir=cache_dir, seed=42
+                )
+                model.fit(train_ds, validation_data=val_ds, epochs=args.epochs, callbacks=[timer], verbose=0)
+        steady = timer.rates[1:] or timer.rates
+        print(f"{mode:>6}: {np.mean(steady):7.2f} steps/s (epochs 2..{args.epochs}), first epoch {timer.rates[0]:7.2f}")
+
+
+if __name__ == "__main__":
+    main()
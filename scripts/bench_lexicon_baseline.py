@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Lines/sec and parity of LexiconRuleBaseline's per-text loop vs its sparse token-matrix scoring."""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from src.sentiment.baselines import LexiconRuleBaseline, _lexicon_score
+from src.sentiment.lexicon_loader import load_lexicon, load_pattern_lexicon
+
+VOCAB = (
+    "I am not very really so ugly beautiful terribly bad good happy sad never no :) :( ! "
+    "don't can't it's I'm fine awful horrible, extremely pretty nice. great... hate love "
+    "friends party mirror skin face everyone stares my nose looks okay"
+).split(" ")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized lexicon rule baseline")
+    parser.add_argument("--texts", type=int, default=1_000_000)
+    parser.add_argument("--lexicon", default=None, help="TSV lexicon (defaults to TextBlob's word polarities)")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    rng = random.Random(args.seed)
+    texts = [" ".join(rng.choice(VOCAB) for _ in range(rng.randint(0, 20))) for _ in range(args.texts)]
+    if args.lexicon:
+        lexicon = load_lexicon(args.lexicon)
+    else:
+        lexicon = {word: entry[0] for word, entry in load_pattern_lexicon().items()}
+    baseline = LexiconRuleBaseline(lexicon=lexicon)
+
+    start = time.perf_counter()
+    loop = np.array([float(_lexicon_score(text, lexicon) > baseline.threshold) for text in texts])
+    loop_s = time.perf_counter() - start
+
+    baseline.scores(texts[:10])  # build the vocabulary index outside the timing
+    start = time.perf_counter()
+    matrix, lengths = baseline.token_matrix(texts)
+    tokenize_s = time.perf_counter() - start
+    start = time.perf_counter()
+    scores = baseline.score_matrix(matrix, lengths)
+    matvec_s = time.perf_counter() - start
+    sparse_s = tokenize_s + matvec_s
+
+    loop_scores = np.array([_lexicon_score(text, lexicon) for text in texts[:100_000]])
+    print(f"texts: {len(texts)}  lexicon: {len(lexicon)} words  tokens: {lengths.sum()}")
+    print(f"per-text loop:  {len(texts) / loop_s:14,.0f} lines/s")
+    print(f"sparse total:   {len(texts) / sparse_s:14,.0f} lines/s  (x{loop_s / sparse_s:.2f} vs loop)")
+    print(f"  token_matrix: {len(texts) / tokenize_s:14,.0f} lines/s")
+    print(f"  mat-vec only: {len(texts) / matvec_s:14,.0f} lines/s")
+    print(f"identical predictions: {np.array_equal(loop, (scores > baseline.threshold).astype(float))}  "
+          f"identical scores (first 100k): {np.array_equal(loop_scores, scores[:100_000])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Throughput and cache hit rate of GPTFeedbackBaseline vs AsyncLLMClient against the local stub."""
+
+from __future__ import annotations
+
+import argparse
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.models.gpt_baseline import GPTFeedbackBaseline
+from src.models.llm_client import UNPARSED, AsyncLLMClient
+
+VOCAB = "I look ugly awful great fine everyone stares at my skin nose face party friends happy sad never okay".split()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the LLM feedback clients offline")
+    parser.add_argument("--texts", type=int, default=400)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--sequential-texts", type=int, default=40, help="Texts sent through the one-by-one baseline")
+    return parser.parse_args()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def main() -> None:
+    args = parse_args()
+    rng = random.Random(0)
+    texts = [" ".join(rng.choice(VOCAB) for _ in range(rng.randint(3, 12))) for _ in range(args.texts)]
+    port = _free_port()
+    stub = subprocess.Popen(
+        [sys.executable, "scripts/llm_stub_server.py", "--port", str(port), "--latency-ms", str(args.latency_ms),
+         "--error-rate", str(args.error_rate)],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        stub.stdout.readline()  # wait for "listening"
+        base_url = f"http://127.0.0.1:{port}/v1"
+
+        # The baseline only has the SDK's default retries against the stub's 429s.
+        sequential = GPTFeedbackBaseline("stub", api_key="stub", base_url=base_url)
+        start = time.perf_counter()
+        try:
+            sequential.predict(texts[: args.sequential_texts])
+            seq_rate = args.sequential_texts / (time.perf_counter() - start)
+            print(f"sequential baseline: {seq_rate:8.1f} texts/s")
+        except Exception as exc:  # 429s that outlast the SDK's retries surface as exceptions
+            print(f"sequential baseline: failed ({type(exc).__name__}: {exc})")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_path = Path(tmp) / "llm_cache.sqlite"
+            for run in ("cold", "warm"):
+                client = AsyncLLMClient(
+                    "stub",
+                    api_key="stub",
+                    base_url=base_url,
+                    batch_size=args.batch_size,
+                    max_concurrency=args.concurrency,
+                    backoff_s=0.05,
+                    cache_path=cache_path,
+                )
+                start = time.perf_counter()
+                labels = client.predict(texts)
+                elapsed = time.perf_counter() - start
+                cache = client.cache
+                lookups = cache.hits + cache.misses
+                print(
+                    f"async client ({run}): {len(texts) / elapsed:8.1f} texts/s  requests {client.stats.requests:4d}  "
+                    f"retries {client.stats.retries:3d}  failures {client.stats.failures}  "
+                    f"unlabeled {sum(label == UNPARSED for label in labels)}  "
+                    f"cache hit rate {cache.hits / lookups if lookups else 0.0:.2f}"
+                )
+                client.close()
+    finally:
+        stub.terminate()
+        stub.wait()
+
+
+if __name__ == "__main__":
+    main()
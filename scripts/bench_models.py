@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""K-fold accuracy vs fit time / latency / throughput / peak RSS for every sentiment model."""
+
+from __future__ import annotations
+
+import argparse
+
+import pandas as pd
+
+from src.training.benchmark import BENCHMARK_MODELS, run_benchmark
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Cross-validated benchmark of the sentiment models")
+    parser.add_argument("--data", default="data/processed/train.csv", help="Path to processed CSV")
+    parser.add_argument("--models", nargs="+", choices=BENCHMARK_MODELS, default=list(BENCHMARK_MODELS))
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Parallel (model, fold) tasks; default cpu_count // threads-per-worker"
+    )
+    parser.add_argument("--threads-per-worker", type=int, default=1, help="TF/torch/BLAS threads per task process")
+    parser.add_argument("--epochs", type=int, default=None, help="Override dual-stream epochs")
+    parser.add_argument("--lexicon", default=None, help="TSV lexicon for the rule baseline (default: TextBlob's)")
+    parser.add_argument("--model-config", default="configs/model_config.yaml")
+    parser.add_argument("--training-config", default="configs/training_config.yaml")
+    parser.add_argument("--output", default="artifacts/benchmark")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    folds, summary = run_benchmark(
+        args.data,
+        models=args.models,
+        folds=args.folds,
+        workers=args.workers,
+        threads_per_worker=args.threads_per_worker,
+        output_dir=args.output,
+        model_cfg_path=args.model_config,
+        training_cfg_path=args.training_config,
+        epochs=args.epochs,
+        lexicon_path=args.lexicon,
+    )
+    columns = ["model", "accuracy_mean", "f1_mean", "roc_auc_mean", "fit_seconds_mean", "single_item_p50_ms_mean",
+               "throughput_per_s_mean", "peak_rss_mb_mean"]
+    with pd.option_context("display.width", 200):
+        print(summary[[c for c in columns if c in summary]].to_string(index=False))
+    for _, row in folds[folds["status"] != "ok"].drop_duplicates("model").iterrows():
+        print(f"{row['model']}: {row['status']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Time and parity of the DataFrame pilot analyses vs the chunked PilotStatsAccumulator."""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.analysis import PilotStatsAccumulator, chi_square_text_category, compute_text_length_tests, run_regression
+
+
+def _relative(value: float, reference: float) -> float:
+    return abs(value - reference) / abs(reference) if reference else abs(value - reference)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the one-pass pilot statistics")
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    rng = np.random.default_rng(args.seed)
+    sentiment = rng.integers(0, 2, args.rows)
+    data = pd.DataFrame({"sentiment": sentiment, "text_length": rng.poisson(80, args.rows) + sentiment * 3})
+
+    start = time.perf_counter()
+    tests, regression, chi_square = compute_text_length_tests(data), run_regression(data), chi_square_text_category(data)
+    frame_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    merged = PilotStatsAccumulator()
+    for offset in range(0, args.rows, args.chunk_size):
+        chunk = data.iloc[offset : offset + args.chunk_size]
+        merged.merge(PilotStatsAccumulator().update(chunk["text_length"].to_numpy(), chunk["sentiment"].to_numpy()))
+    streamed_tests, streamed_ols, streamed_chi = merged.text_length_tests(), merged.regression(), merged.chi_square()
+    chunked_s = time.perf_counter() - start
+
+    print(f"rows: {args.rows}  chunk size: {args.chunk_size}")
+    print(f"DataFrame functions: {frame_s:8.3f} s")
+    print(f"accumulators:        {chunked_s:8.3f} s  (x{frame_s / chunked_s:.2f})")
+    print("max relative difference:")
+    for name in tests:
+        print(f"  {name:<10} {_relative(streamed_tests[name], tests[name]):.2e}")
+    for name in ("params", "bse", "pvalues"):
+        rel = max(map(_relative, getattr(streamed_ols, name), np.asarray(getattr(regression, name))))
+        print(f"  ols {name:<6} {rel:.2e}")
+    print(f"  rsquared   {_relative(streamed_ols.rsquared, regression.rsquared):.2e}")
+    print(f"identical contingency table: {streamed_chi['contingency'] == chi_square['contingency']}  "
+          f"chi2 relative difference: {_relative(streamed_chi['chi2'], chi_square['chi2']):.2e}")
+
+
+if __name__ == "__main__":
+    main()
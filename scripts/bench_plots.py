@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Wall time of plot_distributions on raw rows (seaborn) vs per-group summaries."""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.plots import plot_distributions
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark raw vs summary-mode distribution plots")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000])
+    parser.add_argument("--raw-max-rows", type=int, default=10_000_000, help="skip raw mode above this size")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    rng = np.random.default_rng(args.seed)
+    with tempfile.TemporaryDirectory() as output_dir:
+        for rows in args.rows:
+            sentiment = rng.integers(0, 2, rows)
+            data = pd.DataFrame({"sentiment": sentiment, "text_length": rng.poisson(80, rows) + sentiment * 4})
+            timings = {}
+            modes = [("summary", workers) for workers in args.workers]
+            if rows <= args.raw_max_rows:
+                modes.insert(0, ("raw", 1))
+            for mode, workers in modes:
+                start = time.perf_counter()
+                plot_distributions(data, output_dir, mode=mode, workers=workers)
+                timings[f"{mode} x{workers}"] = time.perf_counter() - start
+            line = "  ".join(f"{name}: {seconds:7.2f} s" for name, seconds in timings.items())
+            print(f"{rows:>11,d} rows  {line}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Latency/throughput of DualStreamPredictor: unbatched calls vs MicroBatcher across wait windows."""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+import numpy as np
+
+from src.models.dual_attention_model import DualStreamConfig, build_model
+from src.models.predictor import DualStreamPredictor, MicroBatcher
+from src.training.dataset import tokenize_streams
+
+THOUGHTS = [
+    "I look ugly",
+    "I'm fine",
+    "Everyone will stare at my skin tonight",
+    "My friends like me for who I am",
+    "I can't go out looking like this",
+    "Nobody notices my nose as much as I do",
+]
+PROMPT = "You catch your reflection in a shop window before meeting friends."
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark dual-stream model inference")
+    parser.add_argument("--artifacts-dir", help="Trained artifacts; default builds an untrained model")
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--clients", type=int, default=64, help="Concurrent request threads")
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--wait-ms", type=float, nargs="+", default=[0.0, 1.0, 2.0, 5.0, 10.0])
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def _predictor(args: argparse.Namespace) -> DualStreamPredictor:
+    if args.artifacts_dir:
+        return DualStreamPredictor.from_artifacts(args.artifacts_dir)
+    cfg = DualStreamConfig()
+    tokenizer, _, _ = tokenize_streams(THOUGHTS, [PROMPT], vocab_size=cfg.vocab_size, seq_length=cfg.seq_length)
+    return DualStreamPredictor(build_model(cfg), tokenizer, cfg)
+
+
+def _report(label: str, latencies: List[float], elapsed: float) -> None:
+    ms = np.asarray(latencies) * 1000
+    print(
+        f"{label:>22}: p50={np.percentile(ms, 50):8.2f}ms p99={np.percentile(ms, 99):8.2f}ms "
+        f"throughput={len(ms) / elapsed:8.1f} req/s"
+    )
+
+
+def _drive(predict, texts: List[str], clients: int) -> Tuple[List[float], float]:
+    latencies: List[float] = []
+
+    def _one(text: str) -> None:
+        start = time.perf_counter()
+        predict(text)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(_one, texts))
+    return latencies, time.perf_counter() - start
+
+
+def main() -> None:
+    args = parse_args()
+    rng = random.Random(args.seed)
+    predictor = _predictor(args)
+    texts = [rng.choice(THOUGHTS) for _ in range(args.requests)]
+    predictor.predict_proba([PROMPT], [texts[0]])  # trace the tf.function once up front
+
+    latencies, elapsed = _drive(lambda text: predictor.predict_proba([PROMPT], [text]), texts, args.clients)
+    _report("unbatched", latencies, elapsed)
+    for wait_ms in args.wait_ms:
+        batcher = MicroBatcher(predictor, max_batch_size=args.max_batch_size, max_wait_ms=wait_ms)
+        latencies, elapsed = _drive(lambda text: batcher.submit(PROMPT, text).result(), texts, args.clients)
+        batcher.close()
+        _report(f"batch<={args.max_batch_size} wait={wait_ms:g}ms", latencies, elapsed)
+
+
+if __name__ == "__main__":
+    main()
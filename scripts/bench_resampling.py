@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Resamples/sec of a per-resample pandas loop vs the batched bootstrap/permutation engine."""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.analysis import bootstrap_cohens_d, chi_square_text_category, compute_text_length_tests, permutation_chi_square
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the resampling engine")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--resamples", type=int, default=2000)
+    parser.add_argument("--loop-resamples", type=int, default=100, help="resamples timed for the pandas loop")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    rng = np.random.default_rng(args.seed)
+    sentiment = rng.integers(0, 2, args.rows)
+    data = pd.DataFrame({"sentiment": sentiment, "text_length": rng.poisson(80, args.rows) + sentiment})
+    print(f"rows: {args.rows}")
+
+    # What a hand-written bootstrap does: resample each group, rerun the analysis function.
+    groups = [data[data["sentiment"] == label] for label in (0, 1)]
+    start = time.perf_counter()
+    for _ in range(args.loop_resamples):
+        compute_text_length_tests(pd.concat([group.sample(frac=1.0, replace=True) for group in groups]))
+    loop_rate = args.loop_resamples / (time.perf_counter() - start)
+    print(f"bootstrap, pandas loop:     {loop_rate:10,.1f} resamples/s")
+    for workers in args.workers:
+        start = time.perf_counter()
+        result = bootstrap_cohens_d(data, resamples=args.resamples, seed=args.seed, workers=workers)
+        rate = args.resamples / (time.perf_counter() - start)
+        print(f"bootstrap, engine x{workers}:     {rate:10,.1f} resamples/s  (x{rate / loop_rate:.1f})  "
+              f"d={result['cohens_d']:.4f} CI=[{result['ci_low']:.4f}, {result['ci_high']:.4f}]")
+
+    start = time.perf_counter()
+    for _ in range(args.loop_resamples):
+        chi_square_text_category(data.assign(sentiment=rng.permutation(sentiment)))
+    loop_rate = args.loop_resamples / (time.perf_counter() - start)
+    print(f"permutation, pandas loop:   {loop_rate:10,.1f} resamples/s")
+    contingency = chi_square_text_category(data)["contingency"]
+    start = time.perf_counter()
+    result = permutation_chi_square(contingency, resamples=args.resamples * 50, seed=args.seed)
+    rate = args.resamples * 50 / (time.perf_counter() - start)
+    print(f"permutation, engine:        {rate:10,.1f} resamples/s  (x{rate / loop_rate:.0f})  p={result['p_value']:.4g}")
+
+
+if __name__ == "__main__":
+    main()
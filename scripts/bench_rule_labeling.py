@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Scaling benchmark for add_rule_sentiment across process-pool worker counts."""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from src.training.dataset import add_rule_sentiment
+
+VOCAB = (
+    "I am not very really so ugly beautiful terribly bad good happy sad never fine awful "
+    "horrible extremely pretty nice great hate love friends party mirror skin face stare"
+).split()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark parallel rule-sentiment labeling")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    rng = random.Random(args.seed)
+    texts = [" ".join(rng.choice(VOCAB) for _ in range(rng.randint(3, 25))) for _ in range(args.rows)]
+    df = pd.DataFrame({"Context": texts, "Response": texts[::-1]})
+
+    reference = None
+    baseline_s = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        labels = add_rule_sentiment(df, workers=workers, chunk_size=args.chunk_size)["sentiment"]
+        elapsed = time.perf_counter() - start
+        baseline_s = baseline_s or elapsed
+        reference = labels if reference is None else reference
+        print(
+            f"workers={workers} {elapsed:8.2f}s {args.rows / elapsed:10.0f} rows/s "
+            f"speedup x{baseline_s / elapsed:.2f} identical={labels.equals(reference)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
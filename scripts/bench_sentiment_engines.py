@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Per-text cost and TextBlob parity of the sentiment engines behind extract_features."""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+import numpy as np
+from textblob import TextBlob
+
+from src.sentiment.lexicon_scorer import LexiconScorer
+
+VOCAB = (
+    "I am not very really so ugly beautiful terribly bad good happy sad never no :) :( ! "
+    "don't can't it's I'm fine awful horrible, extremely pretty nice. great... hate love "
+    "friends party mirror skin face everyone stares my nose looks okay"
+).split(" ")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark TextBlob vs the compiled lexicon scorer")
+    parser.add_argument("--texts", type=int, default=20_000)
+    parser.add_argument("--lexicon", default=None, help="Lexicon path (defaults to TextBlob's bundled XML)")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    rng = random.Random(args.seed)
+    texts = [" ".join(rng.choice(VOCAB) for _ in range(rng.randint(1, 20))) for _ in range(args.texts)]
+
+    start = time.perf_counter()
+    scorer = LexiconScorer.from_path(args.lexicon)
+    load_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reference = np.array([TextBlob(text).sentiment for text in texts])
+    textblob_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = np.array([scorer.sentiment(text) for text in texts])
+    lexicon_s = time.perf_counter() - start
+
+    diff = np.abs(reference - compiled).max(axis=0)
+    print(f"lexicon load: {load_s * 1000:.1f} ms ({len(scorer.lexicon)} entries)")
+    print(f"textblob: {textblob_s / len(texts) * 1e6:8.1f} us/text")
+    print(f"lexicon:  {lexicon_s / len(texts) * 1e6:8.1f} us/text  speedup x{textblob_s / lexicon_s:.1f}")
+    print(f"max |diff| polarity={diff[0]:.2e} subjectivity={diff[1]:.2e}")
+
+
+if __name__ == "__main__":
+    main()
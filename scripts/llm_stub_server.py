@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Local OpenAI-compatible chat stub that labels thoughts with the rule sentiment, for offline benchmarks."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.sentiment.polarity_features import sentiment_scores
+
+_NUMBERED = re.compile(r"^(\d+)\.\s+(.*)$")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="OpenAI-compatible /v1/chat/completions stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Simulated per-request model latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 429")
+    return parser.parse_args()
+
+
+def _answer(prompt: str) -> str:
+    """One '<n>: <label>' line per numbered thought, or a bare label for a single 'Thought:' prompt."""
+    numbered = [_NUMBERED.match(line) for line in prompt.splitlines()]
+    numbered = [match for match in numbered if match]
+    if numbered:
+        return "\n".join(f"{m.group(1)}: {int(sentiment_scores(m.group(2))[0] > 0)}" for m in numbered)
+    thought = prompt.split("Thought:", 1)[-1].split("\n", 1)[0]
+    return str(int(sentiment_scores(thought)[0] > 0))
+
+
+def make_handler(latency_ms: float, error_rate: float):
+    lock = threading.Lock()
+    counts = {"requests": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args) -> None:  # keep benchmark output clean
+            pass
+
+        def _send(self, status: int, payload: dict) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self) -> None:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            with lock:
+                counts["requests"] += 1
+            time.sleep(latency_ms / 1000)
+            if random.random() < error_rate:
+                self._send(429, {"error": {"message": "rate limited (stub)", "type": "rate_limit"}})
+                return
+            content = _answer(request["messages"][-1]["content"])
+            self._send(
+                200,
+                {
+                    "id": f"stub-{counts['requests']}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": request.get("model", "stub"),
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                    "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+                },
+            )
+
+    return Handler
+
+
+def main() -> None:
+    args = parse_args()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args.latency_ms, args.error_rate))
+    print(f"LLM stub listening on http://{args.host}:{args.port}/v1", flush=True)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""CLI wrapper to run a hyperparameter sweep and write the leaderboard."""
+
+from __future__ import annotations
+
+import argparse
+
+from src.training.sweep import run_sweep
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Sweep DualStreamConfig / training hyperparameters")
+    parser.add_argument("--data", default="data/processed/train.csv", help="Path to processed CSV")
+    parser.add_argument("--sweep-config", default="configs/sweep_config.yaml")
+    parser.add_argument("--output", default="artifacts/sweep", help="Output directory for the leaderboard")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    board = run_sweep(data_path=args.data, sweep_cfg_path=args.sweep_config, output_dir=args.output)
+    print(board.head(10).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,17 @@
-from .stats_prepost import compute_text_length_tests
-from .regression import run_regression
-from .correlations import chi_square_text_category
-from .plots import plot_distributions
+from src.utils.lazy import lazy_exports
 
-__all__ = [
-    "compute_text_length_tests",
-    "run_regression",
-    "chi_square_text_category",
-    "plot_distributions",
-]
+_EXPORTS = {
+    "compute_text_length_tests": ".stats_prepost",
+    "run_regression": ".regression",
+    "chi_square_text_category": ".correlations",
+    "plot_distributions": ".plots",
+    "DistributionSummary": ".plots",
+    "summarize_distribution": ".plots",
+    "PilotStatsAccumulator": ".accumulators",
+    "OLSResult": ".accumulators",
+    "bootstrap_cohens_d": ".resampling",
+    "permutation_chi_square": ".resampling",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
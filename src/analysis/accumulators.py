@@ -0,0 +1,275 @@
+"""One-pass, mergeable sufficient statistics behind the pilot report's tests.
+
+Each accumulator is updated chunk by chunk (``update``) and combined across chunks or
+workers (``merge``), so the t-test/ANOVA/Cohen's d, OLS and chi-square outputs can be
+produced without holding the data in memory.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from scipy.stats import chi2_contingency
+
+if TYPE_CHECKING:
+    from src.analysis.plots import DistributionSummary
+
+
+@dataclass
+class MomentAccumulator:
+    """Count, mean and sum of squared deviations (Welford / Chan et al. pairwise merge)."""
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        if len(values):
+            chunk_mean = float(values.mean())
+            self.merge(MomentAccumulator(len(values), chunk_mean, float(((values - chunk_mean) ** 2).sum())))
+
+    def merge(self, other: "MomentAccumulator") -> "MomentAccumulator":
+        if other.count:
+            total = self.count + other.count
+            delta = other.mean - self.mean
+            self.mean += delta * other.count / total
+            self.m2 += other.m2 + delta**2 * self.count * other.count / total
+            self.count = total
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (ddof=1), like ``Series.std(ddof=1) ** 2``."""
+        return self.m2 / (self.count - 1) if self.count > 1 else float("nan")
+
+
+@dataclass
+class OLSResult:
+    """The OLS fit statistics ``run_regression``'s statsmodels result reports."""
+
+    names: List[str]
+    params: np.ndarray
+    bse: np.ndarray
+    tvalues: np.ndarray
+    pvalues: np.ndarray
+    nobs: int
+    rsquared: float
+    rsquared_adj: float
+    fvalue: float
+    f_pvalue: float
+    llf: float
+    aic: float
+    bic: float
+
+    def summary(self) -> str:
+        lines = [
+            "OLS Regression Results (from sufficient statistics)",
+            f"No. Observations: {self.nobs:>12d}    R-squared:      {self.rsquared:>10.3f}",
+            f"Df Residuals:     {self.nobs - len(self.names):>12d}    Adj. R-squared: {self.rsquared_adj:>10.3f}",
+            f"F-statistic:      {self.fvalue:>12.4g}    Prob (F):       {self.f_pvalue:>10.3g}",
+            f"Log-Likelihood:   {self.llf:>12.5g}    AIC / BIC:      {self.aic:.4g} / {self.bic:.4g}",
+            f"{'':<14}{'coef':>10}{'std err':>11}{'t':>10}{'P>|t|':>10}",
+        ]
+        for row in zip(self.names, self.params, self.bse, self.tvalues, self.pvalues):
+            lines.append(f"{row[0]:<14}{row[1]:>10.4f}{row[2]:>11.3f}{row[3]:>10.3f}{row[4]:>10.3f}")
+        return "\n".join(lines)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "params": dict(zip(self.names, self.params.tolist())),
+            "bse": dict(zip(self.names, self.bse.tolist())),
+            "pvalues": dict(zip(self.names, self.pvalues.tolist())),
+            "nobs": self.nobs,
+            "rsquared": self.rsquared,
+            "fvalue": self.fvalue,
+            "f_pvalue": self.f_pvalue,
+        }
+
+
+@dataclass
+class OLSAccumulator:
+    """X'X, X'y and y'y for ``y ~ const + predictors``."""
+
+    predictors: Tuple[str, ...] = ("text_length",)
+    xtx: np.ndarray = field(default=None)
+    xty: np.ndarray = field(default=None)
+    yty: float = 0.0
+    nobs: int = 0
+
+    def __post_init__(self) -> None:
+        k = len(self.predictors) + 1
+        self.xtx = np.zeros((k, k)) if self.xtx is None else self.xtx
+        self.xty = np.zeros(k) if self.xty is None else self.xty
+
+    def update(self, x: np.ndarray, y: np.ndarray) -> None:
+        design = np.column_stack([np.ones(len(y)), np.asarray(x, dtype=np.float64).reshape(len(y), -1)])
+        y = np.asarray(y, dtype=np.float64)
+        self.xtx += design.T @ design
+        self.xty += design.T @ y
+        self.yty += float(y @ y)
+        self.nobs += len(y)
+
+    def merge(self, other: "OLSAccumulator") -> "OLSAccumulator":
+        self.xtx += other.xtx
+        self.xty += other.xty
+        self.yty += other.yty
+        self.nobs += other.nobs
+        return self
+
+    def fit(self) -> OLSResult:
+        n, k = self.nobs, len(self.xty)
+        params = np.linalg.solve(self.xtx, self.xty)
+        ssr = self.yty - params @ self.xty
+        centered_tss = self.yty - self.xty[0] ** 2 / n
+        scale = ssr / (n - k)
+        bse = np.sqrt(np.diag(np.linalg.inv(self.xtx)) * scale)
+        tvalues = params / bse
+        rsquared = 1 - ssr / centered_tss
+        fvalue = ((centered_tss - ssr) / (k - 1)) / scale
+        llf = -n / 2 * (np.log(2 * np.pi) + np.log(ssr / n) + 1)
+        return OLSResult(
+            names=["const", *self.predictors],
+            params=params,
+            bse=bse,
+            tvalues=tvalues,
+            pvalues=2 * stats.t.sf(np.abs(tvalues), n - k),
+            nobs=n,
+            rsquared=float(rsquared),
+            rsquared_adj=float(1 - (1 - rsquared) * (n - 1) / (n - k)),
+            fvalue=float(fvalue),
+            f_pvalue=float(stats.f.sf(fvalue, k - 1, n - k)),
+            llf=float(llf),
+            aic=float(-2 * llf + 2 * k),
+            bic=float(-2 * llf + k * np.log(n)),
+        )
+
+
+@dataclass
+class LengthHistogram:
+    """Row counts per (integer text length, sentiment); enough for an exact median split."""
+
+    counts: np.ndarray = field(default_factory=lambda: np.zeros((0, 2), dtype=np.int64))
+
+    def update(self, lengths: np.ndarray, labels: np.ndarray) -> None:
+        lengths = np.asarray(lengths)
+        if len(lengths) and not np.array_equal(lengths, np.round(lengths)):
+            raise ValueError("LengthHistogram needs integer lengths")
+        lengths = lengths.astype(np.int64)
+        size = max(len(self.counts), int(lengths.max()) + 1 if len(lengths) else 0)
+        self._grow(size)
+        for label in (0, 1):
+            self.counts[:, label] += np.bincount(lengths[np.asarray(labels) == label], minlength=size)
+
+    def _grow(self, size: int) -> None:
+        if size > len(self.counts):
+            self.counts = np.vstack([self.counts, np.zeros((size - len(self.counts), 2), dtype=np.int64)])
+
+    def merge(self, other: "LengthHistogram") -> "LengthHistogram":
+        self._grow(len(other.counts))
+        self.counts[: len(other.counts)] += other.counts
+        return self
+
+    def median(self) -> float:
+        """``np.quantile(lengths, 0.5)`` (linear interpolation), as ``pd.qcut`` computes it."""
+        cumulative = np.cumsum(self.counts.sum(axis=1))
+        n = int(cumulative[-1])
+        position = 0.5 * (n - 1)
+        lower, upper = int(np.floor(position)), int(np.ceil(position))
+        value_at = lambda rank: float(np.searchsorted(cumulative, rank, side="right"))
+        return value_at(lower) + (value_at(upper) - value_at(lower)) * (position - lower)
+
+    def median_split(self) -> pd.DataFrame:
+        """The ``pd.crosstab(pd.qcut(lengths, 2, ["Short", "Long"]), sentiment)`` table."""
+        median = self.median()
+        values = np.arange(len(self.counts))
+        table = pd.DataFrame(
+            [self.counts[values <= median].sum(axis=0), self.counts[values > median].sum(axis=0)],
+            index=pd.Index(["Short", "Long"], name="text_category"),
+            columns=pd.Index([0, 1], name="sentiment"),
+        )
+        # crosstab only lists categories that occur.
+        return table.loc[table.sum(axis=1) > 0, table.sum(axis=0) > 0]
+
+
+@dataclass
+class PilotStatsAccumulator:
+    """Everything ``compute_text_length_tests``, ``run_regression`` and
+    ``chi_square_text_category`` need, gathered in one pass over ``sentiment``/``text_length``."""
+
+    groups: Dict[int, MomentAccumulator] = field(default_factory=lambda: {0: MomentAccumulator(), 1: MomentAccumulator()})
+    ols: OLSAccumulator = field(default_factory=OLSAccumulator)
+    lengths: LengthHistogram = field(default_factory=LengthHistogram)
+
+    def update(self, text_length: Sequence[float], sentiment: Sequence[int]) -> "PilotStatsAccumulator":
+        text_length = np.asarray(text_length, dtype=np.float64)
+        sentiment = np.asarray(sentiment, dtype=np.float64)
+        valid = ~(np.isnan(text_length) | np.isnan(sentiment))
+        text_length, sentiment = text_length[valid], sentiment[valid]
+        for label, moments in self.groups.items():
+            moments.update(text_length[sentiment == label])
+        self.ols.update(text_length, sentiment)
+        self.lengths.update(text_length, sentiment)
+        return self
+
+    def update_frame(self, data: pd.DataFrame) -> "PilotStatsAccumulator":
+        return self.update(data["text_length"].to_numpy(), data["sentiment"].to_numpy())
+
+    def merge(self, other: "PilotStatsAccumulator") -> "PilotStatsAccumulator":
+        for label, moments in self.groups.items():
+            moments.merge(other.groups[label])
+        self.ols.merge(other.ols)
+        self.lengths.merge(other.lengths)
+        return self
+
+    def distribution_summaries(self) -> Dict[int, DistributionSummary]:
+        """Per-sentiment text-length ``DistributionSummary``, as ``summarize_groups`` builds from the rows."""
+        from src.analysis.plots import DistributionSummary  # matplotlib only when plotting
+
+        summaries = {}
+        for label in (0, 1):
+            values = np.flatnonzero(self.lengths.counts[:, label])
+            if len(values):
+                summaries[label] = DistributionSummary(values=values.astype(np.float64), counts=self.lengths.counts[values, label])
+        return summaries
+
+    def text_length_tests(self) -> Dict[str, float]:
+        """Welch t-test, one-way ANOVA and Cohen's d, as ``compute_text_length_tests``."""
+        neg, pos = self.groups[0], self.groups[1]
+        # NumPy scalars so constant groups give inf/nan like scipy instead of ZeroDivisionError.
+        with np.errstate(divide="ignore", invalid="ignore"):
+            se2_neg, se2_pos = np.float64(neg.variance) / neg.count, np.float64(pos.variance) / pos.count
+            t_stat = (neg.mean - pos.mean) / np.sqrt(se2_neg + se2_pos)
+            welch_df = (se2_neg + se2_pos) ** 2 / (se2_neg**2 / (neg.count - 1) + se2_pos**2 / (pos.count - 1))
+
+            total = neg.count + pos.count
+            grand_mean = (neg.mean * neg.count + pos.mean * pos.count) / total
+            between = neg.count * (neg.mean - grand_mean) ** 2 + pos.count * (pos.mean - grand_mean) ** 2
+            within = np.float64(neg.m2 + pos.m2) / (total - 2)
+            f_stat = between / within
+            cohens_d = (neg.mean - pos.mean) / np.sqrt(np.float64(neg.variance + pos.variance))
+        return {
+            "t_stat": float(t_stat),
+            "t_p": 0.0 if np.isinf(t_stat) else float(2 * stats.t.sf(abs(t_stat), welch_df)),
+            "f_stat": float(f_stat),
+            "f_p": float(stats.f.sf(f_stat, 1, total - 2)),
+            "cohens_d": float(cohens_d),
+        }
+
+    def regression(self) -> OLSResult:
+        return self.ols.fit()
+
+    def chi_square(self) -> Dict[str, object]:
+        contingency = self.lengths.median_split()
+        chi2, p, dof, expected = chi2_contingency(contingency)
+        return {
+            "chi2": float(chi2),
+            "p_value": float(p),
+            "dof": int(dof),
+            "contingency": contingency.values.tolist(),
+            "expected": expected.tolist(),
+        }
@@ -2,23 +2,184 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable, Dict, List, Tuple
 
-import seaborn as sns
-from matplotlib import pyplot as plt
+import numpy as np
 import pandas as pd
+import seaborn as sns
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+PLOT_MODES = ("auto", "raw", "summary")
+SUMMARY_MIN_ROWS = 50_000  # "auto" draws from summaries from this many rows up
+SUMMARY_BINS = 4096  # histogram bins for non-integer values
+_INTEGER_SPAN_LIMIT = 1 << 20
+# seaborn.violinplot's KDE defaults.
+_KDE_GRIDSIZE = 100
+_KDE_CUT = 2.0
+# seaborn's single-color styling: desaturated C0 fill, dark gray lines.
+_FILL = sns.desaturate("C0", 0.75)
+_LINE = "0.25"
+
+
+@dataclass
+class DistributionSummary:
+    """One group as a compact weighted sample: sorted distinct values (or bin centers) + counts.
+
+    Quantiles, box-plot statistics and the KDE are computed from it without the raw rows.
+    They are exact when the values are integers (text lengths), binned otherwise.
+    """
+
+    values: np.ndarray
+    counts: np.ndarray
+
+    @property
+    def count(self) -> int:
+        return int(self.counts.sum())
+
+    def quantile(self, q: float) -> float:
+        """``np.percentile(raw, 100 * q)`` with linear interpolation."""
+        cumulative = np.cumsum(self.counts)
+        position = q * (cumulative[-1] - 1)
+        lower, upper = int(np.floor(position)), int(np.ceil(position))
+        low, high = self.values[np.searchsorted(cumulative, [lower, upper], side="right")]
+        return float(low + (high - low) * (position - lower))
+
+    def box_stats(self, whis: float = 1.5) -> Dict[str, object]:
+        """``matplotlib.cbook.boxplot_stats`` for the raw values, as ``Axes.bxp`` takes them."""
+        q1, median, q3 = (self.quantile(q) for q in (0.25, 0.5, 0.75))
+        iqr = q3 - q1
+        inside_high = self.values[self.values <= q3 + whis * iqr]
+        inside_low = self.values[self.values >= q1 - whis * iqr]
+        whishi = max(float(inside_high.max()), q3) if len(inside_high) else q3
+        whislo = min(float(inside_low.min()), q1) if len(inside_low) else q1
+        # Every distinct outlier is drawn once; repeated values would land on the same pixel.
+        fliers = self.values[(self.values < whislo) | (self.values > whishi)]
+        mean = float(self.values @ self.counts / self.count)
+        return {"med": median, "q1": q1, "q3": q3, "whislo": whislo, "whishi": whishi, "fliers": fliers, "mean": mean}
+
+    def kde(self, gridsize: int = _KDE_GRIDSIZE, cut: float = _KDE_CUT) -> Tuple[np.ndarray, np.ndarray]:
+        """Gaussian KDE on a fixed grid with Scott's bandwidth, as ``sns.violinplot`` fits it."""
+        n = self.count
+        mean = self.values @ self.counts / n
+        std = np.sqrt(((self.values - mean) ** 2) @ self.counts / (n - 1)) if n > 1 else 0.0
+        bandwidth = n ** (-1 / 5) * std
+        if bandwidth == 0:
+            return np.array([self.values[0]]), np.array([np.nan])
+        grid = np.linspace(self.values[0] - cut * bandwidth, self.values[-1] + cut * bandwidth, gridsize)
+        z = (grid[:, None] - self.values[None, :]) / bandwidth
+        density = np.exp(-0.5 * z**2) @ self.counts / (n * bandwidth * np.sqrt(2 * np.pi))
+        return grid, density
+
+
+def summarize_distribution(values: np.ndarray, *, bins: int = SUMMARY_BINS) -> DistributionSummary:
+    """Reduce raw values to a ``DistributionSummary``: exact counts for integers, else a histogram."""
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    if not len(values):
+        raise ValueError("Cannot summarize an empty group")
+    low, high = values.min(), values.max()
+    if high - low < _INTEGER_SPAN_LIMIT and np.array_equal(values, np.floor(values)):
+        counts = np.bincount((values - low).astype(np.int64))
+        distinct = np.flatnonzero(counts)
+        return DistributionSummary(values=distinct + low, counts=counts[distinct])
+    counts, edges = np.histogram(values, bins=bins)
+    occupied = np.flatnonzero(counts)
+    centers = (edges[:-1] + edges[1:]) / 2
+    return DistributionSummary(values=centers[occupied], counts=counts[occupied])
+
+
+def summarize_groups(data: pd.DataFrame, *, by: str = "sentiment", column: str = "text_length") -> Dict[object, DistributionSummary]:
+    keys = data[by].to_numpy()
+    values = data[column].to_numpy()
+    return {label: summarize_distribution(values[keys == label]) for label in np.sort(pd.unique(keys))}
+
+
+def _draw_box_summary(ax: Axes, summaries: Dict[object, DistributionSummary]) -> None:
+    stats = [summary.box_stats() for summary in summaries.values()]
+    ax.bxp(
+        stats,
+        positions=range(len(stats)),
+        widths=0.8,
+        patch_artist=True,
+        boxprops={"facecolor": _FILL, "edgecolor": _LINE},
+        whiskerprops={"color": _LINE},
+        capprops={"color": _LINE},
+        medianprops={"color": _LINE},
+        flierprops={"marker": "o", "markerfacecolor": "none", "markeredgecolor": _LINE},
+    )
+
+
+def _draw_violin_summary(ax: Axes, summaries: Dict[object, DistributionSummary]) -> None:
+    kdes = [summary.kde() for summary in summaries.values()]
+    # density_norm="area": one scale for all violins, so widths compare densities.
+    peak = np.nanmax([density.max() for _, density in kdes])
+    for position, ((grid, density), summary) in enumerate(zip(kdes, summaries.values())):
+        half_width = 0.4 * density / peak
+        ax.fill_betweenx(grid, position - half_width, position + half_width, facecolor=_FILL, edgecolor=_LINE)
+        stats = summary.box_stats()
+        ax.plot([position, position], [stats["whislo"], stats["whishi"]], color=_LINE, linewidth=1.9)
+        ax.plot([position, position], [stats["q1"], stats["q3"]], color=_LINE, linewidth=5.6)
+        ax.plot([position], [stats["med"]], marker="_", markersize=4.7, markeredgewidth=1.1, color="w")
+
+
+def _render(path: Path, title: str, draw: Callable[[Axes], None], labels: List[str]) -> None:
+    # Figure + Agg canvas directly: no pyplot state, no GUI backend, safe to run per thread.
+    figure = Figure()
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot()
+    draw(ax)
+    ax.set_xticks(range(len(labels)), labels)
+    ax.set_xlabel("sentiment")
+    ax.set_ylabel("text_length")
+    ax.set_title(title)
+    figure.savefig(path, bbox_inches="tight")
+
 
+def plot_distributions(
+    data: pd.DataFrame | Dict[object, DistributionSummary],
+    output_dir: str | Path,
+    *,
+    mode: str = "auto",
+    workers: int = 2,
+) -> None:
+    """Box and violin plots of ``text_length`` per ``sentiment``.
 
-def plot_distributions(data: pd.DataFrame, output_dir: str | Path) -> None:
+    ``mode="raw"`` hands the rows to seaborn. ``mode="summary"`` first reduces each group to
+    a ``DistributionSummary`` and draws the same figures from it (matplotlib ``bxp`` and a
+    NumPy KDE), so cost no longer grows with rows beyond one reduction pass. ``"auto"``
+    switches to summaries from ``SUMMARY_MIN_ROWS`` rows. ``data`` may also be the
+    summaries themselves (e.g. ``PilotStatsAccumulator.distribution_summaries()``), which
+    always draws in summary mode. Figures render on ``workers`` threads.
+    """
+    if mode not in PLOT_MODES:
+        raise ValueError(f"Unknown plot mode '{mode}'; expected one of {PLOT_MODES}")
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
+    if isinstance(data, dict):
+        if mode == "raw":
+            raise ValueError("plot mode 'raw' needs the rows, not per-group summaries")
+        mode = "summary"
+    elif mode == "auto":
+        mode = "summary" if len(data) >= SUMMARY_MIN_ROWS else "raw"
 
-    sns.boxplot(x="sentiment", y="text_length", data=data)
-    plt.title("Text Length Distribution Across Sentiments")
-    plt.savefig(output_dir / "text_length_boxplot.png", bbox_inches="tight")
-    plt.close()
+    if mode == "summary":
+        summaries = data if isinstance(data, dict) else summarize_groups(data)
+        labels = [str(label) for label in summaries]
+        draw_box = lambda ax: _draw_box_summary(ax, summaries)
+        draw_violin = lambda ax: _draw_violin_summary(ax, summaries)
+    else:
+        labels = [str(label) for label in np.sort(pd.unique(data["sentiment"]))]
+        draw_box = lambda ax: sns.boxplot(x="sentiment", y="text_length", data=data, ax=ax)
+        draw_violin = lambda ax: sns.violinplot(x="sentiment", y="text_length", data=data, ax=ax)
 
-    sns.violinplot(x="sentiment", y="text_length", data=data)
-    plt.title("Text Length Variability Across Sentiments")
-    plt.savefig(output_dir / "text_length_violin.png", bbox_inches="tight")
-    plt.close()
+    figures = [
+        (output_dir / "text_length_boxplot.png", "Text Length Distribution Across Sentiments", draw_box),
+        (output_dir / "text_length_violin.png", "Text Length Variability Across Sentiments", draw_violin),
+    ]
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        list(pool.map(lambda figure: _render(*figure, labels), figures))
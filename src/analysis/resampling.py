@@ -0,0 +1,199 @@
+"""Batched bootstrap and permutation tests for the pilot analyses."""
+
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.stats.contingency import expected_freq
+
+from src.utils import spawn_seeds
+
+if TYPE_CHECKING:
+    from src.analysis.plots import DistributionSummary
+
+DEFAULT_BLOCK_ELEMENTS = 1 << 22  # resample-matrix entries per block (~50 MB for index matrices)
+
+_Group = Tuple[np.ndarray, Optional[np.ndarray]]  # (values, counts per distinct value or None)
+_WORKER_GROUPS: Tuple[_Group, ...] = ()
+
+
+def _compress(values: np.ndarray) -> _Group:
+    """Distinct values + counts when there are few of them (text lengths), else the raw values."""
+    distinct, counts = np.unique(values, return_counts=True)
+    return (distinct, counts) if len(distinct) * 4 <= len(values) else (values, None)
+
+
+def _row_elements(group: _Group) -> int:
+    return len(group[0])
+
+
+def _group_rows(group: _Group) -> int:
+    values, counts = group
+    return len(values) if counts is None else int(counts.sum())
+
+
+def _group_moments(group: _Group) -> Tuple[float, float]:
+    """Mean and ddof=1 variance of a raw or compressed group."""
+    values, counts = group
+    if counts is None:
+        return float(values.mean()), float(values.var(ddof=1))
+    n = int(counts.sum())
+    mean = float(values @ counts) / n
+    return mean, float(((values - mean) ** 2) @ counts) / (n - 1)
+
+
+def _resampled_moments(group: _Group, rng: np.random.Generator, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Mean and ddof=1 variance of ``size`` bootstrap resamples of one group."""
+    values, counts = group
+    if counts is None:
+        sample = values[rng.integers(0, len(values), size=(size, len(values)), dtype=np.int32)]
+        return sample.mean(axis=1), sample.var(axis=1, ddof=1)
+    # Resampling n rows with replacement = multinomial counts over the distinct values,
+    # which costs O(distinct) per resample instead of O(n).
+    n = int(counts.sum())
+    draws = rng.multinomial(n, counts / n, size=size).astype(np.float64)
+    center = float(values @ counts) / n
+    mean = draws @ values / n
+    return mean, (draws @ (values - center) ** 2 - n * (mean - center) ** 2) / (n - 1)
+
+
+def _bootstrap_block(neg: _Group, pos: _Group, seed: np.random.SeedSequence, size: int) -> np.ndarray:
+    # Each group is resampled within itself, so every resample keeps the observed group sizes.
+    rng = np.random.default_rng(seed)
+    neg_mean, neg_var = _resampled_moments(neg, rng, size)
+    pos_mean, pos_var = _resampled_moments(pos, rng, size)
+    return (neg_mean - pos_mean) / np.sqrt(neg_var + pos_var)
+
+
+def _init_worker(neg: _Group, pos: _Group) -> None:
+    global _WORKER_GROUPS
+    _WORKER_GROUPS = (neg, pos)
+
+
+def _worker_block(seed: np.random.SeedSequence, size: int) -> np.ndarray:
+    return _bootstrap_block(*_WORKER_GROUPS, seed, size)
+
+
+def _block_sizes(resamples: int, row_elements: int, block_elements: int) -> List[int]:
+    per_block = max(1, block_elements // max(1, row_elements))
+    return [min(per_block, resamples - start) for start in range(0, resamples, per_block)]
+
+
+def bootstrap_cohens_d(
+    data: pd.DataFrame | Mapping[int, DistributionSummary],
+    *,
+    resamples: int = 2000,
+    confidence: float = 0.95,
+    seed: int = 42,
+    workers: int = 1,
+    block_elements: int = DEFAULT_BLOCK_ELEMENTS,
+) -> Dict[str, float]:
+    """Percentile bootstrap CI for the text-length Cohen's d between sentiment groups.
+
+    Resamples are drawn as ``(block, n)`` index matrices, or as ``(block, distinct)``
+    multinomial count matrices for a group with few distinct lengths, at most
+    ``block_elements`` entries at a time. Each block gets its own child of ``seed``
+    (``spawn_seeds``), so the result is the same for any ``workers``; ``workers > 1``
+    spreads the blocks over a spawned process pool.
+
+    ``data`` may also be per-sentiment ``DistributionSummary`` objects (the streaming path's
+    ``PilotStatsAccumulator.distribution_summaries()``); they are resampled as counts.
+    """
+    if resamples < 1:
+        raise ValueError("resamples must be >= 1")
+    if isinstance(data, pd.DataFrame):
+        valid = data[["text_length", "sentiment"]].dropna()
+        groups = tuple(
+            _compress(valid.loc[valid["sentiment"] == label, "text_length"].to_numpy(dtype=np.float64)) for label in (0, 1)
+        )
+    else:
+        empty = (np.empty(0), np.empty(0, dtype=np.int64))
+        groups = tuple(
+            (data[label].values.astype(np.float64), data[label].counts) if label in data else empty for label in (0, 1)
+        )
+    if min(map(_group_rows, groups)) < 2:
+        raise ValueError("Both sentiment groups need at least two rows to bootstrap Cohen's d")
+    (neg_mean, neg_var), (pos_mean, pos_var) = map(_group_moments, groups)
+
+    sizes = _block_sizes(resamples, sum(map(_row_elements, groups)), block_elements)
+    seeds = spawn_seeds(seed, len(sizes))
+    if workers > 1 and len(sizes) > 1:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=groups,
+        ) as pool:
+            blocks = list(pool.map(_worker_block, seeds, sizes))
+    else:
+        blocks = [_bootstrap_block(*groups, block_seed, size) for block_seed, size in zip(seeds, sizes)]
+
+    draws = np.concatenate(blocks)
+    alpha = (1 - confidence) / 2
+    ci_low, ci_high = np.quantile(draws, [alpha, 1 - alpha])
+    return {
+        "cohens_d": float((neg_mean - pos_mean) / np.sqrt(neg_var + pos_var)),
+        "ci_low": float(ci_low),
+        "ci_high": float(ci_high),
+        "std_error": float(draws.std(ddof=1)),
+        "confidence": confidence,
+        "resamples": resamples,
+    }
+
+
+def _chi2_tables(tables: np.ndarray, expected: np.ndarray, correction: bool) -> np.ndarray:
+    """``chi2_contingency``'s statistic (with its Yates rule for 1 dof) for a stack of tables."""
+    observed = tables.astype(np.float64)
+    if correction:
+        diff = expected - observed
+        observed = observed + np.sign(diff) * np.minimum(0.5, np.abs(diff))
+    return ((observed - expected) ** 2 / expected).sum(axis=(-2, -1))
+
+
+def permutation_chi_square(
+    contingency: Sequence[Sequence[int]],
+    *,
+    resamples: int = 10_000,
+    seed: int = 42,
+    block_elements: int = DEFAULT_BLOCK_ELEMENTS,
+) -> Dict[str, float]:
+    """Monte Carlo permutation p-value for ``chi_square_text_category``'s statistic.
+
+    Shuffling sentiment labels against the Short/Long split keeps both margins fixed, so a
+    permuted table's first row follows a (multivariate) hypergeometric law. The permuted
+    tables are drawn from it directly, a block at a time, instead of shuffling every row.
+    Needs only the observed table, which the streaming path has.
+    """
+    if resamples < 1:
+        raise ValueError("resamples must be >= 1")
+    observed = np.asarray(contingency, dtype=np.int64)
+    if observed.ndim != 2 or min(observed.shape) < 2:
+        # chi2_contingency reports 0 dof and a p-value of 1 for a degenerate table.
+        return {"chi2": 0.0, "p_value": 1.0, "resamples": resamples}
+    if observed.shape[0] > 2:
+        observed = observed.T
+    if observed.shape[0] != 2:
+        raise ValueError("permutation_chi_square supports 2 x k tables")
+
+    expected = expected_freq(observed)
+    correction = observed.shape[1] == 2
+    statistic = float(_chi2_tables(observed, expected, correction))
+    column_totals, row_total = observed.sum(axis=0), int(observed[0].sum())
+
+    exceed = 0
+    sizes = _block_sizes(resamples, observed.size, block_elements)
+    for block_seed, size in zip(spawn_seeds(seed, len(sizes)), sizes):
+        rng = np.random.default_rng(block_seed)
+        if correction:
+            first = rng.hypergeometric(column_totals[0], column_totals[1], row_total, size=size)
+            first = np.stack([first, row_total - first], axis=1)
+        else:
+            first = rng.multivariate_hypergeometric(column_totals, row_total, size=size)
+        tables = np.stack([first, column_totals - first], axis=1)
+        # Relative tolerance so tables tied with the observed one count as "at least as extreme".
+        exceed += int((_chi2_tables(tables, expected, correction) >= statistic * (1 - 1e-12)).sum())
+    return {"chi2": statistic, "p_value": (exceed + 1) / (resamples + 1), "resamples": resamples}
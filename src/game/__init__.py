@@ -1,3 +1,11 @@
-from .engine import GameEngine
+from src.utils.lazy import lazy_exports
 
-__all__ = ["GameEngine"]
+_EXPORTS = {
+    "GameEngine": ".engine",
+    "SessionManager": ".server",
+    "SessionEventLog": ".event_log",
+    "SessionEventReader": ".event_log",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
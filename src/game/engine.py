@@ -3,15 +3,33 @@
 from __future__ import annotations
 
 import json
+import uuid
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Protocol, Sequence
 
-from src.sentiment.polarity_features import extract_features
+import numpy as np
+
+from src.sentiment.polarity_features import configure_engine, extract_features, extract_polarities
+from src.utils.config import load_yaml
 from src.utils.logging_utils import configure_logging
 
+if TYPE_CHECKING:
+    from src.game.event_log import SessionEventLog
+
 LOGGER = configure_logging(name=__name__)
 
+ZONES = ("strongly_negative", "mildly_negative", "neutral", "positive")
+# Left-closed bin edges for np.digitize; the first edge is nudged past -0.3 so that
+# polarity == -0.3 lands in strongly_negative, matching the scalar ladder.
+ZONE_EDGES = np.array([np.nextafter(-0.3, 1.0), 0.0, 0.3])
+
+
+class PolarityModel(Protocol):
+    """Anything that scores (context, response) pairs on [-1, 1], e.g. ``DualStreamPredictor``."""
+
+    def polarities(self, contexts: Sequence[str], responses: Sequence[str]) -> np.ndarray: ...
+
 
 @dataclass
 class Choice:
@@ -37,24 +55,46 @@ class Feedback:
 
 
 class GameEngine:
-    def __init__(self, scenarios: List[Scenario], feedback_map: Dict[str, Feedback]):
+    def __init__(
+        self,
+        scenarios: List[Scenario],
+        feedback_map: Dict[str, Feedback],
+        polarity_model: Optional[PolarityModel] = None,
+        event_log: Optional[SessionEventLog] = None,
+    ):
         self.scenarios = scenarios
         self.feedback_map = feedback_map
-        self.session_log: List[Dict[str, str]] = []
+        self.polarity_model = polarity_model
+        self.event_log = event_log
+        self.session_log: List[Dict[str, object]] = []
 
     @classmethod
     def from_default_assets(
         cls,
         scenario_path: Path | str = Path("src/game/scenarios.json"),
         feedback_path: Path | str = Path("src/game/feedback_templates.json"),
+        config_path: Path | str | None = Path("configs/game_config.yaml"),
     ) -> "GameEngine":
+        polarity_model = None
+        event_log = None
+        if config_path is not None and Path(config_path).exists():
+            config = load_yaml(config_path)
+            configure_engine(**config.get("sentiment", {}))
+            polarity_model = _load_polarity_model(config.get("model", {}))
+            event_log = _open_event_log(config.get("event_log", {}))
         scenarios = _load_scenarios(scenario_path)
         feedback = _load_feedback(feedback_path)
-        return cls(scenarios, feedback)
+        return cls(scenarios, feedback, polarity_model, event_log)
+
+    def polarity(self, text: str, context: str = "") -> float:
+        if self.polarity_model is not None:
+            return float(self.polarity_model.polarities([context], [text])[0])
+        return extract_features(text)["polarity"]
 
-    def _route_feedback(self, text: str) -> Feedback:
-        features = extract_features(text)
-        polarity = features["polarity"]
+    def _route_feedback(self, text: str, context: str = "") -> Feedback:
+        return self.feedback_for_polarity(self.polarity(text, context), text)
+
+    def feedback_for_polarity(self, polarity: float, text: str = "") -> Feedback:
         if polarity <= -0.3:
             zone = "strongly_negative"
         elif polarity < 0:
@@ -66,35 +106,140 @@ class GameEngine:
         LOGGER.debug("Routing text '%s' with polarity %.3f to zone %s", text, polarity, zone)
         return self.feedback_map[zone]
 
+    def route_feedback_batch(self, texts: Iterable[str], contexts: Optional[Iterable[str]] = None) -> List[Feedback]:
+        """Route N texts to N feedback templates with one polarity pass and one digitize."""
+        if self.polarity_model is not None:
+            texts = list(texts)
+            contexts = [""] * len(texts) if contexts is None else list(contexts)
+            polarities = self.polarity_model.polarities(contexts, texts)
+        else:
+            polarities = extract_polarities(texts)
+        zone_idx = np.digitize(polarities, ZONE_EDGES)
+        feedback_by_zone = [self.feedback_map[zone] for zone in ZONES]
+        return [feedback_by_zone[idx] for idx in zone_idx.tolist()]
+
+    def resolve_choice(self, scenario: Scenario, selection: int | str) -> Choice:
+        """Map a 1-based option number or a choice id onto ``scenario.choices``."""
+        for choice in scenario.choices:
+            if choice.id == selection:
+                return choice
+        try:
+            index = int(selection) - 1
+            if index < 0:
+                raise IndexError(index)
+            return scenario.choices[index]
+        except (TypeError, ValueError, IndexError):
+            LOGGER.warning("Invalid choice %r for scenario %s; defaulting to option 1", selection, scenario.id)
+            return scenario.choices[0]
+
+    @staticmethod
+    def build_log_entry(scenario: Scenario, text: str, feedback: Feedback, choice: Choice) -> Dict[str, object]:
+        return {
+            "scenario_id": scenario.id,
+            "user_text": text,
+            "feedback_label": feedback.label,
+            "choice_id": choice.id,
+            "health_score": choice.health,
+        }
+
+    def record_step(
+        self,
+        session_id: str,
+        step: int,
+        scenario: Scenario,
+        text: str,
+        feedback: Feedback,
+        choice: Choice,
+        polarity: float,
+    ) -> None:
+        """Append one step to the binary event log, if one is configured (the raw text is not stored)."""
+        if self.event_log is None:
+            return
+        self.event_log.append(
+            session_id=session_id,
+            step=step,
+            scenario_id=scenario.id,
+            choice_id=choice.id,
+            feedback_label=feedback.label,
+            health_score=choice.health,
+            polarity=polarity,
+            text_length=len(text),
+        )
+
+    def close(self) -> None:
+        """Flush and release the event log; the engine can no longer record steps afterwards."""
+        if self.event_log is not None:
+            self.event_log.close()
+            self.event_log = None
+
     def run_cli_session(self) -> None:
+        """Play every scenario on stdin/stdout, then close the engine.
+
+        The event log is closed (and so flushed) even if the player quits with Ctrl-C or
+        EOF part-way, so the steps played so far are kept.
+        """
         LOGGER.info("Starting CLI CBT session")
-        for scenario in self.scenarios:
-            print(f"\n== {scenario.title} ==")
-            print(scenario.prompt)
-            text = input("Your thought: ")
-            feedback = self._route_feedback(text)
-            print(f"\n{feedback.label}: {feedback.message}")
-            print("Suggested skills:", ", ".join(feedback.skills))
-
-            for idx, choice in enumerate(scenario.choices, start=1):
-                print(f"  [{idx}] {choice.text}")
-            selection = input("Pick an action #: ")
-            try:
-                choice = scenario.choices[int(selection) - 1]
-            except Exception:  # pragma: no cover - interactive
-                LOGGER.warning("Invalid choice; defaulting to option 1")
-                choice = scenario.choices[0]
-
-            log_entry = {
-                "scenario_id": scenario.id,
-                "user_text": text,
-                "feedback_label": feedback.label,
-                "choice_id": choice.id,
-                "health_score": choice.health,
-            }
-            self.session_log.append(log_entry)
-            LOGGER.info("Scenario %s logged", scenario.id)
-        print("\nSession complete! Review session_log for analytics.")
+        session_id = uuid.uuid4().hex
+        events_dir = self.event_log.directory if self.event_log is not None else None
+        try:
+            for step, scenario in enumerate(self.scenarios):
+                print(f"\n== {scenario.title} ==")
+                print(scenario.prompt)
+                text = input("Your thought: ")
+                polarity = self.polarity(text, scenario.prompt)
+                feedback = self.feedback_for_polarity(polarity, text)
+                print(f"\n{feedback.label}: {feedback.message}")
+                print("Suggested skills:", ", ".join(feedback.skills))
+
+                for idx, choice in enumerate(scenario.choices, start=1):
+                    print(f"  [{idx}] {choice.text}")
+                selection = input("Pick an action #: ")
+                choice = self.resolve_choice(scenario, selection)
+
+                self.session_log.append(self.build_log_entry(scenario, text, feedback, choice))
+                self.record_step(session_id, step, scenario, text, feedback, choice, polarity)
+                LOGGER.info("Scenario %s logged", scenario.id)
+        finally:
+            self.close()
+        if events_dir is not None:
+            print(f"\nSession complete! Events saved to {events_dir}.")
+        else:
+            print("\nSession complete! Review session_log for analytics.")
+
+
+def _load_polarity_model(settings: Dict[str, object]) -> Optional[PolarityModel]:
+    """Build the trained-model router from the ``model:`` config section, if enabled."""
+    if not settings.get("enabled", False):
+        return None
+    if settings.get("runtime", "keras") == "lite":
+        from src.serving.lite_runtime import LitePredictor
+
+        LOGGER.info("Routing feedback with the exported TFLite model")
+        return LitePredictor.from_export(settings.get("export_dir", "artifacts/export"))
+    # TensorFlow is only imported when the trained model is actually requested.
+    from src.models.predictor import DualStreamPredictor, MicroBatcher
+
+    predictor = DualStreamPredictor.from_artifacts(settings.get("artifacts_dir", "artifacts"))
+    LOGGER.info("Routing feedback with the trained dual-stream model")
+    return MicroBatcher(
+        predictor,
+        max_batch_size=int(settings.get("max_batch_size", 32)),
+        max_wait_ms=float(settings.get("max_wait_ms", 5.0)),
+    )
+
+
+def _open_event_log(settings: Dict[str, object]) -> Optional[SessionEventLog]:
+    """Open the append-only session event log from the ``event_log:`` config section, if enabled."""
+    if not settings.get("enabled", False):
+        return None
+    from src.game.event_log import SessionEventLog
+
+    interval = settings.get("flush_interval_s", 1.0)
+    return SessionEventLog(
+        settings.get("path", "artifacts/session_events"),
+        flush_every=int(settings.get("flush_every", 1024)),
+        flush_interval_s=None if interval is None else float(interval),
+    )
 
 
 def _load_scenarios(path: Path | str) -> List[Scenario]:
@@ -0,0 +1,317 @@
+"""Durable, append-only, columnar log of gameplay steps with a memory-mapped reader.
+
+A log is a directory with one raw little-endian file per column (``<column>.bin``).
+Scenario, choice, feedback and session ids are interned per column into
+``<column>.strings`` (one JSON string per line, id = line number), so each of those
+columns holds ``uint32`` codes. ``schema.json`` records the layout. Appends are buffered
+and written ``flush_every`` events at a time, and a background thread writes whatever is
+buffered every ``flush_interval_s`` seconds; each flush ends with one fsync per file. A
+string is always fsynced before any row that references it. A flush that fails part way
+truncates every file back to its last committed size and leaves the log failed: further
+appends raise, and the log has to be reopened.
+"""
+
+from __future__ import annotations
+
+import atexit
+import fcntl
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import numpy as np
+
+from src.utils.logging_utils import configure_logging
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+LOGGER = configure_logging(name=__name__)
+
+SCHEMA_VERSION = 1
+SCHEMA_FILENAME = "schema.json"
+COLUMNS: Dict[str, str] = {
+    "timestamp_ns": "<i8",
+    "session": "<u4",
+    "step": "<u2",
+    "scenario": "<u4",
+    "choice": "<u4",
+    "feedback": "<u4",
+    "health_score": "<i2",
+    "polarity": "<f4",
+    "text_length": "<u4",
+}
+INTERNED = ("session", "scenario", "choice", "feedback")
+
+
+def _read_strings(path: Path) -> List[str]:
+    if not path.exists():
+        return []
+    with open(path, "rb") as fp:
+        data = fp.read()
+    # A line without its newline is a string whose write never completed; no row uses it.
+    complete = data[: data.rfind(b"\n") + 1]
+    return [json.loads(line) for line in complete.decode("utf-8").splitlines()]
+
+
+def _write_all(fp, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[fp.write(view):]
+
+
+def _committed_rows(directory: Path) -> int:
+    """Rows present in every column file (a crash mid-flush can leave some columns longer)."""
+    sizes = []
+    for name, dtype in COLUMNS.items():
+        path = directory / f"{name}.bin"
+        sizes.append(path.stat().st_size // np.dtype(dtype).itemsize if path.exists() else 0)
+    return min(sizes)
+
+
+def _check_schema(directory: Path) -> None:
+    with open(directory / SCHEMA_FILENAME, encoding="utf-8") as fp:
+        schema = json.load(fp)
+    if schema.get("version") != SCHEMA_VERSION or schema.get("columns") != COLUMNS:
+        raise ValueError(f"{directory} holds an event log with a different schema: {schema}")
+
+
+class SessionEventLog:
+    """Single-writer appender; an exclusive ``flock`` on ``schema.json`` keeps it that way.
+
+    Opening an existing log trims any partially flushed rows or strings, then appends after them.
+    Buffered steps are flushed by ``close()``, which also runs at interpreter exit if the
+    owner never called it.
+    """
+
+    def __init__(self, directory: str | Path, *, flush_every: int = 1024, flush_interval_s: Optional[float] = 1.0):
+        if flush_every < 1:
+            raise ValueError("flush_every must be >= 1")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.flush_every = flush_every
+        self.flush_interval_s = flush_interval_s
+        schema_path = self.directory / SCHEMA_FILENAME
+        if not schema_path.exists():
+            with open(schema_path, "w", encoding="utf-8") as fp:
+                json.dump({"version": SCHEMA_VERSION, "columns": COLUMNS, "interned": list(INTERNED)}, fp, indent=2)
+        _check_schema(self.directory)
+        self._lock_fp = open(schema_path, "rb")
+        try:
+            fcntl.flock(self._lock_fp, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self._lock_fp.close()
+            raise ValueError(f"Another process is writing the event log at {self.directory}") from None
+
+        self.rows = _committed_rows(self.directory)
+        self._columns = {}
+        for name, dtype in COLUMNS.items():
+            fp = open(self.directory / f"{name}.bin", "ab", buffering=0)
+            fp.truncate(self.rows * np.dtype(dtype).itemsize)
+            self._columns[name] = fp
+        self._ids: Dict[str, Dict[str, int]] = {}
+        self._strings = {}
+        for name in INTERNED:
+            path = self.directory / f"{name}.strings"
+            known = _read_strings(path)
+            self._ids[name] = {value: code for code, value in enumerate(known)}
+            fp = open(path, "ab", buffering=0)
+            fp.truncate(sum(len(json.dumps(value).encode("utf-8")) + 1 for value in known))
+            self._strings[name] = fp
+        self._pending: Dict[str, list] = {name: [] for name in COLUMNS}
+        self._pending_strings: Dict[str, List[str]] = {name: [] for name in INTERNED}
+        self._mutex = threading.Lock()
+        self.flushes = 0
+        self.closed = False
+        self.failed: Optional[BaseException] = None
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if flush_interval_s is not None:
+            self._flusher = threading.Thread(target=self._flush_periodically, name="event-log-flush", daemon=True)
+            self._flusher.start()
+        atexit.register(self.close)
+
+    def _intern(self, column: str, value: str) -> int:
+        ids = self._ids[column]
+        code = ids.get(value)
+        if code is None:
+            code = ids[value] = len(ids)
+            self._pending_strings[column].append(value)
+        return code
+
+    def append(
+        self,
+        *,
+        session_id: str,
+        step: int,
+        scenario_id: str,
+        choice_id: str,
+        feedback_label: str,
+        health_score: int,
+        polarity: float,
+        text_length: int,
+        timestamp_ns: Optional[int] = None,
+    ) -> None:
+        """Buffer one step; flushes (on the calling thread) once ``flush_every`` steps are buffered."""
+        with self._mutex:
+            if self.closed:
+                raise ValueError(f"Event log {self.directory} is closed")
+            self._check_not_failed()
+            for name, value in (("step", step), ("health_score", health_score), ("text_length", text_length)):
+                info = np.iinfo(COLUMNS[name])
+                if not info.min <= value <= info.max:
+                    raise ValueError(f"{name}={value} does not fit the {COLUMNS[name]} column of {self.directory}")
+            pending = self._pending
+            pending["timestamp_ns"].append(time.time_ns() if timestamp_ns is None else timestamp_ns)
+            pending["session"].append(self._intern("session", session_id))
+            pending["step"].append(step)
+            pending["scenario"].append(self._intern("scenario", scenario_id))
+            pending["choice"].append(self._intern("choice", choice_id))
+            pending["feedback"].append(self._intern("feedback", feedback_label))
+            pending["health_score"].append(health_score)
+            pending["polarity"].append(polarity)
+            pending["text_length"].append(text_length)
+            if len(pending["step"]) >= self.flush_every:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._mutex:
+            self._check_not_failed()
+            self._flush_locked()
+
+    def _check_not_failed(self) -> None:
+        if self.failed is not None:
+            raise ValueError(f"Event log {self.directory} failed to flush ({self.failed!r}); reopen it") from self.failed
+
+    def _flush_periodically(self) -> None:
+        # A step waits at most ``flush_interval_s`` in the buffer, even if no further step arrives.
+        while not self._stop.wait(self.flush_interval_s):
+            try:
+                self.flush()
+            except Exception:
+                LOGGER.exception("Periodic flush of event log %s failed; stopping the flush thread", self.directory)
+                return
+
+    def _flush_locked(self) -> None:
+        count = len(self._pending["step"])
+        if not count:
+            return
+        files = [*self._strings.values(), *self._columns.values()]
+        committed = [os.fstat(fp.fileno()).st_size for fp in files]
+        try:
+            # Encode everything before touching disk, so a bad value cannot leave half a flush behind.
+            string_bytes = {
+                name: "".join(json.dumps(value) + "\n" for value in self._pending_strings[name]).encode("utf-8")
+                for name in INTERNED
+                if self._pending_strings[name]
+            }
+            column_bytes = {name: np.asarray(self._pending[name], dtype=dtype).tobytes() for name, dtype in COLUMNS.items()}
+            # Strings first: a row must never reach disk before the strings its codes point at.
+            for name, data in string_bytes.items():
+                _write_all(self._strings[name], data)
+                os.fsync(self._strings[name].fileno())
+            for name, data in column_bytes.items():
+                _write_all(self._columns[name], data)
+            for fp in self._columns.values():
+                os.fsync(fp.fileno())
+        except BaseException as exc:
+            # Roll every file back so the columns stay aligned; the buffers keep the events.
+            # A failed fsync is not retried: the kernel may already have dropped those pages.
+            self.failed = exc
+            for fp, size in zip(files, committed):
+                try:
+                    os.ftruncate(fp.fileno(), size)
+                except OSError:
+                    LOGGER.exception("Could not roll back %s after a failed flush", fp.name)
+            raise
+        for name in string_bytes:
+            self._pending_strings[name] = []
+        for name in COLUMNS:
+            self._pending[name] = []
+        self.rows += count
+        self.flushes += 1
+
+    def close(self) -> None:
+        """Flush what is buffered and release the files; later calls do nothing."""
+        self._stop.set()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join()
+        with self._mutex:
+            if self.closed:
+                return
+            try:
+                if self.failed is None:
+                    self._flush_locked()
+                elif self._pending["step"]:
+                    LOGGER.error(
+                        "Event log %s failed earlier; dropping %d unflushed events", self.directory, len(self._pending["step"])
+                    )
+            finally:
+                for fp in (*self._columns.values(), *self._strings.values()):
+                    fp.close()
+                self._lock_fp.close()
+                self.closed = True
+                atexit.unregister(self.close)
+        LOGGER.info("Event log %s closed with %d events", self.directory, self.rows)
+
+    def __enter__(self) -> "SessionEventLog":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class SessionEventReader:
+    """Read-only, memory-mapped view of the rows flushed when it was opened."""
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        _check_schema(self.directory)
+        self.rows = _committed_rows(self.directory)
+        self._columns: Dict[str, np.ndarray] = {}
+        self._strings: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def column(self, name: str) -> np.ndarray:
+        """Raw column (interned columns as ``uint32`` codes), memory-mapped, nothing parsed."""
+        if name not in COLUMNS:
+            raise KeyError(f"Unknown event column '{name}'; expected one of {list(COLUMNS)}")
+        if name not in self._columns:
+            if self.rows:
+                self._columns[name] = np.memmap(self.directory / f"{name}.bin", dtype=COLUMNS[name], mode="r", shape=(self.rows,))
+            else:
+                self._columns[name] = np.empty(0, dtype=COLUMNS[name])
+        return self._columns[name]
+
+    def strings(self, name: str) -> List[str]:
+        if name not in INTERNED:
+            raise KeyError(f"Column '{name}' is not interned; expected one of {INTERNED}")
+        if name not in self._strings:
+            self._strings[name] = _read_strings(self.directory / f"{name}.strings")
+        return self._strings[name]
+
+    def to_frame(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Columns as a DataFrame; interned ids become ``Categorical`` straight from their codes."""
+        import pandas as pd
+
+        data = {}
+        for name in columns or list(COLUMNS):
+            values = self.column(name)
+            if name in INTERNED:
+                data[name] = pd.Categorical.from_codes(values.astype(np.int32), categories=self.strings(name))
+            else:
+                data[name] = values
+        return pd.DataFrame(data)
+
+    def analysis_frame(self) -> pd.DataFrame:
+        """The two columns the pilot analyses read (``sentiment`` = polarity > 0, like the rule labels)."""
+        import pandas as pd
+
+        return pd.DataFrame(
+            {"sentiment": (self.column("polarity") > 0).astype(np.int64), "text_length": self.column("text_length")}
+        )
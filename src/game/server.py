@@ -0,0 +1,131 @@
+"""Asyncio session manager that serves many concurrent players from one GameEngine."""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from src.game.engine import Choice, Feedback, GameEngine, Scenario
+from src.utils.logging_utils import configure_logging
+
+LOGGER = configure_logging(name=__name__)
+
+
+@dataclass
+class StepResult:
+    session_id: str
+    scenario_id: str
+    feedback: Feedback
+    choice: Choice
+    done: bool
+
+
+@dataclass
+class GameSession:
+    session_id: str
+    scenario_index: int = 0
+    log: List[Dict[str, object]] = field(default_factory=list)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+    @property
+    def score(self) -> int:
+        return sum(int(entry["health_score"]) for entry in self.log)
+
+
+class SessionManager:
+    """Holds per-player state; the engine's scenarios and feedback map are shared read-only.
+
+    Routing is CPU-bound, so it runs on ``executor`` (the loop's default executor when
+    ``None``) and a slow parse never stalls the event loop serving other sessions. Event
+    log appends run there too, since one that fills the buffer flushes and fsyncs. Close
+    the manager (``close``/``aclose`` or ``async with``) to flush the log on shutdown.
+    """
+
+    def __init__(self, engine: GameEngine, *, executor: Optional[Executor] = None):
+        self.engine = engine
+        self.executor = executor
+        self.sessions: Dict[str, GameSession] = {}
+
+    def create_session(self, session_id: str | None = None) -> GameSession:
+        session_id = session_id or uuid.uuid4().hex
+        if session_id in self.sessions:
+            raise ValueError(f"Session already exists: {session_id}")
+        session = GameSession(session_id=session_id)
+        self.sessions[session_id] = session
+        return session
+
+    def get_session(self, session_id: str) -> GameSession:
+        try:
+            return self.sessions[session_id]
+        except KeyError:
+            raise KeyError(f"Unknown session: {session_id}") from None
+
+    def current_scenario(self, session_id: str) -> Optional[Scenario]:
+        session = self.get_session(session_id)
+        if session.scenario_index >= len(self.engine.scenarios):
+            return None
+        return self.engine.scenarios[session.scenario_index]
+
+    async def step(self, session_id: str, text: str, choice: int | str) -> StepResult:
+        """Route one free-text thought plus a choice for ``session_id`` and advance it."""
+        session = self.get_session(session_id)
+        async with session.lock:
+            if session.scenario_index >= len(self.engine.scenarios):
+                raise ValueError(f"Session {session_id} has already completed every scenario")
+            scenario = self.engine.scenarios[session.scenario_index]
+            loop = asyncio.get_running_loop()
+            polarity_async = getattr(self.engine.polarity_model, "polarity_async", None)
+            if polarity_async is not None:
+                # Micro-batched model: await the batch result instead of parking an executor thread on it.
+                polarity = float(await polarity_async(scenario.prompt, text))
+            else:
+                polarity = await loop.run_in_executor(self.executor, self.engine.polarity, text, scenario.prompt)
+            feedback = self.engine.feedback_for_polarity(polarity, text)
+            selected = self.engine.resolve_choice(scenario, choice)
+            session.log.append(self.engine.build_log_entry(scenario, text, feedback, selected))
+            if self.engine.event_log is not None:
+                await loop.run_in_executor(
+                    self.executor,
+                    self.engine.record_step,
+                    session_id,
+                    session.scenario_index,
+                    scenario,
+                    text,
+                    feedback,
+                    selected,
+                    polarity,
+                )
+            session.scenario_index += 1
+            done = session.scenario_index >= len(self.engine.scenarios)
+        if done:
+            LOGGER.debug("Session %s completed with score %d", session_id, session.score)
+        return StepResult(
+            session_id=session_id,
+            scenario_id=scenario.id,
+            feedback=feedback,
+            choice=selected,
+            done=done,
+        )
+
+    def close_session(self, session_id: str) -> List[Dict[str, object]]:
+        """Drop the session and hand back its log for analytics."""
+        session = self.get_session(session_id)
+        del self.sessions[session_id]
+        return session.log
+
+    def close(self) -> None:
+        """Flush and close the engine's event log; the manager cannot record steps afterwards."""
+        self.engine.close()
+
+    async def aclose(self) -> None:
+        """``close`` on the executor, so the final flush does not block the event loop."""
+        await asyncio.get_running_loop().run_in_executor(self.executor, self.close)
+
+    async def __aenter__(self) -> "SessionManager":
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.aclose()
@@ -1,3 +1,8 @@
-from .cli import run_cli_game
+from src.utils.lazy import lazy_exports
 
-__all__ = ["run_cli_game"]
+_EXPORTS = {
+    "run_cli_game": ".cli",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
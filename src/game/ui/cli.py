@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import threading
+
 from src.game.engine import GameEngine
+from src.sentiment.polarity_features import warm_up
 
 
 def run_cli_game() -> None:
     engine = GameEngine.from_default_assets()
+    # The sentiment backend loads while the first prompt waits for input.
+    threading.Thread(target=warm_up, name="sentiment-warm-up", daemon=True).start()
     engine.run_cli_session()
@@ -1,3 +1,11 @@
-from .dual_attention_model import build_model, DualStreamConfig
+from src.utils.lazy import lazy_exports
 
-__all__ = ["build_model", "DualStreamConfig"]
+_EXPORTS = {
+    "build_model": ".dual_attention_model",
+    "DualStreamConfig": ".dual_attention_model",
+    "DualStreamPredictor": ".predictor",
+    "MicroBatcher": ".predictor",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -2,24 +2,74 @@
 
 from __future__ import annotations
 
-from typing import Iterable, List
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+import numpy as np
 
 try:
-    from transformers import pipeline
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
 except ImportError as exc:  # pragma: no cover
-    raise ImportError("Install transformers to use the BERT baseline") from exc
+    raise ImportError("Install transformers and torch to use the BERT baseline") from exc
 
 
 class BertSentimentBaseline:
-    def __init__(self, model_name: str = "nlptown/bert-base-multilingual-uncased-sentiment"):
-        self._pipeline = pipeline("sentiment-analysis", model=model_name)
+    """Batched, length-sorted inference with a sequence-classification checkpoint.
 
-    def predict(self, texts: Iterable[str]) -> List[float]:
-        outputs = self._pipeline(list(texts))
-        # Map label to pseudo binary score (>=3 stars => adaptive)
-        scores = []
-        for result in outputs:
-            label = result["label"]
-            score = 1.0 if label.endswith(("4", "5")) else 0.0
-            scores.append(score)
+    Tokenizer and model are loaded once. ``cache_dir`` / ``local_files_only`` (or a local
+    directory as ``model_name``) let it run without network access. ``max_length`` defaults
+    to the tokenizer's ``model_max_length``, so texts are only cut where the model must cut them.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "nlptown/bert-base-multilingual-uncased-sentiment",
+        *,
+        cache_dir: Optional[str | Path] = None,
+        local_files_only: bool = False,
+        batch_size: int = 32,
+        max_length: Optional[int] = None,
+        window_batches: int = 16,
+        device: str = "cpu",
+    ):
+        load = dict(cache_dir=str(cache_dir) if cache_dir else None, local_files_only=local_files_only)
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name, **load)
+        self.model = AutoModelForSequenceClassification.from_pretrained(model_name, **load).to(device).eval()
+        self.device = device
+        self.batch_size = batch_size
+        self.max_length = max_length or self.tokenizer.model_max_length
+        self.window = batch_size * window_batches
+        # Map label to pseudo binary score (>=4 stars => adaptive)
+        labels = self.model.config.id2label
+        self._positive = np.array([str(labels[i]).endswith(("4", "5")) for i in range(len(labels))], dtype=np.float32)
+
+    def _score_window(self, texts: List[str]) -> np.ndarray:
+        """Scores for one window, computed in length-sorted batches and returned in input order."""
+        encoded = self.tokenizer(texts, truncation=True, max_length=self.max_length)
+        order = np.argsort([len(ids) for ids in encoded["input_ids"]], kind="stable")
+        scores = np.empty(len(texts), dtype=np.float32)
+        for start in range(0, len(texts), self.batch_size):
+            index = order[start : start + self.batch_size]
+            features = [{key: values[i] for key, values in encoded.items()} for i in index]
+            batch = self.tokenizer.pad(features, return_tensors="pt").to(self.device)
+            with torch.inference_mode():
+                logits = self.model(**batch).logits
+            scores[index] = self._positive[logits.argmax(dim=-1).cpu().numpy()]
         return scores
+
+    def predict_stream(self, texts: Iterable[str]) -> Iterator[float]:
+        """Yield one score per text, in input order, holding only ``window`` texts at a time.
+
+        Each window is sorted by token length so a batch pads to its own longest text.
+        """
+        iterator = iter(texts)
+        while True:
+            window = list(islice(iterator, self.window))
+            if not window:
+                return
+            yield from self._score_window(window).tolist()
+
+    def predict(self, texts: Iterable[str]) -> List[float]:
+        return list(self.predict_stream(texts))
@@ -0,0 +1,118 @@
+"""Length-bucketed batching for pre-padded (context, response) index arrays."""
+
+from __future__ import annotations
+
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import tensorflow as tf
+
+DEFAULT_BOUNDARIES = (8, 16, 32, 64)
+
+Batch = Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]
+
+
+def sequence_lengths(sequences: np.ndarray) -> np.ndarray:
+    """True token counts of pre-padded rows (index 0 is reserved for padding)."""
+    return np.count_nonzero(sequences, axis=1)
+
+
+def bucket_widths(lengths: np.ndarray, boundaries: Sequence[int], seq_length: int) -> np.ndarray:
+    """Smallest boundary >= each length; ``seq_length`` caps the last bucket."""
+    edges = np.array(sorted(b for b in boundaries if b < seq_length) + [seq_length])
+    return edges[np.searchsorted(edges, np.maximum(lengths, 1))]
+
+
+def bucketed_batches(
+    context: np.ndarray,
+    response: np.ndarray,
+    labels: Optional[np.ndarray] = None,
+    *,
+    batch_size: int,
+    boundaries: Sequence[int] = DEFAULT_BOUNDARIES,
+    rng: Optional[np.random.Generator] = None,
+) -> Tuple[List[np.ndarray], List[Batch]]:
+    """Group rows into batches of one bucket each, trimmed to that bucket's width.
+
+    Both streams of a pair share a width (the model concatenates them per time step),
+    so rows are bucketed on ``max(len(context), len(response))``. Because padding is on
+    the left, trimming keeps the last ``width`` columns. With ``rng`` the rows inside each
+    bucket and the batch order are shuffled; otherwise order is deterministic. Returns
+    the original row indices of every batch alongside the batches themselves.
+    """
+    seq_length = context.shape[1]
+    lengths = np.maximum(sequence_lengths(context), sequence_lengths(response))
+    widths = bucket_widths(lengths, boundaries, seq_length)
+    indices: List[np.ndarray] = []
+    for width in np.unique(widths):
+        rows = np.flatnonzero(widths == width)
+        if rng is not None:
+            rows = rng.permutation(rows)
+        indices.extend(rows[start : start + batch_size] for start in range(0, len(rows), batch_size))
+    if rng is not None:
+        indices = [indices[i] for i in rng.permutation(len(indices))]
+
+    batches: List[Batch] = []
+    for rows in indices:
+        width = int(widths[rows[0]])
+        batches.append(
+            (
+                np.ascontiguousarray(context[rows, seq_length - width :]),
+                np.ascontiguousarray(response[rows, seq_length - width :]),
+                None if labels is None else np.asarray(labels)[rows],
+            )
+        )
+    return indices, batches
+
+
+def make_bucketed_dataset(
+    context: np.ndarray,
+    response: np.ndarray,
+    labels: np.ndarray,
+    *,
+    batch_size: int,
+    boundaries: Sequence[int] = DEFAULT_BOUNDARIES,
+    shuffle: bool = True,
+    seed: Optional[int] = None,
+) -> tf.data.Dataset:
+    """``tf.data`` of variable-width batches for a model built with ``mask_padding=True``.
+
+    Batches are re-drawn every epoch when ``shuffle`` is set; widths only take the
+    bucket values, so the training step is traced once per bucket.
+    """
+    rng = np.random.default_rng(seed)
+    labels = np.asarray(labels, dtype=np.float32)
+
+    def _generate() -> Iterator[Tuple[Tuple[np.ndarray, np.ndarray], np.ndarray]]:
+        _, batches = bucketed_batches(
+            context, response, labels, batch_size=batch_size, boundaries=boundaries, rng=rng if shuffle else None
+        )
+        for ctx, rsp, y in batches:
+            yield (ctx.astype(np.int32, copy=False), rsp.astype(np.int32, copy=False)), y
+
+    tokens = tf.TensorSpec(shape=(None, None), dtype=tf.int32)
+    signature = ((tokens, tokens), tf.TensorSpec(shape=(None,), dtype=tf.float32))
+    # Shuffling never changes how many batches each bucket yields, so Keras can be told
+    # the epoch length up front instead of discovering it by running out of data.
+    widths = bucket_widths(
+        np.maximum(sequence_lengths(context), sequence_lengths(response)), boundaries, context.shape[1]
+    )
+    n_batches = int(sum(-(-count // batch_size) for count in np.unique(widths, return_counts=True)[1]))
+    dataset = tf.data.Dataset.from_generator(_generate, output_signature=signature)
+    return dataset.apply(tf.data.experimental.assert_cardinality(n_batches)).prefetch(tf.data.AUTOTUNE)
+
+
+def predict_bucketed(
+    model: tf.keras.Model,
+    context: np.ndarray,
+    response: np.ndarray,
+    *,
+    batch_size: int = 256,
+    boundaries: Sequence[int] = DEFAULT_BOUNDARIES,
+) -> np.ndarray:
+    """Probabilities in the original row order, computed bucket by bucket."""
+    probs = np.empty(len(context), dtype=np.float32)
+    indices, batches = bucketed_batches(context, response, batch_size=batch_size, boundaries=boundaries)
+    for rows, (ctx, rsp, _) in zip(indices, batches):
+        probs[rows] = np.asarray(model.predict_on_batch([ctx.astype(np.int32), rsp.astype(np.int32)])).reshape(-1)
+    return probs.reshape(-1, 1)
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-from tensorflow.keras import Model, layers
+from tensorflow.keras import Model, layers, ops
 
 
 @dataclass(frozen=True)
@@ -18,11 +18,25 @@ class DualStreamConfig:
     dense_units: int = 64
     memory_units: int = 128
     dropout_rate: float = 0.5
+    # Accept any sequence length and ignore padding (index 0) everywhere, so a batch
+    # padded to 12 tokens scores the same as one padded to seq_length.
+    mask_padding: bool = False
 
 
-def build_model(config: DualStreamConfig = DualStreamConfig()) -> Model:
-    context_input = layers.Input(shape=(config.seq_length,), name="Context_Input")
-    response_input = layers.Input(shape=(config.seq_length,), name="Response_Input")
+def _padding_mask(token_ids):
+    return ops.not_equal(token_ids, 0)
+
+
+def _zero_masked(x, mask):
+    return x * ops.expand_dims(ops.cast(mask, x.dtype), -1)
+
+
+def build_model(config: DualStreamConfig = DualStreamConfig(), *, compile: bool = True) -> Model:
+    """``compile=False`` leaves compilation to the caller (e.g. with its own optimizer,
+    ``jit_compile`` and ``steps_per_execution``) so the model is compiled exactly once."""
+    length = None if config.mask_padding else config.seq_length
+    context_input = layers.Input(shape=(length,), name="Context_Input")
+    response_input = layers.Input(shape=(length,), name="Response_Input")
 
     embedding_layer = layers.Embedding(
         input_dim=config.vocab_size,
@@ -31,14 +45,21 @@ def build_model(config: DualStreamConfig = DualStreamConfig()) -> Model:
     )
     context_embed = embedding_layer(context_input)
     response_embed = embedding_layer(response_input)
+    context_mask = response_mask = None
+    if config.mask_padding:
+        # Zeroed pad embeddings look exactly like Conv1D's own "same" zero padding, and
+        # the LSTMs skip masked steps, so real positions never see how much padding there is.
+        context_mask, response_mask = _padding_mask(context_input), _padding_mask(response_input)
+        context_embed = _zero_masked(context_embed, context_mask)
+        response_embed = _zero_masked(response_embed, response_mask)
 
     conv_kwargs = dict(filters=config.conv_filters, kernel_size=config.conv_kernel_size, activation="relu", padding="same")
     context_conv = layers.Conv1D(**conv_kwargs)(context_embed)
     response_conv = layers.Conv1D(**conv_kwargs)(response_embed)
 
-    bi_lstm = lambda x: layers.Bidirectional(layers.LSTM(config.lstm_units, return_sequences=True))(x)
-    context_bi = bi_lstm(context_conv)
-    response_bi = bi_lstm(response_conv)
+    bi_lstm = lambda x, mask: layers.Bidirectional(layers.LSTM(config.lstm_units, return_sequences=True))(x, mask=mask)
+    context_bi = bi_lstm(context_conv, context_mask)
+    response_bi = bi_lstm(response_conv, response_mask)
 
     concat = layers.Concatenate()
     context_cross = concat([context_bi, response_bi])
@@ -47,6 +68,10 @@ def build_model(config: DualStreamConfig = DualStreamConfig()) -> Model:
     attention = layers.Dense(256, activation="tanh")
     context_att_weights = layers.Activation("softmax")(attention(context_cross))
     response_att_weights = layers.Activation("softmax")(attention(response_cross))
+    if config.mask_padding:
+        # Dot(axes=1) sums over time; padded steps must contribute nothing to that sum.
+        context_att_weights = _zero_masked(context_att_weights, context_mask)
+        response_att_weights = _zero_masked(response_att_weights, response_mask)
 
     context_vec = layers.Dot(axes=1)([context_att_weights, context_cross])
     response_vec = layers.Dot(axes=1)([response_att_weights, response_cross])
@@ -57,8 +82,11 @@ def build_model(config: DualStreamConfig = DualStreamConfig()) -> Model:
     final = layers.Concatenate()([layers.Flatten()(context_vec), layers.Flatten()(response_vec), layers.Flatten()(memory)])
     final = layers.Dense(config.dense_units, activation="relu")(final)
     final = layers.Dropout(config.dropout_rate)(final)
-    output = layers.Dense(1, activation="sigmoid", name="sentiment_output")(final)
+    # Probabilities stay float32 under a mixed-precision policy, for a stable loss.
+    output = layers.Dense(1, activation="sigmoid", name="sentiment_output", dtype="float32")(final)
 
     model = Model(inputs=[context_input, response_input], outputs=output)
-    model.compile(optimizer="adam", loss="binary_crossentropy", metrics=["accuracy"])
+    if compile:
+        model.compile(optimizer="adam", loss="binary_crossentropy", metrics=["accuracy"])
     return model
+
@@ -0,0 +1,253 @@
+"""Export the trained dual-stream model to a quantized TFLite artifact and check it against the float model."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras.preprocessing.text import Tokenizer
+
+from src.models.dual_attention_model import DualStreamConfig
+from src.serving.lite_runtime import LITE_MODEL_FILENAME, VOCAB_FILENAME, LitePredictor
+from src.utils.logging_utils import configure_logging
+
+LOGGER = configure_logging(name=__name__)
+
+QUANTIZATIONS = ("float32", "dynamic", "int8")
+EXPORT_REPORT_FILENAME = "export_report.json"
+
+
+def _unrolled_copy(model: tf.keras.Model, seq_length: int) -> tf.keras.Model:
+    """Same weights with every LSTM unrolled, on ``(None, seq_length)`` inputs.
+
+    A looped LSTM converts to TFLite tensor-list ops whose element shape is only known
+    per batch; unrolled, every op has a static shape, the batch dimension can be resized
+    at runtime and int8 calibration works. Unrolling needs a known time dimension, so a
+    ``mask_padding`` model (built on variable-length inputs) is re-traced at ``seq_length``;
+    its masking is kept.
+    """
+
+    def _clone(layer: tf.keras.layers.Layer) -> tf.keras.layers.Layer:
+        config = layer.get_config()
+        # Export computes in float32 even if training ran under a mixed-precision policy;
+        # quantization is applied by the converter on top.
+        config["dtype"] = "float32"
+        if isinstance(layer, tf.keras.layers.Bidirectional):
+            for key in ("layer", "backward_layer"):
+                if key in config:
+                    config[key]["config"].update(unroll=True, dtype="float32")
+        return layer.__class__.from_config(config)
+
+    inputs = [tf.keras.Input(shape=(seq_length,), dtype=tensor.dtype) for tensor in model.inputs]
+    copy = tf.keras.models.clone_model(model, input_tensors=inputs, clone_function=_clone)
+    copy.set_weights(model.get_weights())
+    return copy
+
+
+def convert_to_tflite(
+    model: tf.keras.Model,
+    seq_length: int,
+    *,
+    quantization: str = "dynamic",
+    calibration: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> bytes:
+    """Flatbuffer bytes for ``model`` with inputs named ``context``/``response``.
+
+    ``dynamic`` stores weights as int8 and dequantizes on the fly; ``int8`` also quantizes
+    activations using ``calibration`` rows (a representative sample of encoded pairs).
+    """
+    if quantization not in QUANTIZATIONS:
+        raise ValueError(f"Unknown quantization '{quantization}'; expected one of {QUANTIZATIONS}")
+    if quantization == "int8" and calibration is None:
+        raise ValueError("int8 quantization needs calibration (context, response) arrays")
+
+    unrolled = _unrolled_copy(model, seq_length)
+    spec = tf.TensorSpec(shape=(None, seq_length), dtype=tf.int32)
+
+    @tf.function(input_signature=[spec, spec])
+    def serve(context, response):
+        return unrolled([context, response], training=False)
+
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([serve.get_concrete_function()])
+    if quantization != "float32":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if quantization == "int8":
+        context, response = calibration
+
+        def _representative() -> Iterator[List[np.ndarray]]:
+            for row in range(len(context)):
+                yield [context[row : row + 1].astype(np.int32), response[row : row + 1].astype(np.int32)]
+
+        converter.representative_dataset = _representative
+    return converter.convert()
+
+
+def write_vocab(tokenizer: Tokenizer, seq_length: int, path: str | Path) -> None:
+    """Only what ``LiteTokenizer`` needs: the kept part of the index plus the text rules."""
+    limit = tokenizer.num_words or len(tokenizer.word_index) + 1
+    payload = {
+        "seq_length": seq_length,
+        "filters": tokenizer.filters,
+        "lower": tokenizer.lower,
+        "split": tokenizer.split,
+        "word_index": {word: idx for word, idx in tokenizer.word_index.items() if idx < limit},
+    }
+    Path(path).write_text(json.dumps(payload), encoding="utf-8")
+
+
+def export_lite_model(
+    model: tf.keras.Model,
+    tokenizer: Tokenizer,
+    config: DualStreamConfig,
+    export_dir: str | Path,
+    *,
+    quantization: str = "dynamic",
+    calibration: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> Path:
+    """Write ``dual_stream.tflite`` + ``vocab.json``: everything ``LitePredictor`` loads."""
+    export_dir = Path(export_dir)
+    export_dir.mkdir(parents=True, exist_ok=True)
+    flatbuffer = convert_to_tflite(model, config.seq_length, quantization=quantization, calibration=calibration)
+    model_path = export_dir / LITE_MODEL_FILENAME
+    model_path.write_bytes(flatbuffer)
+    write_vocab(tokenizer, config.seq_length, export_dir / VOCAB_FILENAME)
+    LOGGER.info("Exported %s TFLite model (%.1f KB) to %s", quantization, len(flatbuffer) / 1024, model_path)
+    return model_path
+
+
+def _p50_ms(run: Callable[[], object], repeats: int = 50) -> float:
+    run()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000)
+
+
+_RSS_PROBE = """
+import sys, time
+start = time.perf_counter()
+if sys.argv[1] == "lite":
+    from src.serving.lite_runtime import LitePredictor
+    predictor = LitePredictor.from_export(sys.argv[2])
+else:
+    from src.models.predictor import DualStreamPredictor
+    predictor = DualStreamPredictor.from_artifacts(sys.argv[2])
+predictor.predict_proba(["How do you feel about tonight?"], ["I look awful"])
+elapsed = time.perf_counter() - start
+from src.utils import peak_rss_mb
+print(elapsed, peak_rss_mb(), "tensorflow" in sys.modules)
+"""
+
+
+def measure_runtime_rss(artifacts_dir: str | Path, export_dir: str | Path) -> Dict[str, Dict[str, object]]:
+    """Peak RSS and cold-start time of each runtime, each in a fresh interpreter.
+
+    The probe runs from the repository root, so both paths are resolved first. A probe
+    that fails is reported under ``error`` instead of failing the finished training job.
+    """
+    results: Dict[str, Dict[str, object]] = {}
+    for runtime, path in (("keras", artifacts_dir), ("lite", export_dir)):
+        proc = subprocess.run(
+            [sys.executable, "-c", _RSS_PROBE, runtime, str(Path(path).resolve())],
+            capture_output=True,
+            text=True,
+            cwd=Path(__file__).resolve().parents[2],
+        )
+        fields = proc.stdout.split()[-3:] if proc.returncode == 0 else []
+        if len(fields) != 3:
+            detail = (proc.stderr.strip().splitlines() or [f"exit status {proc.returncode}"])[-1]
+            LOGGER.warning("%s runtime probe failed: %s", runtime, detail)
+            results[runtime] = {"error": detail}
+            continue
+        seconds, rss_mb, imported_tf = fields
+        results[runtime] = {
+            "cold_start_s": float(seconds),
+            "peak_rss_mb": float(rss_mb),
+            "imports_tensorflow": imported_tf == "True",
+        }
+    return results
+
+
+def compare_with_float(
+    model: tf.keras.Model,
+    export_dir: str | Path,
+    held_out: Iterable[Tuple[np.ndarray, np.ndarray, np.ndarray]],
+    *,
+    weights_path: Optional[str | Path] = None,
+) -> Dict[str, object]:
+    """Accuracy parity on the held-out ``(context, response, labels)`` blocks plus size and
+    single-request latency. Only running counts are kept, so the streaming path can pass
+    its test split one block at a time."""
+    export_dir = Path(export_dir)
+    lite = LitePredictor.from_export(export_dir)
+    rows = float_correct = lite_correct = agree = 0
+    max_diff = 0.0
+    one = None
+    for context, response, labels in held_out:
+        if not len(labels):
+            continue
+        labels = np.asarray(labels).reshape(-1)
+        float_probs = np.asarray(model.predict([context, response], verbose=0)).reshape(-1)
+        lite_probs = lite.predict_ids(context, response)
+        float_pred, lite_pred = float_probs > 0.5, lite_probs > 0.5
+        rows += len(labels)
+        float_correct += int(np.sum(float_pred == labels))
+        lite_correct += int(np.sum(lite_pred == labels))
+        agree += int(np.sum(float_pred == lite_pred))
+        max_diff = max(max_diff, float(np.max(np.abs(float_probs - lite_probs))))
+        if one is None:
+            one = (np.ascontiguousarray(context[:1]), np.ascontiguousarray(response[:1]))
+    if not rows:
+        raise ValueError("The held-out split is empty; cannot check export parity")
+
+    report: Dict[str, object] = {
+        "float_accuracy": float_correct / rows,
+        "lite_accuracy": lite_correct / rows,
+        "prediction_agreement": agree / rows,
+        "max_abs_prob_diff": max_diff,
+        "held_out_rows": rows,
+        "lite_size_kb": (export_dir / LITE_MODEL_FILENAME).stat().st_size / 1024,
+        "float_latency_ms": _p50_ms(lambda: model.predict_on_batch(list(one))),
+        "lite_latency_ms": _p50_ms(lambda: lite.predict_ids(*one)),
+    }
+    if weights_path is not None:
+        report["float_size_kb"] = Path(weights_path).stat().st_size / 1024
+    return report
+
+
+def run_export(
+    model: tf.keras.Model,
+    tokenizer: Tokenizer,
+    config: DualStreamConfig,
+    artifacts_dir: str | Path,
+    *,
+    quantization: str,
+    calibration: Tuple[np.ndarray, np.ndarray],
+    held_out: Optional[Iterable[Tuple[np.ndarray, np.ndarray, np.ndarray]]] = None,
+    weights_path: Optional[str | Path] = None,
+    measure_rss: bool = True,
+) -> Dict[str, object]:
+    """Export, then write ``export_report.json`` next to the artifact.
+
+    ``held_out`` yields ``(context, response, labels)`` blocks for the parity check.
+    """
+    export_dir = Path(artifacts_dir) / "export"
+    export_lite_model(model, tokenizer, config, export_dir, quantization=quantization, calibration=calibration)
+    report: Dict[str, object] = {"quantization": quantization}
+    if held_out is not None:
+        report.update(compare_with_float(model, export_dir, held_out, weights_path=weights_path))
+    else:
+        LOGGER.info("No held-out split given; skipping the parity check")
+    if measure_rss:
+        report["runtimes"] = measure_runtime_rss(artifacts_dir, export_dir)
+    with open(export_dir / EXPORT_REPORT_FILENAME, "w", encoding="utf-8") as fp:
+        json.dump(report, fp, indent=2)
+    return report
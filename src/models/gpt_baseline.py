@@ -9,12 +9,18 @@ try:
 except ImportError as exc:  # pragma: no cover
     raise ImportError("Install openai to use the GPT baseline") from exc
 
+from src.models.llm_client import parse_label
+
 
 class GPTFeedbackBaseline:
-    """Lightweight helper that calls an LLM to label text as adaptive or distressed."""
+    """Lightweight helper that calls an LLM to label text as adaptive or distressed.
+
+    One blocking request per text; ``AsyncLLMClient`` is the batched, concurrent, cached
+    version of the same labeling. Replies without a usable label come back as -1.
+    """
 
-    def __init__(self, model: str = "gpt-3.5-turbo", *, api_key: str | None = None):
-        self.client = OpenAI(api_key=api_key)
+    def __init__(self, model: str = "gpt-3.5-turbo", *, api_key: str | None = None, base_url: str | None = None):
+        self.client = OpenAI(api_key=api_key, base_url=base_url)
         self.model = model
 
     def predict(self, texts: Iterable[str]) -> List[int]:  # pragma: no cover (network)
@@ -25,6 +31,5 @@ class GPTFeedbackBaseline:
                 f"Thought: {text}\nReturn only 0 or 1."
             )
             resp = self.client.chat.completions.create(model=self.model, messages=[{"role": "user", "content": prompt}])
-            label = resp.choices[0].message.content.strip()
-            outputs.append(int(label))
+            outputs.append(parse_label(resp.choices[0].message.content or ""))
         return outputs
@@ -0,0 +1,227 @@
+"""Async, batched, cached LLM labeling client for the GPT feedback baseline."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import random
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from src.utils.logging_utils import configure_logging
+
+try:
+    from openai import APIConnectionError, APIStatusError, APITimeoutError, AsyncOpenAI
+except ImportError as exc:  # pragma: no cover
+    raise ImportError("Install openai to use the LLM feedback client") from exc
+
+LOGGER = configure_logging(name=__name__)
+
+UNPARSED = -1
+SYSTEM_PROMPT = "You label thoughts as ADAPTIVE (1) or DISTRESSED (0)."
+_RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+_LINE = re.compile(r"^\s*(\d+)\s*[:.)\-]\s*(.*)$")
+
+
+def parse_label(reply: str) -> int:
+    """0/1 from a free-form reply: the first standalone 0 or 1, else the first label word.
+
+    Returns ``UNPARSED`` instead of raising when the model answers with neither.
+    """
+    match = re.search(r"(?<!\d)(?<!\d\.)([01])(?!\d)(?!\.\d)", reply)
+    if match:
+        return int(match.group(1))
+    words = re.findall(r"adaptive|distressed", reply.lower())
+    if words:
+        return 1 if words[0] == "adaptive" else 0
+    return UNPARSED
+
+
+def pack_prompt(texts: Sequence[str]) -> str:
+    """One prompt for several thoughts, asking for one numbered answer line each."""
+    lines = "\n".join(f"{i}. {' '.join(text.split())}" for i, text in enumerate(texts, 1))
+    return (
+        "Classify each thought below as ADAPTIVE (1) or DISTRESSED (0).\n"
+        f"{lines}\n"
+        f"Answer with exactly {len(texts)} lines in the form '<number>: <0 or 1>' and nothing else."
+    )
+
+
+def parse_packed(reply: str, count: int) -> List[int]:
+    """Labels for a packed reply, ``UNPARSED`` for any thought the reply does not cover."""
+    labels = [UNPARSED] * count
+    for line in reply.splitlines():
+        match = _LINE.match(line)
+        if match and 1 <= int(match.group(1)) <= count:
+            labels[int(match.group(1)) - 1] = parse_label(match.group(2))
+    if count == 1 and labels[0] == UNPARSED:
+        labels[0] = parse_label(reply)
+    return labels
+
+
+class ResponseCache:
+    """Persistent reply cache in SQLite, keyed by SHA-256 of model + prompt."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS replies (key TEXT PRIMARY KEY, model TEXT, reply TEXT)")
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model: str, prompt: str) -> str:
+        return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def get(self, model: str, prompt: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT reply FROM replies WHERE key = ?", (self.key(model, prompt),)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def put(self, model: str, prompt: str, reply: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO replies (key, model, reply) VALUES (?, ?, ?)", (self.key(model, prompt), model, reply)
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+@dataclass
+class ClientStats:
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+    unparsed: int = 0
+
+
+class AsyncLLMClient:
+    """Labels thoughts with an OpenAI-compatible chat endpoint.
+
+    Thoughts are packed ``batch_size`` per prompt. At most ``max_concurrency`` requests are
+    in flight at once. Connection errors, timeouts and 408/409/429/5xx replies are retried
+    ``max_retries`` times with jittered exponential backoff. Replies are cached per
+    (model, prompt) when ``cache_path`` is set, and ``base_url`` points the client at a
+    local stub (``scripts/llm_stub_server.py``) or any compatible server. ``api_key``
+    falls back to ``OPENAI_API_KEY``; the stub accepts any key.
+    """
+
+    def __init__(
+        self,
+        model: str = "gpt-3.5-turbo",
+        *,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        batch_size: int = 8,
+        max_concurrency: int = 8,
+        max_retries: int = 4,
+        backoff_s: float = 0.5,
+        timeout_s: float = 60.0,
+        cache_path: Optional[str | Path] = None,
+        client: Optional[AsyncOpenAI] = None,
+    ):
+        if batch_size < 1 or max_concurrency < 1:
+            raise ValueError("batch_size and max_concurrency must be >= 1")
+        self.model = model
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_s = backoff_s
+        # Retries are ours (counted in ``stats``), so the SDK's own are switched off.
+        self._client_kwargs = dict(base_url=base_url, api_key=api_key, max_retries=0, timeout=timeout_s)
+        self._client = client
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._owns_client = client is None
+        self.cache = ResponseCache(cache_path) if cache_path else None
+        self.stats = ClientStats()
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        # The SDK's HTTP pool is bound to the event loop it first ran on; every ``predict``
+        # call runs a fresh loop, so an owned client is rebuilt per loop.
+        loop = asyncio.get_running_loop()
+        if self._owns_client and self._client_loop is not loop:
+            self._client = AsyncOpenAI(**self._client_kwargs)
+            self._client_loop = loop
+        return self._client
+
+    async def _complete(self, prompt: str, semaphore: asyncio.Semaphore) -> Optional[str]:
+        # SQLite lookups and commits block, so they run on worker threads, off the event loop.
+        if self.cache is not None:
+            cached = await asyncio.to_thread(self.cache.get, self.model, prompt)
+            if cached is not None:
+                return cached
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with semaphore:
+                    self.stats.requests += 1
+                    resp = await self.client.chat.completions.create(
+                        model=self.model,
+                        messages=[{"role": "system", "content": SYSTEM_PROMPT}, {"role": "user", "content": prompt}],
+                        temperature=0,
+                    )
+                reply = resp.choices[0].message.content or ""
+                if self.cache is not None:
+                    await asyncio.to_thread(self.cache.put, self.model, prompt, reply)
+                return reply
+            except (APIConnectionError, APITimeoutError, APIStatusError) as exc:
+                retryable = not isinstance(exc, APIStatusError) or exc.status_code in _RETRYABLE_STATUS
+                if not retryable or attempt == self.max_retries:
+                    LOGGER.warning("LLM request failed after %d attempt(s): %s", attempt + 1, exc)
+                    self.stats.failures += 1
+                    return None
+                self.stats.retries += 1
+                await asyncio.sleep(self.backoff_s * 2**attempt * (0.5 + random.random()))
+        return None
+
+    async def _label_batch(self, texts: Sequence[str], semaphore: asyncio.Semaphore) -> List[int]:
+        reply = await self._complete(pack_prompt(texts), semaphore)
+        labels = parse_packed(reply, len(texts)) if reply is not None else [UNPARSED] * len(texts)
+        missing = [i for i, label in enumerate(labels) if label == UNPARSED]
+        if reply is not None and missing and len(texts) > 1:
+            # The packed answer skipped or garbled some lines: ask for those one by one.
+            singles = await asyncio.gather(*(self._label_batch([texts[i]], semaphore) for i in missing))
+            for i, (label,) in zip(missing, singles):
+                labels[i] = label
+        return labels
+
+    async def predict_async(self, texts: Iterable[str]) -> List[int]:
+        """1 = adaptive, 0 = distressed, ``UNPARSED`` where no usable answer came back."""
+        texts = list(texts)
+        # Duplicates are labeled once; the order of first appearance fixes the batches, so
+        # the same input always produces the same prompts (and cache keys).
+        unique = list(dict.fromkeys(texts))
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        batches = [unique[i : i + self.batch_size] for i in range(0, len(unique), self.batch_size)]
+        results = await asyncio.gather(*(self._label_batch(batch, semaphore) for batch in batches))
+        labels: Dict[str, int] = {text: label for batch, out in zip(batches, results) for text, label in zip(batch, out)}
+        self.stats.unparsed += sum(label == UNPARSED for label in labels.values())
+        return [labels[text] for text in texts]
+
+    def predict(self, texts: Iterable[str]) -> List[int]:
+        async def _run() -> List[int]:
+            try:
+                return await self.predict_async(texts)
+            finally:
+                if self._owns_client and self._client is not None:
+                    await self._client.close()
+
+        return asyncio.run(_run())
+
+    def close(self) -> None:
+        if self.cache is not None:
+            self.cache.close()
@@ -0,0 +1,190 @@
+"""Inference for the trained dual-stream model: compiled forward pass plus request micro-batching."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import queue
+import threading
+import time
+import warnings
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras.preprocessing.sequence import pad_sequences
+from tensorflow.keras.preprocessing.text import Tokenizer, tokenizer_from_json
+
+from src.models.dual_attention_model import DualStreamConfig, build_model
+from src.models.bucketing import DEFAULT_BOUNDARIES, bucket_widths
+from src.utils.logging_utils import configure_logging
+
+LOGGER = configure_logging(name=__name__)
+
+WEIGHTS_FILENAME = "dual_stream.weights.h5"
+MODEL_CONFIG_FILENAME = "model_config.json"
+TOKENIZER_FILENAME = "tokenizer.json"
+
+
+def load_tokenizer(path: str | Path) -> Tokenizer:
+    """Read ``tokenizer.json``; older artifacts stored ``to_json()`` double-encoded."""
+    payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    return tokenizer_from_json(payload if isinstance(payload, str) else json.dumps(payload))
+
+
+class DualStreamPredictor:
+    """Holds the model and tokenizer once; ``predict_proba`` runs a ``tf.function`` traced a
+    single time for ``(None, seq_length)`` int32 inputs, so no call ever retraces.
+    Models built with ``mask_padding`` are traced once for ``(None, None)`` instead."""
+
+    def __init__(
+        self,
+        model: tf.keras.Model,
+        tokenizer: Tokenizer,
+        config: DualStreamConfig,
+        boundaries: Sequence[int] = DEFAULT_BOUNDARIES,
+    ):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.config = config
+        self.boundaries = boundaries
+        # Masked models take any width; encode() then pads only to the batch's length bucket.
+        spec = tf.TensorSpec(shape=(None, None if config.mask_padding else config.seq_length), dtype=tf.int32)
+        self._forward = tf.function(lambda context, response: model([context, response], training=False), input_signature=[spec, spec])
+
+    @classmethod
+    def from_artifacts(cls, artifacts_dir: str | Path = "artifacts") -> "DualStreamPredictor":
+        artifacts_dir = Path(artifacts_dir)
+        weights_path = artifacts_dir / WEIGHTS_FILENAME
+        if not weights_path.exists():
+            raise FileNotFoundError(f"Model weights not found: {weights_path}")
+        config = DualStreamConfig(**json.loads((artifacts_dir / MODEL_CONFIG_FILENAME).read_text(encoding="utf-8")))
+        model = build_model(config, compile=False)
+        with warnings.catch_warnings():
+            # The weights file also carries the training optimizer's slots, which inference never builds.
+            warnings.filterwarnings("ignore", message="Skipping variable loading for optimizer")
+            model.load_weights(weights_path)
+        return cls(model, load_tokenizer(artifacts_dir / TOKENIZER_FILENAME), config)
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        sequences = self.tokenizer.texts_to_sequences([text or "" for text in texts])
+        return pad_sequences(sequences, maxlen=self._width(sequences)).astype(np.int32, copy=False)
+
+    def _width(self, sequences: List[List[int]]) -> int:
+        if not self.config.mask_padding:
+            return self.config.seq_length
+        longest = max((len(seq) for seq in sequences), default=1)
+        return int(bucket_widths(np.array([longest]), self.boundaries, self.config.seq_length)[0])
+
+    def predict_proba(self, contexts: Sequence[str], responses: Sequence[str]) -> np.ndarray:
+        """Probability that each (context, response) pair is adaptive/positive."""
+        if not len(responses):
+            return np.empty(0, dtype=np.float32)
+        sequences = self.tokenizer.texts_to_sequences([text or "" for text in [*contexts, *responses]])
+        # Context and response share one width: the model concatenates them per time step.
+        encoded = pad_sequences(sequences, maxlen=self._width(sequences)).astype(np.int32, copy=False)
+        probs = self._forward(tf.constant(encoded[: len(contexts)]), tf.constant(encoded[len(contexts) :]))
+        return probs.numpy().reshape(-1)
+
+    def polarities(self, contexts: Sequence[str], responses: Sequence[str]) -> np.ndarray:
+        """Probabilities rescaled to [-1, 1] so they route through the game's polarity zones."""
+        return 2.0 * self.predict_proba(contexts, responses) - 1.0
+
+
+@dataclass
+class _Request:
+    context: str
+    response: str
+    future: Future
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-pair requests into batches for one predictor.
+
+    A worker thread takes the first waiting request, then keeps collecting until
+    ``max_batch_size`` requests are queued or ``max_wait_ms`` has passed since that
+    first request, and runs the whole batch through one forward pass.
+    """
+
+    def __init__(self, predictor: DualStreamPredictor, *, max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+        self.predictor = predictor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        self._closed = False
+        self._close_lock = threading.Lock()  # nothing is queued behind the close sentinel
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, context: str, response: str) -> Future:
+        future: Future = Future()
+        with self._close_lock:
+            if self._closed:
+                raise ValueError("MicroBatcher is closed")
+            self._queue.put(_Request(context, response, future))
+        return future
+
+    def predict_proba(self, contexts: Sequence[str], responses: Sequence[str]) -> np.ndarray:
+        futures = [self.submit(c, r) for c, r in zip(contexts, responses)]
+        return np.array([f.result() for f in futures], dtype=np.float32)
+
+    def polarities(self, contexts: Sequence[str], responses: Sequence[str]) -> np.ndarray:
+        return 2.0 * self.predict_proba(contexts, responses) - 1.0
+
+    async def polarity_async(self, context: str, response: str) -> float:
+        """Awaitable single-pair polarity for asyncio callers such as ``SessionManager``."""
+        return 2.0 * await asyncio.wrap_future(self.submit(context, response)) - 1.0
+
+    def close(self) -> None:
+        """Serve what is queued, then stop the worker; later ``submit`` calls raise."""
+        with self._close_lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(None)
+        self._worker.join()
+
+    def _collect(self) -> Tuple[List[_Request], bool]:
+        first = self._queue.get()
+        if first is None:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch, stop = self._collect()
+            if not batch:
+                continue
+            try:
+                probs = self.predictor.predict_proba([r.context for r in batch], [r.response for r in batch])
+            except Exception as exc:  # propagate to every caller in the batch
+                LOGGER.exception("Batch of %d failed", len(batch))
+                for request in batch:
+                    request.future.set_exception(exc)
+                continue
+            for request, prob in zip(batch, probs.tolist()):
+                request.future.set_result(prob)
+        # Fail anything left behind the sentinel rather than leave its caller waiting.
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if request is not None:
+                request.future.set_exception(ValueError("MicroBatcher closed before serving the request"))
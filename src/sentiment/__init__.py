@@ -1,5 +1,14 @@
-from .lexicon_loader import load_lexicon
-from .polarity_features import extract_features
-from .baselines import LexiconRuleBaseline, train_logistic_baseline
+from src.utils.lazy import lazy_exports
 
-__all__ = ["load_lexicon", "extract_features", "LexiconRuleBaseline", "train_logistic_baseline"]
+_EXPORTS = {
+    "load_lexicon": ".lexicon_loader",
+    "load_pattern_lexicon": ".lexicon_loader",
+    "LexiconScorer": ".lexicon_scorer",
+    "configure_engine": ".polarity_features",
+    "extract_features": ".polarity_features",
+    "LexiconRuleBaseline": ".baselines",
+    "train_logistic_baseline": ".baselines",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
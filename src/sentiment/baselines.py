@@ -2,15 +2,21 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, Iterable
+from dataclasses import dataclass, field
+from itertools import chain, repeat
+from typing import Dict, Iterable, Optional, Tuple
 
 import numpy as np
+from scipy import sparse
 from sklearn.linear_model import LogisticRegression
 from sklearn.pipeline import Pipeline
 from sklearn.feature_extraction.text import TfidfVectorizer
 
 
+# Whitespace on both sides makes the NUL a token of its own, so it marks text boundaries.
+_SEPARATOR = " \x00 "
+
+
 def _lexicon_score(text: str, lexicon: Dict[str, float]) -> float:
     score = 0.0
     tokens = text.lower().split()
@@ -21,8 +27,60 @@ def _lexicon_score(text: str, lexicon: Dict[str, float]) -> float:
 
 @dataclass
 class LexiconRuleBaseline:
+    """Mean lexicon score per whitespace token, thresholded.
+
+    ``token_matrix`` turns a batch into a sparse (texts x lexicon words) count matrix;
+    ``score_matrix`` scores it with one mat-vec, so the continuous scores of a tokenized
+    batch (threshold tuning, ROC analysis) can be recomputed without touching the text.
+    Scores equal the per-text ``_lexicon_score`` loop bit for bit: CSR entries keep token
+    order, so each row is summed in the loop's order (duplicates are left unsummed for
+    that reason). ``predict`` itself stays on the loop: building the matrix is bound by the
+    same per-token ``split``/dict lookups and measured slower end to end
+    (``scripts/bench_lexicon_baseline.py``).
+    """
+
     lexicon: Dict[str, float]
     threshold: float = 0.0
+    _index: Optional[Tuple[Dict[str, int], np.ndarray]] = field(default=None, init=False, repr=False, compare=False)
+
+    def _vocabulary(self) -> Tuple[Dict[str, int], np.ndarray]:
+        if self._index is None:
+            words = list(self.lexicon)
+            self._index = ({word: i for i, word in enumerate(words)}, np.fromiter(self.lexicon.values(), float, len(words)))
+        return self._index
+
+    def token_matrix(self, texts: Iterable[str]) -> Tuple[sparse.csr_matrix, np.ndarray]:
+        """(texts x lexicon words) counts and each text's total token count."""
+        vocab, weights = self._vocabulary()
+        texts = list(texts)
+        joined = _SEPARATOR.join(texts)
+        if joined.count("\x00") != max(len(texts) - 1, 0):
+            # A literal separator inside a text would split it; tokenize text by text instead.
+            token_lists = list(map(str.split, map(str.lower, texts)))
+            lengths = np.fromiter(map(len, token_lists), np.int64, len(texts))
+            ids = np.fromiter(map(vocab.get, chain.from_iterable(token_lists), repeat(-1)), np.int64, int(lengths.sum()))
+            rows = np.repeat(np.arange(len(texts)), lengths)
+        else:
+            # One lower() + split() over the whole batch: per-text calls cost more than the lookups.
+            tokens = joined.lower().split()
+            lookup = {**vocab, "\x00": -2}
+            ids = np.fromiter(map(lookup.get, tokens, repeat(-1)), np.int64, len(tokens))
+            separators = ids == -2
+            rows = np.cumsum(separators)[~separators]
+            ids = ids[~separators]
+            lengths = np.bincount(rows, minlength=len(texts))
+        # -1 marks tokens outside the lexicon; they only count towards the length.
+        known = ids >= 0
+        indptr = np.zeros(len(texts) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows[known], minlength=len(texts)), out=indptr[1:])
+        matrix = sparse.csr_matrix((np.ones(int(known.sum())), ids[known], indptr), shape=(len(texts), len(weights)))
+        return matrix, lengths
+
+    def score_matrix(self, matrix: sparse.csr_matrix, lengths: np.ndarray) -> np.ndarray:
+        return (matrix @ self._vocabulary()[1]) / np.maximum(lengths, 1)
+
+    def scores(self, texts: Iterable[str]) -> np.ndarray:
+        return self.score_matrix(*self.token_matrix(texts))
 
     def predict(self, texts: Iterable[str]) -> np.ndarray:
         return np.array([float(_lexicon_score(t, self.lexicon) > self.threshold) for t in texts])
@@ -2,8 +2,13 @@
 
 from __future__ import annotations
 
+import importlib.util
+import xml.etree.ElementTree as ElementTree
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
+
+# (polarity, subjectivity, intensity, is_modifier)
+LexiconEntry = Tuple[float, float, float, bool]
 
 
 def load_lexicon(path: str | Path) -> Dict[str, float]:
@@ -20,3 +25,56 @@ def load_lexicon(path: str | Path) -> Dict[str, float]:
             token, score = line.split("\t")
             lexicon[token.lower()] = float(score)
     return lexicon
+
+
+def default_pattern_lexicon_path() -> Path:
+    """Location of the ``en-sentiment.xml`` bundled with TextBlob (found without importing it)."""
+    spec = importlib.util.find_spec("textblob")
+    if spec is None or not spec.submodule_search_locations:
+        raise FileNotFoundError("textblob is not installed; pass an explicit lexicon path")
+    return Path(list(spec.submodule_search_locations)[0]) / "en" / "en-sentiment.xml"
+
+
+def _avg(values) -> float:
+    values = list(values)
+    return sum(values) / float(len(values) or 1)
+
+
+def load_pattern_lexicon(path: Optional[str | Path] = None) -> Dict[str, LexiconEntry]:
+    """Load pattern's XML sentiment lexicon, averaged per word the way TextBlob does.
+
+    Senses are averaged per part-of-speech tag, then across tags; adjectives also
+    yield a derived "-ly" adverb entry. ``is_modifier`` marks words with an adverb sense.
+    """
+    path = Path(path) if path is not None else default_pattern_lexicon_path()
+    if not path.exists():
+        raise FileNotFoundError(f"Lexicon file not found: {path}")
+    senses: Dict[str, Dict[Optional[str], List[Tuple[float, float, float]]]] = {}
+    for node in ElementTree.parse(path).getroot().findall("word"):
+        form = node.attrib.get("form")
+        if not form:
+            continue
+        psi = (
+            float(node.attrib.get("polarity", 0.0)),
+            float(node.attrib.get("subjectivity", 0.0)),
+            float(node.attrib.get("intensity", 1.0)),
+        )
+        senses.setdefault(form, {}).setdefault(node.attrib.get("pos"), []).append(psi)
+
+    words: Dict[str, Dict[Optional[str], Tuple[float, ...]]] = {}
+    for form, by_pos in senses.items():
+        averaged = {pos: tuple(_avg(col) for col in zip(*psi)) for pos, psi in by_pos.items()}
+        averaged[None] = tuple(_avg(col) for col in zip(*averaged.values()))
+        words[form] = averaged
+    # Mirrors textblob.en.Sentiment.load: "terrible" => "terribly".
+    for form, by_pos in list(words.items()):
+        if "JJ" in by_pos:
+            stem = form[:-1] + "i" if form.endswith("y") else form
+            stem = stem[:-2] if stem.endswith("le") else stem
+            adverb = words.setdefault(stem + "ly", {})
+            adverb["RB"] = adverb[None] = by_pos["JJ"]
+
+    return {
+        form: (by_pos[None][0], by_pos[None][1], by_pos[None][2], "RB" in by_pos)
+        for form, by_pos in words.items()
+    }
@@ -0,0 +1,163 @@
+"""Compiled lexicon scorer: TextBlob-compatible sentiment features without building a TextBlob."""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.sentiment.lexicon_loader import LexiconEntry, load_lexicon, load_pattern_lexicon
+
+PUNCTUATION = ".,;:!?()[]{}`''\"@#$^&*+-|=~_"
+_LEADING = tuple(PUNCTUATION.replace(".", ""))
+_TRAILING = _LEADING + (".",)
+NEGATIONS = frozenset(("no", "not", "n't", "never"))
+CONTRACTIONS = ("'d", "'m", "'s", "'ll", "'re", "'ve", "n't")
+ABBREVIATIONS = frozenset(
+    (
+        "a.", "adj.", "adv.", "al.", "a.m.", "c.", "cf.", "comp.", "conf.", "def.", "ed.", "e.g.",
+        "esp.", "etc.", "ex.", "f.", "fig.", "gen.", "id.", "i.e.", "int.", "l.", "m.", "Med.",
+        "Mil.", "Mr.", "n.", "n.q.", "orig.", "pl.", "pred.", "pres.", "p.m.", "ref.", "v.", "vs.", "w/",
+    )
+)
+EMOTICONS: Dict[float, Tuple[str, ...]] = {
+    +1.00: ("<3", "♥", ">:D", ":-D", ":D", "=-D", "=D", "X-D", "x-D", "XD", "xD", "8-D"),
+    +0.75: (">:P", ":-P", ":P", ":-p", ":p", ":-b", ":b", ":c)", ":o)", ":^)"),
+    +0.50: (">:)", ":-)", ":)", "=)", "=]", ":]", ":}", ":>", ":3", "8)", "8-)"),
+    +0.25: (">;]", ";-)", ";)", ";-]", ";]", ";D", ";^)", "*-)", "*)"),
+    +0.05: (">:o", ":-O", ":O", ":o", ":-o", "o_O", "o.O", "°O°", "°o°"),
+    -0.25: (">:/", ":-/", ":/", ":\\", ">:\\", ":-.", ":-s", ":s", ":S", ":-S", ">.>"),
+    -0.75: (">:[", ":-(", ":(", "=(", ":-[", ":[", ":{", ":-<", ":c", ":-c", "=/"),
+    -1.00: (":'(", ":'''(", ";'("),
+}
+
+_CONTRACTION_RE = re.compile("(" + "|".join(re.escape(c) for c in CONTRACTIONS) + ")")
+_QUOTES = str.maketrans({q: f" {q} " for q in "“”‘’'\""})
+_ABBR_RE = re.compile(r"^(?:[A-Za-z]\.)+$|^[A-Z][b|c|d|f|g|h|j|k|l|m|n|p|q|r|s|t|v|w|x|z]+.$")
+_EMOTICON_RE = re.compile(
+    r"(%s)($|\s)" % "|".join(r" ?".join(re.escape(ch) for ch in e) for group in EMOTICONS.values() for e in group)
+)
+_SARCASM_RE = re.compile(r"\( ?\! ?\)")
+# Approximates TextBlob's ``blob.words`` (Treebank split, punctuation dropped) for token counts.
+_WORD_RE = re.compile(r"[^\W_]+?(?=n't\b)|n't\b|'(?:s|m|d|ll|re|ve)\b|[^\W_]+(?:[-.][^\W_]+)*", re.IGNORECASE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased tokens as pattern's ``find_tokens`` emits them (sentence breaks dropped)."""
+    text = _CONTRACTION_RE.sub(r" \1", text).translate(_QUOTES)
+    tokens: List[str] = []
+    for t in text.split():
+        tail: List[str] = []
+        while t.startswith(_LEADING) and t not in CONTRACTIONS:
+            tokens.append(t[0])
+            t = t[1:]
+        while t.endswith(_TRAILING) and t not in CONTRACTIONS:
+            if t.endswith(_LEADING):
+                tail.append(t[-1])
+                t = t[:-1]
+            if t.endswith("..."):
+                tail.append("...")
+                t = t[:-3].rstrip(".")
+            if t.endswith("."):
+                if t in ABBREVIATIONS or _ABBR_RE.match(t) is not None:
+                    break
+                tail.append(".")
+                t = t[:-1]
+        if t:
+            tokens.append(t)
+        tokens.extend(reversed(tail))
+    joined = " ".join(tokens)
+    if "!" in joined:
+        joined = _SARCASM_RE.sub("(!)", joined)
+    joined = _EMOTICON_RE.sub(lambda m: m.group(1).replace(" ", "") + m.group(2), joined)
+    return joined.lower().split()
+
+
+class LexiconScorer:
+    """Token->score hash built once; scores text in a single pass over its tokens.
+
+    Implements pattern's assessment rules (intensifiers, negation, "!" boost,
+    "(!)" irony, emoticons) so polarity/subjectivity track ``TextBlob.sentiment``.
+    """
+
+    def __init__(self, lexicon: Dict[str, LexiconEntry]):
+        self.lexicon = lexicon
+        self.emoticons = {e.lower(): p for p, group in EMOTICONS.items() for e in group}
+
+    @classmethod
+    def from_path(cls, path: Optional[str | Path] = None) -> "LexiconScorer":
+        """Pattern XML lexicon (TextBlob's bundled one by default) or a ``token\\tscore`` TSV."""
+        if path is not None and Path(path).suffix.lower() != ".xml":
+            return cls({token: (score, 0.0, 1.0, False) for token, score in load_lexicon(path).items()})
+        return cls(load_pattern_lexicon(path))
+
+    def sentiment(self, text: str) -> Tuple[float, float]:
+        lexicon = self.lexicon
+        assessments: List[List[float]] = []  # [polarity, subjectivity, intensity, negated]
+        modifier: Optional[str] = None
+        negation: Optional[str] = None
+        for w in tokenize(text or ""):
+            entry = lexicon.get(w)
+            if entry is not None:
+                p, s, i, is_modifier = entry
+                if modifier is None:
+                    assessments.append([p, s, i, 1.0])
+                else:
+                    last = assessments[-1]
+                    last[0] = max(-1.0, min(p * last[2], +1.0))
+                    last[1] = max(-1.0, min(s * last[2], +1.0))
+                    last[2] = i
+                if negation is not None:
+                    last = assessments[-1]
+                    last[2] = 1.0 / last[2]
+                    last[3] = -1.0
+                modifier = w if is_modifier else None
+                negation = w if w in NEGATIONS else None
+                continue
+            if w in NEGATIONS:
+                negation = w
+            elif negation and len(w.strip("'")) > 1:
+                negation = None
+            if negation is not None and modifier is not None and modifier.endswith("ly"):
+                assessments[-1][3] = -1.0
+                negation = None
+            elif modifier and len(w) > 2:
+                modifier = None
+            if w == "!" and assessments:
+                assessments[-1][0] = max(-1.0, min(assessments[-1][0] * 1.25, +1.0))
+            if w == "(!)":
+                assessments.append([0.0, 1.0, 1.0, 1.0])
+            if len(w) <= 5 and not w.isalpha() and w not in PUNCTUATION:
+                mood = self.emoticons.get(w)
+                if mood is not None:
+                    assessments.append([mood, 1.0, 1.0, 1.0])
+        if not assessments:
+            return 0.0, 0.0
+        polarity = 0.0
+        subjectivity = 0.0
+        for p, s, _, negated in assessments:
+            polarity += p * -0.5 if negated < 0 else p
+            subjectivity += s
+        return polarity / len(assessments), subjectivity / len(assessments)
+
+    @staticmethod
+    def token_count(text: str) -> int:
+        return len(_WORD_RE.findall(text or ""))
+
+    def features(self, text: str) -> Dict[str, float]:
+        """Same keys and semantics as ``polarity_features.extract_features``."""
+        text = text or ""
+        polarity, subjectivity = self.sentiment(text)
+        token_count = self.token_count(text)
+        return {
+            "polarity": polarity,
+            "subjectivity": subjectivity,
+            "token_count": float(token_count),
+            "avg_token_length": (len(text) / token_count) if token_count else 0.0,
+        }
+
+    def polarities(self, texts: Iterable[str]) -> np.ndarray:
+        sentiment = self.sentiment
+        return np.fromiter((sentiment(text)[0] for text in texts), dtype=np.float64)
@@ -2,23 +2,135 @@
 
 from __future__ import annotations
 
+import re
+import threading
 from dataclasses import dataclass
-from typing import Dict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from textblob import TextBlob
+import numpy as np
+
+from src.sentiment.lexicon_scorer import LexiconScorer
+from src.utils.cache import CacheStats, TTLCache
+
+ENGINES = ("textblob", "lexicon")
+
+_ANALYZER = None  # TextBlob's PatternAnalyzer, built on the first TextBlob-engine parse
+_ANALYZER_LOCK = threading.Lock()  # the CLI warm-up thread and the first parse race to build it
+_SCORER: Optional[LexiconScorer] = None
+_SETTINGS: Dict[str, Any] = {"engine": "textblob", "lexicon_path": None, "cache_size": 100_000, "cache_ttl": 3600.0}
+# Shared by the game routing path and dataset labeling; entries are keyed on normalize_text.
+FEATURE_CACHE = TTLCache(maxsize=100_000, ttl=3600.0)
+# Pattern only treats case specially around punctuation (":D" emoticons, "Mr." abbreviations),
+# so texts made of word characters and these marks can be folded to lower case safely.
+_CASE_INSENSITIVE = re.compile(r"[\w\s',!?]*")
+
+
+def configure_engine(
+    engine: str = "textblob",
+    lexicon_path: Optional[str | Path] = None,
+    cache_size: int = 100_000,
+    cache_ttl: Optional[float] = 3600.0,
+) -> None:
+    """Select the backend used by ``extract_features``/``extract_polarities``.
+
+    ``"lexicon"`` preloads a ``LexiconScorer`` once (TextBlob's bundled lexicon unless
+    ``lexicon_path`` is given); ``"textblob"`` restores the TextBlob parse. The shared
+    feature cache is rebuilt empty, since cached scores belong to the previous engine.
+    """
+    global _SCORER, _SETTINGS, FEATURE_CACHE
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown sentiment engine '{engine}'; expected one of {ENGINES}")
+    _SCORER = LexiconScorer.from_path(lexicon_path) if engine == "lexicon" else None
+    FEATURE_CACHE = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+    _SETTINGS = {"engine": engine, "lexicon_path": lexicon_path, "cache_size": cache_size, "cache_ttl": cache_ttl}
+
+
+def engine_settings() -> Dict[str, Any]:
+    """Keyword arguments that reproduce the current engine via ``configure_engine``."""
+    return dict(_SETTINGS)
+
+
+def cache_stats() -> CacheStats:
+    return FEATURE_CACHE.stats()
+
+
+def normalize_text(text: str) -> str:
+    """Cache key: whitespace collapsed, lower-cased where that cannot change the scores."""
+    text = " ".join((text or "").split())
+    return text.lower() if _CASE_INSENSITIVE.fullmatch(text) else text
 
 
 def _safe_length(text: str) -> int:
     return len(text.split()) if text else 0
 
 
+def _pattern_analyzer():
+    # TextBlob (and nltk behind it) takes most of a second to import; the lexicon engine
+    # never needs it.
+    global _ANALYZER
+    if _ANALYZER is None:
+        with _ANALYZER_LOCK:
+            if _ANALYZER is None:
+                from textblob.en.sentiments import PatternAnalyzer
+
+                _ANALYZER = PatternAnalyzer()
+    return _ANALYZER
+
+
+def warm_up() -> None:
+    """Load the current engine's backend now instead of on the first parse.
+
+    Safe to run from a background thread (the CLI does this while the player reads the
+    first scenario).
+    """
+    if _SCORER is None:
+        # The Sentiment lexicon is a lazydict that parses en-sentiment.xml on its first
+        # lookup, and the tokenizer loads on its first use, so run one real parse of each.
+        _pattern_analyzer().analyze("good")
+        from textblob import TextBlob
+
+        len(TextBlob("good").words)
+
+
+def _sentiment(text: str) -> Tuple[float, float]:
+    if _SCORER is not None:
+        return _SCORER.sentiment(text)
+    polarity, subjectivity = _pattern_analyzer().analyze(text)[:2]
+    return polarity, subjectivity
+
+
+def _token_count(text: str) -> int:
+    if _SCORER is not None:
+        return _SCORER.token_count(text)
+    from textblob import TextBlob
+
+    return len(TextBlob(text).words)
+
+
+def sentiment_scores(text: str) -> Tuple[float, float]:
+    """Cached ``(polarity, subjectivity)`` for ``text``."""
+    key = normalize_text(text)
+    return FEATURE_CACHE.get_or_compute(("sentiment", key), lambda: _sentiment(key))
+
+
 def extract_features(text: str) -> Dict[str, float]:
-    blob = TextBlob(text or "")
-    sentiment = blob.sentiment
-    tokens = blob.words
+    key = normalize_text(text)
+    polarity, subjectivity = FEATURE_CACHE.get_or_compute(("sentiment", key), lambda: _sentiment(key))
+    token_count = FEATURE_CACHE.get_or_compute(("tokens", key), lambda: _token_count(key))
     return {
-        "polarity": sentiment.polarity,
-        "subjectivity": sentiment.subjectivity,
-        "token_count": float(len(tokens)),
-        "avg_token_length": (len(text) / max(len(tokens), 1)) if tokens else 0.0,
+        "polarity": polarity,
+        "subjectivity": subjectivity,
+        "token_count": float(token_count),
+        "avg_token_length": (len(text) / token_count) if token_count else 0.0,
     }
+
+
+def extract_polarities(texts: Iterable[str]) -> np.ndarray:
+    """Polarity for a batch of texts with one shared analyzer and no per-text ``TextBlob``."""
+    return np.fromiter((sentiment_scores(text)[0] for text in texts), dtype=np.float64)
+
+
+def label_texts(texts: List[str]) -> np.ndarray:
+    """Rule sentiment labels (``polarity > 0``) for a shard of texts, as int8."""
+    return (extract_polarities(texts) > 0).astype(np.int8)
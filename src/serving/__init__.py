@@ -0,0 +1,11 @@
+"""Lightweight serving runtimes that do not import TensorFlow at startup."""
+
+from src.utils.lazy import lazy_exports
+
+_EXPORTS = {
+    "LitePredictor": ".lite_runtime",
+    "LiteTokenizer": ".lite_runtime",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,114 @@
+"""TFLite runtime for the exported dual-stream model: NumPy + an interpreter, no TensorFlow import."""
+
+from __future__ import annotations
+
+import importlib
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+LITE_MODEL_FILENAME = "dual_stream.tflite"
+VOCAB_FILENAME = "vocab.json"
+
+# Interpreter providers in order of preference; the full TensorFlow wheel is the last resort.
+_INTERPRETER_MODULES = ("ai_edge_litert.interpreter", "tflite_runtime.interpreter", "tensorflow.lite")
+
+
+def _interpreter_class():
+    for name in _INTERPRETER_MODULES:
+        try:
+            return importlib.import_module(name).Interpreter
+        except ImportError:
+            continue
+    raise ImportError("A TFLite interpreter is required: pip install ai-edge-litert (or tflite-runtime)")
+
+
+class LiteTokenizer:
+    """Pure-Python replica of the Keras ``Tokenizer`` + ``pad_sequences("pre")`` encoding."""
+
+    def __init__(self, word_index: Dict[str, int], *, seq_length: int, filters: str, lower: bool = True, split: str = " "):
+        self.word_index = word_index
+        self.seq_length = seq_length
+        self.lower = lower
+        self.split = split
+        self._filters = str.maketrans({c: split for c in filters})
+
+    @classmethod
+    def from_json(cls, path: str | Path) -> "LiteTokenizer":
+        payload = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(
+            payload["word_index"],
+            seq_length=payload["seq_length"],
+            filters=payload["filters"],
+            lower=payload["lower"],
+            split=payload["split"],
+        )
+
+    def texts_to_sequences(self, texts: Sequence[str]) -> List[List[int]]:
+        sequences = []
+        for text in texts:
+            text = (text or "").lower() if self.lower else (text or "")
+            words = text.translate(self._filters).split(self.split)
+            sequences.append([self.word_index[w] for w in words if w in self.word_index])
+        return sequences
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        encoded = np.zeros((len(texts), self.seq_length), dtype=np.int32)
+        for row, seq in enumerate(self.texts_to_sequences(texts)):
+            seq = seq[-self.seq_length :]
+            if seq:
+                encoded[row, self.seq_length - len(seq) :] = seq
+        return encoded
+
+
+class LitePredictor:
+    """Scores (context, response) pairs with the exported ``.tflite`` model.
+
+    The interpreter is not thread-safe, so calls are serialized; input tensors are only
+    resized when the batch size changes.
+    """
+
+    def __init__(self, model_path: str | Path, tokenizer: LiteTokenizer, *, num_threads: Optional[int] = None):
+        self.tokenizer = tokenizer
+        self.interpreter = _interpreter_class()(model_path=str(model_path), num_threads=num_threads)
+        inputs = {d["name"]: d["index"] for d in self.interpreter.get_input_details()}
+        self._context_index = next(i for name, i in inputs.items() if "context" in name)
+        self._response_index = next(i for name, i in inputs.items() if "response" in name)
+        self._output_index = self.interpreter.get_output_details()[0]["index"]
+        self._batch_size = -1
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_export(cls, export_dir: str | Path = "artifacts/export", *, num_threads: Optional[int] = None) -> "LitePredictor":
+        export_dir = Path(export_dir)
+        model_path = export_dir / LITE_MODEL_FILENAME
+        if not model_path.exists():
+            raise FileNotFoundError(f"Exported model not found: {model_path}")
+        return cls(model_path, LiteTokenizer.from_json(export_dir / VOCAB_FILENAME), num_threads=num_threads)
+
+    def predict_ids(self, context: np.ndarray, response: np.ndarray) -> np.ndarray:
+        """Probabilities for already-encoded ``(n, seq_length)`` index arrays."""
+        n = len(context)
+        if not n:
+            return np.empty(0, dtype=np.float32)
+        with self._lock:
+            if n != self._batch_size:
+                shape = [n, self.tokenizer.seq_length]
+                self.interpreter.resize_tensor_input(self._context_index, shape)
+                self.interpreter.resize_tensor_input(self._response_index, shape)
+                self.interpreter.allocate_tensors()
+                self._batch_size = n
+            self.interpreter.set_tensor(self._context_index, np.ascontiguousarray(context, dtype=np.int32))
+            self.interpreter.set_tensor(self._response_index, np.ascontiguousarray(response, dtype=np.int32))
+            self.interpreter.invoke()
+            return self.interpreter.get_tensor(self._output_index).reshape(-1).copy()
+
+    def predict_proba(self, contexts: Sequence[str], responses: Sequence[str]) -> np.ndarray:
+        return self.predict_ids(self.tokenizer.encode(contexts), self.tokenizer.encode(responses))
+
+    def polarities(self, contexts: Sequence[str], responses: Sequence[str]) -> np.ndarray:
+        """Probabilities rescaled to [-1, 1], matching ``DualStreamPredictor.polarities``."""
+        return 2.0 * self.predict_proba(contexts, responses) - 1.0
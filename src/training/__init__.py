@@ -1,3 +1,9 @@
-from .train_model import run_training_job
+from src.utils.lazy import lazy_exports
 
-__all__ = ["run_training_job"]
+_EXPORTS = {
+    "run_sweep": ".sweep",
+    "run_training_job": ".train_model",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,282 @@
+"""K-fold accuracy-vs-cost benchmark of every sentiment model on identical splits."""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import StratifiedKFold
+
+from src.utils import configure_logging, load_yaml, peak_rss_mb, seed_everything, worker_thread_limits
+
+LOGGER = configure_logging(name=__name__)
+
+BENCHMARK_MODELS = ("lexicon", "logistic", "bert", "dual_stream")
+FOLDS_FILENAME = "benchmark_folds.csv"
+SUMMARY_FILENAME = "benchmark_summary.json"
+_LATENCY_SAMPLES = 50
+_ARRAYS = ("context_tokens", "response_tokens", "labels")
+
+
+@dataclass
+class FoldTask:
+    model: str
+    fold: int
+    data_dir: str
+    model_cfg_path: str
+    training_cfg_path: str
+    epochs: Optional[int] = None
+    lexicon_path: Optional[str] = None
+
+
+def prepare_benchmark_data(
+    data_path: str | Path,
+    output_dir: str | Path,
+    *,
+    model_cfg_path: str | Path = "configs/model_config.yaml",
+    training_cfg_path: str | Path = "configs/training_config.yaml",
+    folds: int = 5,
+) -> Path:
+    """Label and tokenize once, assign every row a fold, and write it all where workers can read it."""
+    # Imported here so worker processes that never prepare data do not pay for pandas labeling.
+    from src.models.dual_attention_model import DualStreamConfig
+    from src.training.dataset import add_rule_sentiment, load_dataset, tokenize_streams
+
+    model_cfg = DualStreamConfig(**load_yaml(model_cfg_path))
+    training_cfg = load_yaml(training_cfg_path)
+    data = add_rule_sentiment(
+        load_dataset(data_path),
+        workers=training_cfg.get("labeling_workers", 1),
+        chunk_size=training_cfg.get("labeling_chunk_size", 50_000),
+    )
+    _, context_tokens, response_tokens = tokenize_streams(
+        data["Context"],
+        data["Response"],
+        vocab_size=model_cfg.vocab_size,
+        seq_length=model_cfg.seq_length,
+        mode=training_cfg.get("tokenization", "keras"),
+    )
+    labels = data["sentiment"].to_numpy(dtype=np.int8)
+    fold_of = np.empty(len(labels), dtype=np.int8)
+    splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=training_cfg.get("random_state", 42))
+    for fold, (_, test_idx) in enumerate(splitter.split(np.zeros(len(labels)), labels)):
+        fold_of[test_idx] = fold
+
+    data_dir = Path(output_dir) / "data"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    for name, array in (("context_tokens", context_tokens), ("response_tokens", response_tokens), ("labels", labels)):
+        np.save(data_dir / f"{name}.npy", np.ascontiguousarray(array))
+    np.save(data_dir / "fold.npy", fold_of)
+    (data_dir / "responses.json").write_text(json.dumps(data["Response"].tolist()), encoding="utf-8")
+    return data_dir
+
+
+def _fit_lexicon(task: FoldTask, train: Dict[str, object]) -> Callable[[Dict[str, object]], np.ndarray]:
+    from src.sentiment.baselines import LexiconRuleBaseline
+    from src.sentiment.lexicon_loader import load_lexicon, load_pattern_lexicon
+
+    if task.lexicon_path:
+        lexicon = load_lexicon(task.lexicon_path)
+    else:
+        lexicon = {word: entry[0] for word, entry in load_pattern_lexicon().items()}
+    baseline = LexiconRuleBaseline(lexicon=lexicon)
+    return lambda rows: np.asarray(baseline.predict(rows["response_texts"]), dtype=np.float32)
+
+
+def _fit_logistic(task: FoldTask, train: Dict[str, object]) -> Callable[[Dict[str, object]], np.ndarray]:
+    from src.sentiment.baselines import train_logistic_baseline
+
+    pipeline = train_logistic_baseline(train["response_texts"], train["labels"])
+    return lambda rows: pipeline.predict_proba(rows["response_texts"])[:, 1]
+
+
+def _fit_bert(task: FoldTask, train: Dict[str, object]) -> Callable[[Dict[str, object]], np.ndarray]:
+    # Zero-shot: the checkpoint is used as shipped, so only inference is timed.
+    import torch
+
+    from src.models.bert_baseline import BertSentimentBaseline
+
+    torch.manual_seed(load_yaml(task.training_cfg_path).get("random_state", 42))
+    baseline = BertSentimentBaseline()
+    return lambda rows: np.asarray(baseline.predict(rows["response_texts"]), dtype=np.float32)
+
+
+def _fit_dual_stream(task: FoldTask, train: Dict[str, object]) -> Callable[[Dict[str, object]], np.ndarray]:
+    import tensorflow as tf
+
+    from src.models.dual_attention_model import DualStreamConfig, build_model
+
+    model_cfg = DualStreamConfig(**load_yaml(task.model_cfg_path))
+    training_cfg = load_yaml(task.training_cfg_path)
+    tf.random.set_seed(training_cfg.get("random_state", 42))
+    model = build_model(model_cfg, compile=False)
+    model.compile(
+        optimizer=tf.keras.optimizers.Adam(learning_rate=training_cfg["learning_rate"]),
+        loss="binary_crossentropy",
+        metrics=["accuracy"],
+    )
+    model.fit(
+        [train["context_tokens"], train["response_tokens"]],
+        train["labels"],
+        epochs=task.epochs or training_cfg["epochs"],
+        batch_size=training_cfg["batch_size"],
+        verbose=0,
+    )
+
+    def predict(rows: Dict[str, object]) -> np.ndarray:
+        inputs = [rows["context_tokens"], rows["response_tokens"]]
+        # predict_on_batch skips Keras' per-call dataset setup, which dominates single-item latency.
+        if len(rows["labels"]) <= 256:
+            return np.asarray(model.predict_on_batch(inputs)).reshape(-1)
+        return np.asarray(model.predict(inputs, batch_size=256, verbose=0)).reshape(-1)
+
+    return predict
+
+
+_FITTERS: Dict[str, Callable[[FoldTask, Dict[str, object]], Callable[[Dict[str, object]], np.ndarray]]] = {
+    "lexicon": _fit_lexicon,
+    "logistic": _fit_logistic,
+    "bert": _fit_bert,
+    "dual_stream": _fit_dual_stream,
+}
+
+
+def _rows(data: Dict[str, object], index: np.ndarray) -> Dict[str, object]:
+    texts = data["response_texts"]
+    return {
+        "response_texts": [texts[i] for i in index],
+        **{name: np.asarray(data[name][index]) for name in _ARRAYS},
+    }
+
+
+def run_fold(task: FoldTask) -> Dict[str, object]:
+    """Fit one model on every fold but ``task.fold``, then score and time it on that fold.
+
+    Meant to run alone in a fresh worker process so ``peak_rss_mb`` is this model's alone.
+    """
+    from src.training.evaluate_model import evaluate_predictions
+
+    # Each fitter seeds its own framework, so the lexicon and logistic rows never load TF or torch.
+    seed_everything(load_yaml(task.training_cfg_path).get("random_state", 42), frameworks=False)
+    data_dir = Path(task.data_dir)
+    data: Dict[str, object] = {name: np.load(data_dir / f"{name}.npy", mmap_mode="r") for name in _ARRAYS}
+    data["response_texts"] = json.loads((data_dir / "responses.json").read_text(encoding="utf-8"))
+    fold_of = np.load(data_dir / "fold.npy")
+    train, test = _rows(data, np.flatnonzero(fold_of != task.fold)), _rows(data, np.flatnonzero(fold_of == task.fold))
+
+    row: Dict[str, object] = {"model": task.model, "fold": task.fold, "n_train": len(train["labels"]), "n_test": len(test["labels"])}
+    try:
+        start = time.perf_counter()
+        predict = _FITTERS[task.model](task, train)
+        row["fit_seconds"] = time.perf_counter() - start
+    except ImportError as exc:
+        return {**row, "status": f"skipped: {exc}"}
+
+    start = time.perf_counter()
+    probs = predict(test)
+    batch_seconds = time.perf_counter() - start
+    single = []
+    for i in range(min(_LATENCY_SAMPLES, len(test["labels"]))):
+        one = _rows(test, np.array([i]))
+        start = time.perf_counter()
+        predict(one)
+        single.append(time.perf_counter() - start)
+
+    metrics = evaluate_predictions(test["labels"], probs)
+    metrics.pop("confusion_matrix")
+    return {
+        **row,
+        "status": "ok",
+        "accuracy": float(np.mean((np.asarray(probs) > 0.5) == test["labels"])),
+        **metrics,
+        "batch_item_ms": batch_seconds / len(test["labels"]) * 1000,
+        "throughput_per_s": len(test["labels"]) / batch_seconds,
+        "single_item_p50_ms": float(np.median(single) * 1000),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def summarize(folds: pd.DataFrame) -> pd.DataFrame:
+    """Mean and std across folds for every numeric column, one row per model."""
+    ok = folds[folds["status"] == "ok"].drop(columns=["fold", "status"])
+    if ok.empty:
+        return pd.DataFrame()
+    summary = ok.groupby("model").agg(["mean", "std"])
+    summary.columns = [f"{metric}_{stat}" for metric, stat in summary.columns]
+    return summary.reset_index()
+
+
+def run_benchmark(
+    data_path: str | Path = "data/processed/train.csv",
+    *,
+    models: Sequence[str] = BENCHMARK_MODELS,
+    folds: int = 5,
+    workers: Optional[int] = None,
+    threads_per_worker: int = 1,
+    output_dir: str | Path = "artifacts/benchmark",
+    model_cfg_path: str | Path = "configs/model_config.yaml",
+    training_cfg_path: str | Path = "configs/training_config.yaml",
+    epochs: Optional[int] = None,
+    lexicon_path: Optional[str | Path] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Run every (model, fold) pair in parallel and write the per-fold CSV plus a JSON summary.
+
+    Each pair runs in its own spawned process (``max_tasks_per_child=1``), so fit time,
+    latency and peak RSS are measured without other models' state in the same heap.
+    Every process is capped at ``threads_per_worker`` TF/torch/BLAS threads and ``workers``
+    defaults to ``cpu_count // threads_per_worker``, so parallel tasks do not oversubscribe
+    the cores and timings stay comparable between runs. Models whose optional dependency is
+    missing are recorded as ``skipped``.
+    """
+    unknown = set(models) - set(BENCHMARK_MODELS)
+    if unknown:
+        raise ValueError(f"Unknown models {sorted(unknown)}; expected a subset of {BENCHMARK_MODELS}")
+    output_dir = Path(output_dir)
+    data_dir = prepare_benchmark_data(
+        data_path, output_dir, model_cfg_path=model_cfg_path, training_cfg_path=training_cfg_path, folds=folds
+    )
+    tasks = [
+        FoldTask(
+            model,
+            fold,
+            str(data_dir),
+            str(model_cfg_path),
+            str(training_cfg_path),
+            epochs=epochs,
+            lexicon_path=str(lexicon_path) if lexicon_path else None,
+        )
+        for model in models
+        for fold in range(folds)
+    ]
+    workers = workers or max(1, (os.cpu_count() or 1) // threads_per_worker)
+    LOGGER.info("Benchmarking %d (model, fold) tasks on %d workers x %d threads", len(tasks), workers, threads_per_worker)
+    with worker_thread_limits(threads_per_worker), ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        max_tasks_per_child=1,
+    ) as pool:
+        rows = list(pool.map(run_fold, tasks))
+
+    fold_table = pd.DataFrame(rows)
+    fold_table.to_csv(output_dir / FOLDS_FILENAME, index=False)
+    summary = summarize(fold_table)
+    payload = {
+        "folds": folds,
+        "workers": workers,
+        "threads_per_worker": threads_per_worker,
+        "tasks": [asdict(task) for task in tasks],
+        "skipped": {row["model"]: row["status"] for row in rows if row["status"] != "ok"},
+        "summary": summary.to_dict(orient="records"),
+    }
+    with open(output_dir / SUMMARY_FILENAME, "w", encoding="utf-8") as fp:
+        json.dump(payload, fp, indent=2)
+    LOGGER.info("Benchmark complete. Tables saved to %s", output_dir)
+    return fold_table, summary
@@ -0,0 +1,133 @@
+"""Early stopping, best-weight checkpoints and preemption-safe resume for ``model.fit``."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+import tensorflow as tf
+
+from src.utils.logging_utils import configure_logging
+
+LOGGER = configure_logging(name=__name__)
+
+BEST_WEIGHTS_FILENAME = "best.weights.h5"
+STATE_FILENAME = "checkpoint_state.json"
+BACKUP_DIRNAME = "backup"
+MONITOR = "val_loss"
+
+
+class _StateRecorder(tf.keras.callbacks.Callback):
+    """Persists the best monitored value and the early-stopping counter after every epoch.
+
+    ``BackupAndRestore`` brings back weights, optimizer slots and the epoch counter; this
+    carries the rest, so a resumed run neither overwrites a better checkpoint nor forgets
+    how many epochs it has already waited.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        checkpoint: tf.keras.callbacks.ModelCheckpoint,
+        early_stopping: Optional[tf.keras.callbacks.EarlyStopping],
+        restored: Dict[str, float],
+        fingerprint: Optional[str] = None,
+    ):
+        super().__init__()
+        self.path = path
+        self.fingerprint = fingerprint
+        self.checkpoint = checkpoint
+        self.early_stopping = early_stopping
+        self.restored = restored
+
+    def on_train_begin(self, logs=None):
+        # Runs after EarlyStopping.on_train_begin has reset its counters.
+        if self.early_stopping is not None and self.restored:
+            self.early_stopping.best = self.restored["best"]
+            self.early_stopping.wait = int(self.restored.get("wait", 0))
+
+    def on_epoch_end(self, epoch, logs=None):
+        state = {"epoch": epoch + 1, "best": float(self.checkpoint.best), "fingerprint": self.fingerprint}
+        if self.early_stopping is not None:
+            state["wait"] = int(self.early_stopping.wait)
+        self.path.write_text(json.dumps(state), encoding="utf-8")
+
+
+@dataclass
+class TrainingCheckpoints:
+    """Callbacks to pass to every ``fit`` call plus where the best weights end up."""
+
+    callbacks: List[tf.keras.callbacks.Callback]
+    best_weights_path: Path
+    resumed_from_epoch: int = 0
+
+    def restore_best(self, model: tf.keras.Model) -> bool:
+        """Load the lowest-``val_loss`` weights seen (across resumes); False if none were saved."""
+        if not self.best_weights_path.exists():
+            return False
+        model.load_weights(self.best_weights_path)
+        return True
+
+
+def run_fingerprint(model_cfg: Mapping[str, Any], training_cfg: Mapping[str, Any], corpus_key: str) -> str:
+    """Identifies what a backup was trained on; ``epochs`` is left out so a run can be extended."""
+    payload = {
+        "model": dict(model_cfg),
+        "training": {key: value for key, value in training_cfg.items() if key != "epochs"},
+        "corpus": corpus_key,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def training_checkpoints(
+    training_cfg: Dict[str, object], artifacts_dir: str | Path, *, fingerprint: Optional[str] = None
+) -> TrainingCheckpoints:
+    """Build the callbacks from ``patience``, ``checkpoint_dir``, ``checkpoint_every`` and ``resume``.
+
+    With ``resume`` on and a backup left by an interrupted run with the same ``fingerprint``
+    (``run_fingerprint``), ``fit`` continues from the last saved epoch with its optimizer
+    state. Otherwise stale checkpoints are cleared so a new run never loads weights from an
+    unrelated one. The backup is deleted when ``fit`` completes.
+    """
+    checkpoint_dir = Path(training_cfg.get("checkpoint_dir") or Path(artifacts_dir) / "checkpoints")
+    backup_dir = checkpoint_dir / BACKUP_DIRNAME
+    state_path = checkpoint_dir / STATE_FILENAME
+    best_path = checkpoint_dir / BEST_WEIGHTS_FILENAME
+
+    restored: Dict[str, float] = {}
+    if training_cfg.get("resume", True) and backup_dir.exists() and state_path.exists():
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+        if fingerprint is not None and state.get("fingerprint") != fingerprint:
+            LOGGER.warning(
+                "Discarding the backup in %s: it was written for a different model config, training config or corpus",
+                backup_dir,
+            )
+        else:
+            restored = state
+            LOGGER.info("Resuming training from %s after epoch %d", backup_dir, restored["epoch"])
+    if not restored:
+        shutil.rmtree(backup_dir, ignore_errors=True)
+        state_path.unlink(missing_ok=True)
+        best_path.unlink(missing_ok=True)
+    checkpoint_dir.mkdir(parents=True, exist_ok=True)
+
+    checkpoint = tf.keras.callbacks.ModelCheckpoint(
+        best_path,
+        monitor=MONITOR,
+        save_best_only=True,
+        save_weights_only=True,
+        initial_value_threshold=restored.get("best"),
+    )
+    early_stopping = None
+    backup = tf.keras.callbacks.BackupAndRestore(backup_dir, save_freq=training_cfg.get("checkpoint_every", "epoch"))
+    callbacks: List[tf.keras.callbacks.Callback] = [backup]
+    patience = training_cfg.get("patience")
+    if patience is not None:
+        early_stopping = tf.keras.callbacks.EarlyStopping(monitor=MONITOR, patience=int(patience), verbose=1)
+        callbacks.append(early_stopping)
+    callbacks += [checkpoint, _StateRecorder(state_path, checkpoint, early_stopping, restored, fingerprint)]
+    return TrainingCheckpoints(callbacks, best_path, resumed_from_epoch=int(restored.get("epoch", 0)))
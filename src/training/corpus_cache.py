@@ -0,0 +1,110 @@
+"""Content-addressed, memory-mapped cache of the labeled + tokenized training corpus."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+import numpy as np
+import pandas as pd
+from tensorflow.keras.preprocessing.text import Tokenizer, tokenizer_from_json
+
+from src.utils.logging_utils import configure_logging
+
+LOGGER = configure_logging(name=__name__)
+
+CACHE_FORMAT_VERSION = 1
+_ARRAYS = ("context", "response", "labels", "text_length")
+
+
+@dataclass
+class TokenizedCorpus:
+    tokenizer: Tokenizer
+    context: np.ndarray
+    response: np.ndarray
+    labels: np.ndarray
+    text_length: np.ndarray
+
+    def analysis_frame(self) -> pd.DataFrame:
+        """The two columns the pilot analyses read, without the raw text."""
+        return pd.DataFrame({"sentiment": np.asarray(self.labels, dtype=np.int64), "text_length": self.text_length})
+
+
+def corpus_key(csv_path: str | Path, **params: Any) -> str:
+    """SHA-256 over the CSV bytes plus every parameter that changes the arrays."""
+    digest = hashlib.sha256()
+    with open(csv_path, "rb") as fp:
+        for block in iter(lambda: fp.read(1 << 20), b""):
+            digest.update(block)
+    digest.update(json.dumps({"format": CACHE_FORMAT_VERSION, **params}, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def save_corpus(corpus: TokenizedCorpus, directory: str | Path) -> None:
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for name in _ARRAYS:
+        np.save(directory / f"{name}.npy", np.ascontiguousarray(getattr(corpus, name)))
+    (directory / "tokenizer.json").write_text(corpus.tokenizer.to_json(), encoding="utf-8")
+
+
+def load_arrays(directory: str | Path) -> Dict[str, np.ndarray]:
+    """The corpus arrays under ``directory`` as read-only ``np.memmap`` views."""
+    directory = Path(directory)
+    return {name: np.load(directory / f"{name}.npy", mmap_mode="r") for name in _ARRAYS}
+
+
+def load_tokenizer(directory: str | Path) -> Tokenizer:
+    return tokenizer_from_json((Path(directory) / "tokenizer.json").read_text(encoding="utf-8"))
+
+
+def load_corpus(directory: str | Path) -> TokenizedCorpus:
+    """Arrays come back as read-only ``np.memmap`` views; nothing is copied into RAM."""
+    return TokenizedCorpus(tokenizer=load_tokenizer(directory), **load_arrays(directory))
+
+
+def cached_entry(
+    csv_path: str | Path,
+    cache_dir: str | Path,
+    build_into: Callable[[Path], None],
+    **params: Any,
+) -> Path:
+    """Directory of the cache entry for (CSV bytes, ``params``); on a miss ``build_into``
+    writes it (ending with ``tokenizer.json``) into a staging directory first."""
+    key = corpus_key(csv_path, **params)
+    entry = Path(cache_dir) / key
+    if (entry / "tokenizer.json").exists():
+        LOGGER.info("Corpus cache hit %s", key[:12])
+        return entry
+
+    LOGGER.info("Corpus cache miss %s; building", key[:12])
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    # Write into a sibling temp dir and rename so readers never see a half-written entry.
+    staging = Path(tempfile.mkdtemp(prefix=f".{key[:12]}-", dir=entry.parent))
+    try:
+        build_into(staging)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    try:
+        staging.rename(entry)
+    except OSError:
+        shutil.rmtree(staging, ignore_errors=True)
+        if not (entry / "tokenizer.json").exists():
+            raise
+    return entry
+
+
+def load_or_build_corpus(
+    csv_path: str | Path,
+    cache_dir: str | Path,
+    build: Callable[[], TokenizedCorpus],
+    **params: Any,
+) -> TokenizedCorpus:
+    """Return the cached corpus for (CSV bytes, ``params``), building and storing it on a miss."""
+    return load_corpus(cached_entry(csv_path, cache_dir, lambda staging: save_corpus(build(), staging), **params))
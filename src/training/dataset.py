@@ -2,16 +2,31 @@
 
 from __future__ import annotations
 
+import itertools
+import mmap
+import multiprocessing
+from array import array
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import Tuple
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, Tuple
 
 import numpy as np
 import pandas as pd
+import tensorflow as tf
 from sklearn.model_selection import train_test_split
 from tensorflow.keras.preprocessing.sequence import pad_sequences
 from tensorflow.keras.preprocessing.text import Tokenizer
-from textblob import TextBlob
+
+from src.sentiment.polarity_features import configure_engine, engine_settings, label_texts, sentiment_scores
+from src.training.corpus_cache import TokenizedCorpus, load_arrays, load_tokenizer
+from src.utils.threads import worker_thread_limits
+
+if TYPE_CHECKING:
+    from src.models.dual_attention_model import DualStreamConfig
 
 
 @dataclass
@@ -24,29 +39,95 @@ class DatasetSplit:
     y_test: np.ndarray
 
 
+@dataclass
+class EncodedChunk:
+    context: np.ndarray
+    response: np.ndarray
+    labels: np.ndarray
+    text_length: np.ndarray
+    split: np.ndarray
+
+
+SPLIT_TRAIN, SPLIT_VALIDATION, SPLIT_TEST = 0, 1, 2
+SPLIT_NAMES = {SPLIT_TRAIN: "train", SPLIT_VALIDATION: "validation", SPLIT_TEST: "test"}
+REQUIRED_COLUMNS = {"Context", "Response"}
+
+
+def _validate_columns(df: pd.DataFrame) -> pd.DataFrame:
+    if not REQUIRED_COLUMNS.issubset(df.columns):
+        raise ValueError(f"Dataset missing columns: {REQUIRED_COLUMNS - set(df.columns)}")
+    df["Context"] = df["Context"].astype(str)
+    df["Response"] = df["Response"].astype(str)
+    return df
+
+
 def load_dataset(csv_path: str | Path) -> pd.DataFrame:
     path = Path(csv_path)
     if not path.exists():
         raise FileNotFoundError(f"Dataset not found: {path}")
-    df = pd.read_csv(path)
-    required = {"Context", "Response"}
-    if not required.issubset(df.columns):
-        raise ValueError(f"Dataset missing columns: {required - set(df.columns)}")
-    df["Context"] = df["Context"].astype(str)
-    df["Response"] = df["Response"].astype(str)
-    return df
+    return _validate_columns(pd.read_csv(path))
 
 
-def add_rule_sentiment(df: pd.DataFrame) -> pd.DataFrame:
+def iter_dataset_chunks(csv_path: str | Path, *, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Stream the CSV as validated ``chunk_size``-row frames instead of one ``read_csv``."""
+    path = Path(csv_path)
+    if not path.exists():
+        raise FileNotFoundError(f"Dataset not found: {path}")
+    with pd.read_csv(path, chunksize=chunk_size) as reader:
+        for chunk in reader:
+            yield _validate_columns(chunk)
+
+
+@contextmanager
+def labeling_pool(workers: int) -> Iterator[Optional[ProcessPoolExecutor]]:
+    """A process pool for rule labeling (``None`` when ``workers <= 1``), to reuse across chunks."""
+    if workers <= 1:
+        yield None
+        return
+    # One thread per runtime, so N labeling workers do not each start a pool per core.
+    with worker_thread_limits(1), ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=partial(configure_engine, **engine_settings()),
+    ) as pool:
+        yield pool
+
+
+def add_rule_sentiment(
+    df: pd.DataFrame,
+    *,
+    workers: int = 1,
+    chunk_size: int = 50_000,
+    pool: Optional[ProcessPoolExecutor] = None,
+) -> pd.DataFrame:
+    """Add rule-based ``sentiment`` labels and ``text_length``.
+
+    With ``workers > 1`` (or an open ``labeling_pool``) the responses are sharded into
+    ``chunk_size`` row blocks and labeled in a process pool (sentiment engine loaded once
+    per worker); shards are reassembled in row order, so the output is identical to the
+    serial path.
+    """
     df = df.copy()
-    df["sentiment"] = df["Response"].apply(_blob_label)
+    if pool is not None and len(df) > chunk_size:
+        df["sentiment"] = _parallel_rule_labels(df["Response"], pool=pool, chunk_size=chunk_size)
+    elif workers > 1 and len(df) > chunk_size:
+        with labeling_pool(workers) as pool:
+            df["sentiment"] = _parallel_rule_labels(df["Response"], pool=pool, chunk_size=chunk_size)
+    else:
+        df["sentiment"] = df["Response"].apply(_blob_label)
     df["text_length"] = df["Context"].str.len()
     return df
 
 
+def _parallel_rule_labels(responses: pd.Series, *, pool: ProcessPoolExecutor, chunk_size: int) -> pd.Series:
+    shards = (responses.iloc[start : start + chunk_size].tolist() for start in range(0, len(responses), chunk_size))
+    labels = np.concatenate(list(pool.map(label_texts, shards)))
+    return pd.Series(labels.astype(np.int64), index=responses.index, name=responses.name)
+
+
 def _blob_label(text: str) -> int:
-    blob = TextBlob(text or "")
-    return int(blob.sentiment.polarity > 0)
+    polarity, _ = sentiment_scores(text)
+    return int(polarity > 0)
 
 
 def tokenize_streams(
@@ -55,7 +136,17 @@ def tokenize_streams(
     *,
     vocab_size: int,
     seq_length: int,
+    mode: str = "keras",
 ) -> Tuple[Tokenizer, np.ndarray, np.ndarray]:
+    """Fit a vocabulary over both streams and return pre-padded index arrays.
+
+    ``mode="compact"`` produces the same indices via ``tokenize_streams_compact``
+    (single pass, uint16 output) instead of Keras' fit/texts_to_sequences/pad_sequences.
+    """
+    if mode == "compact":
+        return tokenize_streams_compact(contexts, responses, vocab_size=vocab_size, seq_length=seq_length)
+    if mode != "keras":
+        raise ValueError(f"Unknown tokenization mode '{mode}'; expected 'keras' or 'compact'")
     tokenizer = Tokenizer(num_words=vocab_size)
     tokenizer.fit_on_texts(contexts + " " + responses)
     ctx_seq = tokenizer.texts_to_sequences(contexts)
@@ -65,6 +156,308 @@ def tokenize_streams(
     return tokenizer, ctx_seq, rsp_seq
 
 
+def tokenize_streams_compact(
+    contexts: pd.Series,
+    responses: pd.Series,
+    *,
+    vocab_size: int,
+    seq_length: int,
+) -> Tuple[Tokenizer, np.ndarray, np.ndarray]:
+    """Fit and encode in one pass over the text, writing into preallocated uint16 arrays.
+
+    Words get provisional ids in first-appearance order (context before response, row by
+    row, exactly the order Keras counts ``contexts + " " + responses``). One flat id
+    buffer is then remapped to frequency rank with a stable sort, which reproduces Keras'
+    tie-breaking, so the output is bit-identical to the ``keras`` mode apart from dtype.
+    """
+    dtype = np.uint16 if vocab_size <= np.iinfo(np.uint16).max + 1 else np.uint32
+    filters = str.maketrans({c: " " for c in Tokenizer().filters})
+    vocab: Dict[str, int] = {}
+    flat_ids = array("I")
+    segment_lengths = array("I")
+    for context, response in zip(contexts, responses):
+        for text in (context, response):
+            words = [w for w in text.lower().translate(filters).split(" ") if w]
+            flat_ids.extend([vocab.setdefault(w, len(vocab)) for w in words])
+            segment_lengths.append(len(words))
+
+    n_rows = len(segment_lengths) // 2
+    ids = np.frombuffer(flat_ids, dtype=np.uint32)
+    segments = np.repeat(np.arange(2 * n_rows, dtype=np.int64), np.frombuffer(segment_lengths, dtype=np.uint32))
+    counts = np.bincount(ids, minlength=len(vocab))
+    order = np.argsort(-counts, kind="stable")
+    rank = np.empty(len(vocab), dtype=np.uint32)
+    rank[order] = np.arange(1, len(vocab) + 1, dtype=np.uint32)
+
+    tokenizer = Tokenizer(num_words=vocab_size)
+    words_by_id = list(vocab)
+    tokenizer.document_count = n_rows
+    tokenizer.word_counts = OrderedDict(zip(words_by_id, counts.tolist()))
+    doc_pairs = np.unique((segments // 2) * len(vocab) + ids)
+    doc_freq = np.bincount(doc_pairs % max(len(vocab), 1), minlength=len(vocab))
+    tokenizer.word_docs = defaultdict(int, zip(words_by_id, doc_freq.tolist()))
+    tokenizer.word_index = {words_by_id[i]: r for i, r in zip(order.tolist(), range(1, len(vocab) + 1))}
+    tokenizer.index_word = {r: w for w, r in tokenizer.word_index.items()}
+    tokenizer.index_docs = {int(rank[i]): int(doc_freq[i]) for i in range(len(vocab))}
+
+    # texts_to_sequences drops indices >= num_words; pad_sequences keeps the last
+    # seq_length survivors of each segment, right-aligned ("pre" padding/truncation).
+    encoded = rank[ids]
+    keep = encoded < vocab_size
+    encoded, segments = encoded[keep], segments[keep]
+    del ids, keep
+    ends = np.cumsum(np.bincount(segments, minlength=2 * n_rows))
+    from_end = ends[segments] - 1 - np.arange(len(segments))
+    keep = from_end < seq_length
+    encoded, segments, columns = encoded[keep], segments[keep], seq_length - 1 - from_end[keep]
+
+    context_seq = np.zeros((n_rows, seq_length), dtype=dtype)
+    response_seq = np.zeros((n_rows, seq_length), dtype=dtype)
+    is_context = segments % 2 == 0
+    context_seq[segments[is_context] // 2, columns[is_context]] = encoded[is_context]
+    response_seq[segments[~is_context] // 2, columns[~is_context]] = encoded[~is_context]
+    return tokenizer, context_seq, response_seq
+
+
+def fit_tokenizer_streaming(csv_path: str | Path, *, vocab_size: int, chunk_size: int) -> Tokenizer:
+    """Fit the vocabulary chunk by chunk; ``fit_on_texts`` accumulates counts, so the
+    resulting index is identical to fitting on the whole file at once."""
+    tokenizer = Tokenizer(num_words=vocab_size)
+    for chunk in iter_dataset_chunks(csv_path, chunk_size=chunk_size):
+        tokenizer.fit_on_texts(chunk["Context"] + " " + chunk["Response"])
+    return tokenizer
+
+
+def tokenize_corpus(data_path: str | Path, model_cfg: DualStreamConfig, training_cfg: Dict[str, object]) -> TokenizedCorpus:
+    """Load, rule-label and tokenize the whole CSV; the builder ``load_or_build_corpus`` caches."""
+    data = load_dataset(data_path)
+    data = add_rule_sentiment(
+        data,
+        workers=training_cfg.get("labeling_workers", 1),
+        chunk_size=training_cfg.get("labeling_chunk_size", 50_000),
+    )
+    tokenizer, context_seq, response_seq = tokenize_streams(
+        data["Context"],
+        data["Response"],
+        vocab_size=model_cfg.vocab_size,
+        seq_length=model_cfg.seq_length,
+        mode=training_cfg.get("tokenization", "keras"),
+    )
+    return TokenizedCorpus(
+        tokenizer=tokenizer,
+        context=context_seq,
+        response=response_seq,
+        labels=data["sentiment"].to_numpy(dtype=np.int8),
+        text_length=data["text_length"].to_numpy(),
+    )
+
+
+def assign_splits(
+    n_rows: int,
+    chunk_index: int,
+    *,
+    test_size: float,
+    validation_split: float,
+    random_state: int,
+) -> np.ndarray:
+    """Deterministic per-row train/validation/test assignment for streamed chunks.
+
+    Streaming cannot stratify over the whole file, so rows are split at random with a
+    generator seeded by ``(random_state, chunk_index)``; reruns give the same split.
+    """
+    draws = np.random.default_rng([random_state, chunk_index]).random(n_rows)
+    split = np.full(n_rows, SPLIT_TRAIN, dtype=np.int8)
+    split[draws < test_size + (1 - test_size) * validation_split] = SPLIT_VALIDATION
+    split[draws < test_size] = SPLIT_TEST
+    return split
+
+
+def iter_encoded_chunks(
+    csv_path: str | Path,
+    tokenizer: Tokenizer,
+    *,
+    seq_length: int,
+    chunk_size: int,
+    test_size: float,
+    validation_split: float,
+    random_state: int,
+    labeling_workers: int = 1,
+) -> Iterator[EncodedChunk]:
+    """Validate, label and tokenize the CSV one chunk at a time (one labeling pool for the pass)."""
+    with labeling_pool(labeling_workers) as pool:
+        for index, chunk in enumerate(iter_dataset_chunks(csv_path, chunk_size=chunk_size)):
+            chunk = add_rule_sentiment(chunk, chunk_size=max(len(chunk) // max(labeling_workers, 1), 1), pool=pool)
+            yield EncodedChunk(
+                context=pad_sequences(tokenizer.texts_to_sequences(chunk["Context"]), maxlen=seq_length),
+                response=pad_sequences(tokenizer.texts_to_sequences(chunk["Response"]), maxlen=seq_length),
+                labels=chunk["sentiment"].to_numpy(dtype=np.float32),
+                text_length=chunk["text_length"].to_numpy(),
+                split=assign_splits(
+                    len(chunk),
+                    index,
+                    test_size=test_size,
+                    validation_split=validation_split,
+                    random_state=random_state,
+                ),
+            )
+
+
+def spill_streaming_corpus(
+    csv_path: str | Path,
+    directory: str | Path,
+    *,
+    vocab_size: int,
+    seq_length: int,
+    chunk_size: int,
+    test_size: float,
+    validation_split: float,
+    random_state: int,
+    labeling_workers: int = 1,
+) -> None:
+    """Label and tokenize the CSV once, chunk by chunk, into one on-disk corpus per split.
+
+    The first pass fits the vocabulary and counts each split's rows, so every ``.npy``
+    header can be written up front; the second appends each encoded chunk to the files
+    under ``directory/<split>/`` (the corpus-cache layout, ``tokenizer.json`` at the top).
+    Plain writes rather than memmaps keep RSS bounded by ``chunk_size``.
+    """
+    directory = Path(directory)
+    split_kwargs = dict(test_size=test_size, validation_split=validation_split, random_state=random_state)
+    tokenizer = Tokenizer(num_words=vocab_size)
+    rows = np.zeros(len(SPLIT_NAMES), dtype=np.int64)
+    for index, chunk in enumerate(iter_dataset_chunks(csv_path, chunk_size=chunk_size)):
+        tokenizer.fit_on_texts(chunk["Context"] + " " + chunk["Response"])
+        rows += np.bincount(assign_splits(len(chunk), index, **split_kwargs), minlength=len(SPLIT_NAMES))
+
+    fields = {"context": np.int32, "response": np.int32, "labels": np.int8, "text_length": np.int64}
+    files = {}
+    with ExitStack() as stack:
+        for split_id, name in SPLIT_NAMES.items():
+            (directory / name).mkdir(parents=True, exist_ok=True)
+            n = int(rows[split_id])
+            for field, dtype in fields.items():
+                fp = stack.enter_context(open(directory / name / f"{field}.npy", "wb"))
+                shape = (n, seq_length) if field in ("context", "response") else (n,)
+                header = {"descr": np.lib.format.dtype_to_descr(np.dtype(dtype)), "fortran_order": False, "shape": shape}
+                np.lib.format.write_array_header_1_0(fp, header)
+                files[split_id, field] = fp
+        chunks = iter_encoded_chunks(
+            csv_path, tokenizer, seq_length=seq_length, chunk_size=chunk_size, labeling_workers=labeling_workers, **split_kwargs
+        )
+        for chunk in chunks:
+            for split_id in SPLIT_NAMES:
+                mask = chunk.split == split_id
+                for field, dtype in fields.items():
+                    files[split_id, field].write(np.ascontiguousarray(getattr(chunk, field)[mask], dtype=dtype).tobytes())
+    (directory / "tokenizer.json").write_text(tokenizer.to_json(), encoding="utf-8")
+
+
+def read_rows(array: np.ndarray, start: int, stop: int) -> np.ndarray:
+    """Rows ``[start, stop)`` of ``array`` as an in-memory copy.
+
+    For an ``np.memmap`` that owns its mapping this is a plain file read, so the pages never
+    stay mapped in this process and a full pass over a spilled corpus keeps RSS at one block.
+    A view of a memmap keeps its parent's ``offset``, so it is sliced like any other array.
+    """
+    if not (isinstance(array, np.memmap) and isinstance(array.base, mmap.mmap)):
+        return np.asarray(array[start:stop])
+    stop = min(stop, len(array))
+    row_shape = array.shape[1:]
+    row_bytes = array.dtype.itemsize * int(np.prod(row_shape, dtype=np.int64))
+    count = max(stop - start, 0) * row_bytes // array.dtype.itemsize
+    values = np.fromfile(array.filename, dtype=array.dtype, count=count, offset=array.offset + start * row_bytes)
+    return values.reshape((-1, *row_shape))
+
+
+def load_streaming_corpus(directory: str | Path) -> Dict[int, TokenizedCorpus]:
+    """The per-split corpora written by ``spill_streaming_corpus``, memory-mapped."""
+    directory = Path(directory)
+    tokenizer = load_tokenizer(directory)
+    return {
+        split_id: TokenizedCorpus(tokenizer=tokenizer, **load_arrays(directory / name))
+        for split_id, name in SPLIT_NAMES.items()
+    }
+
+
+def iter_blocks(corpus: TokenizedCorpus, block_size: int) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """``(context, response, labels)`` of ``corpus``, ``block_size`` rows at a time via ``read_rows``."""
+    for start in range(0, len(corpus.labels), block_size):
+        stop = start + block_size
+        yield read_rows(corpus.context, start, stop), read_rows(corpus.response, start, stop), read_rows(corpus.labels, start, stop)
+
+
+def make_streaming_datasets(
+    splits: Dict[int, TokenizedCorpus],
+    *,
+    batch_size: int,
+    block_size: int,
+    shuffle_buffer: int,
+    seed: int,
+) -> Dict[int, tf.data.Dataset]:
+    """``tf.data`` pipelines over the spilled split corpora (see ``make_block_dataset``).
+
+    Only the training split is shuffled.
+    """
+    return {
+        split_id: make_block_dataset(
+            corpus.context,
+            corpus.response,
+            corpus.labels,
+            batch_size=batch_size,
+            block_size=block_size,
+            shuffle_buffer=shuffle_buffer if split_id == SPLIT_TRAIN else None,
+            seed=seed,
+        )
+        for split_id, corpus in splits.items()
+    }
+
+
+def make_block_dataset(
+    context: np.ndarray,
+    response: np.ndarray,
+    labels: np.ndarray,
+    *,
+    batch_size: int,
+    block_size: int,
+    shuffle_buffer: Optional[int] = None,
+    seed: int = 0,
+) -> tf.data.Dataset:
+    """``tf.data`` pipeline over (memory-mapped) arrays, read ``block_size`` rows at a time
+    (``read_rows``) so RSS stays bounded by the block rather than the file size.
+
+    With ``shuffle_buffer`` the blocks are visited in a fresh order each epoch and rows are
+    shuffled through the buffer, as ``fit`` shuffles in-memory arrays.
+    """
+    seq_length = context.shape[1]
+    signature = (
+        (
+            tf.TensorSpec(shape=(None, seq_length), dtype=tf.int32),
+            tf.TensorSpec(shape=(None, seq_length), dtype=tf.int32),
+        ),
+        tf.TensorSpec(shape=(None,), dtype=tf.float32),
+    )
+    epochs = itertools.count()
+
+    def generator():
+        starts = np.arange(0, len(labels), block_size)
+        if shuffle_buffer:
+            starts = np.random.default_rng([seed, next(epochs)]).permutation(starts)
+        for start in starts.tolist():
+            stop = start + block_size
+            yield (
+                (
+                    read_rows(context, start, stop).astype(np.int32, copy=False),
+                    read_rows(response, start, stop).astype(np.int32, copy=False),
+                ),
+                read_rows(labels, start, stop).astype(np.float32),
+            )
+
+    dataset = tf.data.Dataset.from_generator(generator, output_signature=signature).unbatch()
+    if shuffle_buffer:
+        dataset = dataset.shuffle(shuffle_buffer, seed=seed, reshuffle_each_iteration=True)
+    return dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+
+
 def stratified_train_test_split(
     context_seq: np.ndarray,
     response_seq: np.ndarray,
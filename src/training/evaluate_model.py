@@ -16,8 +16,8 @@ def evaluate_predictions(
     threshold: float = 0.5,
     report_dir: Path | None = None,
 ) -> Dict[str, float]:
-    y_true = y_true.flatten()
-    probs = y_pred_probs.flatten()
+    y_true = np.asarray(y_true).flatten()
+    probs = np.asarray(y_pred_probs).flatten()
     y_pred = (probs > threshold).astype(int)
     metrics = {
         "precision": float(precision_score(y_true, y_pred)),
@@ -0,0 +1,55 @@
+"""tf.data input pipelines built from an in-memory DatasetSplit."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+import tensorflow as tf
+
+from src.training.dataset import DatasetSplit
+
+
+def _cache(dataset: tf.data.Dataset, cache_dir: Optional[str | Path], name: str) -> tf.data.Dataset:
+    if cache_dir is None:
+        return dataset.cache()
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    # tf.data reuses an existing cache file blindly, so start every run from a clean one.
+    for stale in cache_dir.glob(f"{name}*"):
+        stale.unlink()
+    return dataset.cache(str(cache_dir / name))
+
+
+def make_input_datasets(
+    split: DatasetSplit,
+    *,
+    batch_size: int,
+    validation_split: float,
+    shuffle_buffer: int = 10_000,
+    cache_dir: Optional[str | Path] = None,
+    seed: Optional[int] = None,
+) -> Tuple[tf.data.Dataset, tf.data.Dataset]:
+    """Train/validation pipelines: cache -> shuffle (train only) -> batch -> prefetch.
+
+    The validation set is the last ``validation_split`` fraction of the training arrays,
+    the same rows Keras' ``validation_split`` would hold out, but sliced once instead of
+    every epoch. ``cache_dir`` caches to disk; ``None`` caches in memory.
+    """
+    labels = np.asarray(split.y_train, dtype=np.float32)
+    n_val = int(len(labels) * validation_split)
+    n_train = len(labels) - n_val
+
+    def _slices(rows: slice) -> tf.data.Dataset:
+        return tf.data.Dataset.from_tensor_slices(
+            ((split.X_train_context[rows], split.X_train_response[rows]), labels[rows])
+        )
+
+    train = _cache(_slices(slice(0, n_train)), cache_dir, "train")
+    train = train.shuffle(shuffle_buffer, seed=seed, reshuffle_each_iteration=True)
+    train = train.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+
+    validation = _cache(_slices(slice(n_train, None)), cache_dir, "validation")
+    validation = validation.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+    return train, validation
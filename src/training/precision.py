@@ -0,0 +1,72 @@
+"""Keras mixed-precision policy selection based on what the local hardware supports."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Set
+
+import tensorflow as tf
+
+from src.utils.logging_utils import configure_logging
+
+LOGGER = configure_logging(name=__name__)
+
+POLICIES = ("float32", "mixed_bfloat16", "mixed_float16", "auto")
+
+# CPU flags with native (not emulated) low-precision matmuls; without them XLA/oneDNN
+# fall back to converting every op and mixed precision is slower than float32.
+_CPU_FLAGS = {
+    "mixed_bfloat16": {"avx512_bf16", "amx_bf16"},
+    "mixed_float16": {"avx512_fp16", "amx_fp16"},
+}
+
+
+def _cpu_flags() -> Set[str]:
+    cpuinfo = Path("/proc/cpuinfo")
+    if not cpuinfo.exists():
+        return set()
+    for line in cpuinfo.read_text().splitlines():
+        if line.startswith("flags"):
+            return set(line.split(":", 1)[1].split())
+    return set()
+
+
+def supported_policies() -> Set[str]:
+    supported = {"float32"}
+    if tf.config.list_physical_devices("GPU"):
+        supported |= {"mixed_float16", "mixed_bfloat16"}
+    flags = _cpu_flags()
+    supported |= {policy for policy, needed in _CPU_FLAGS.items() if flags & needed}
+    return supported
+
+
+def resolve_policy(requested: str = "float32") -> str:
+    """Map a configured policy to one this machine runs natively, falling back to float32.
+
+    ``auto`` picks ``mixed_float16``/``mixed_bfloat16`` on GPU and float32 on CPU, where the
+    LSTM-bound step measured no faster in bfloat16 even with native bf16 instructions
+    (``scripts/bench_precision.py``); request ``mixed_bfloat16`` explicitly to override.
+    """
+    if requested not in POLICIES:
+        raise ValueError(f"Unknown precision policy '{requested}'; expected one of {POLICIES}")
+    supported = supported_policies()
+    if requested == "auto":
+        if not tf.config.list_physical_devices("GPU"):
+            return "float32"
+        return next((policy for policy in ("mixed_float16", "mixed_bfloat16") if policy in supported), "float32")
+    if requested not in supported:
+        LOGGER.warning("Precision policy %s is not supported natively here; training in float32", requested)
+        return "float32"
+    return requested
+
+
+@contextmanager
+def precision_policy(name: str) -> Iterator[str]:
+    """Layers built inside the block take ``name``; the previous global policy is restored after."""
+    previous = tf.keras.mixed_precision.global_policy()
+    tf.keras.mixed_precision.set_global_policy(name)
+    try:
+        yield name
+    finally:
+        tf.keras.mixed_precision.set_global_policy(previous)
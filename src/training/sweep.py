@@ -0,0 +1,338 @@
+"""Parallel grid / random hyperparameter sweep over ``DualStreamConfig`` and training params."""
+
+from __future__ import annotations
+
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, fields, replace
+from functools import partial
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+from sklearn.metrics import roc_auc_score
+
+from src.models.dual_attention_model import DualStreamConfig, build_model
+from src.sentiment.polarity_features import engine_settings
+from src.training.corpus_cache import load_or_build_corpus
+from src.training.dataset import make_block_dataset, read_rows, stratified_train_test_split, tokenize_corpus
+from src.training.precision import precision_policy, resolve_policy
+from src.utils import configure_logging, load_yaml, peak_rss_mb, seed_everything, worker_thread_limits
+
+LOGGER = configure_logging(name=__name__)
+
+LEADERBOARD_FILENAME = "leaderboard.csv"
+STRATEGIES = ("grid", "random")
+# Changing these changes the token arrays, which are built once for the whole sweep.
+_TOKENIZATION_FIELDS = {"vocab_size", "seq_length"}
+_TRAINING_PARAMS = {"learning_rate", "batch_size", "epochs"}
+_SPLIT_ARRAYS = ("train_context", "train_response", "train_labels", "val_context", "val_response", "val_labels")
+_BLOCK_SIZE = 8192  # rows per read when streaming_chunk_size is not set
+
+
+@dataclass
+class SweepTrial:
+    trial_id: int
+    model_params: Dict[str, object]
+    training_params: Dict[str, object]
+
+
+def _sample(spec: object, rng: np.random.Generator) -> object:
+    if isinstance(spec, list):
+        return spec[int(rng.integers(len(spec)))]
+    if isinstance(spec, dict):
+        low, high = spec["low"], spec["high"]
+        if spec.get("log"):
+            return float(np.exp(rng.uniform(np.log(low), np.log(high))))
+        if isinstance(low, int) and isinstance(high, int):
+            return int(rng.integers(low, high + 1))
+        return float(rng.uniform(low, high))
+    return spec
+
+
+def expand_space(
+    space: Mapping[str, Mapping[str, object]],
+    *,
+    strategy: str = "grid",
+    n_trials: int = 20,
+    seed: int = 42,
+) -> List[SweepTrial]:
+    """Trials for ``space = {"model": {field: values}, "training": {param: values}}``.
+
+    ``grid`` takes the Cartesian product of the value lists. ``random`` draws ``n_trials``
+    points; a list is sampled uniformly, ``{low, high, log}`` as a (log-)uniform range.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown sweep strategy '{strategy}'; expected one of {STRATEGIES}")
+    model_space = dict(space.get("model") or {})
+    training_space = dict(space.get("training") or {})
+    unknown = set(model_space) - {f.name for f in fields(DualStreamConfig)}
+    if unknown:
+        raise ValueError(f"Not DualStreamConfig fields: {sorted(unknown)}")
+    if set(model_space) & _TOKENIZATION_FIELDS:
+        raise ValueError(f"{sorted(_TOKENIZATION_FIELDS)} are fixed per sweep (the corpus is tokenized once)")
+    unknown = set(training_space) - _TRAINING_PARAMS
+    if unknown:
+        raise ValueError(f"Unsupported training params {sorted(unknown)}; expected a subset of {sorted(_TRAINING_PARAMS)}")
+
+    keys = [("model", name) for name in model_space] + [("training", name) for name in training_space]
+    specs = [model_space[name] if group == "model" else training_space[name] for group, name in keys]
+    if strategy == "grid":
+        if any(not isinstance(spec, list) for spec in specs):
+            raise ValueError("grid search needs a list of values for every parameter")
+        points = list(itertools.product(*specs))
+    else:
+        rng = np.random.default_rng(seed)
+        points = [tuple(_sample(spec, rng) for spec in specs) for _ in range(n_trials)]
+
+    trials = []
+    for trial_id, point in enumerate(points):
+        params: Dict[str, Dict[str, object]] = {"model": {}, "training": {}}
+        for (group, name), value in zip(keys, point):
+            params[group][name] = value
+        trials.append(SweepTrial(trial_id, params["model"], params["training"]))
+    return trials
+
+
+def prepare_sweep_data(
+    data_path: str | Path,
+    model_cfg: DualStreamConfig,
+    training_cfg: Dict[str, object],
+    output_dir: str | Path,
+) -> Path:
+    """Tokenize once (through the corpus cache) and write the train/validation split as ``.npy``.
+
+    Workers memory-map these files and feed them to ``fit`` through ``make_block_dataset``,
+    so a trial only holds ``block_size`` rows of them at a time.
+    """
+    data_dir = Path(output_dir) / "data"
+    corpus = load_or_build_corpus(
+        data_path,
+        training_cfg.get("corpus_cache_dir") or Path(output_dir) / "corpus_cache",
+        partial(tokenize_corpus, data_path, model_cfg, training_cfg),
+        vocab_size=model_cfg.vocab_size,
+        seq_length=model_cfg.seq_length,
+        tokenization=training_cfg.get("tokenization", "keras"),
+        sentiment_engine=engine_settings()["engine"],
+        lexicon_path=engine_settings()["lexicon_path"],
+    )
+    # The test split is held out of the sweep entirely; trials are ranked on validation.
+    split = stratified_train_test_split(
+        corpus.context,
+        corpus.response,
+        corpus.labels,
+        test_size=training_cfg["test_size"],
+        random_state=training_cfg["random_state"],
+    )
+    n_val = int(len(split.y_train) * training_cfg["validation_split"])
+    n_train = len(split.y_train) - n_val
+    arrays = {
+        "train_context": split.X_train_context[:n_train],
+        "train_response": split.X_train_response[:n_train],
+        "train_labels": split.y_train[:n_train],
+        "val_context": split.X_train_context[n_train:],
+        "val_response": split.X_train_response[n_train:],
+        "val_labels": split.y_train[n_train:],
+    }
+    data_dir.mkdir(parents=True, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(data_dir / f"{name}.npy", np.ascontiguousarray(array))
+    return data_dir
+
+
+class _MedianPruner(tf.keras.callbacks.Callback):
+    """Stops a trial whose ``val_loss`` is worse than the median of the other trials at the same epoch.
+
+    ``history`` is a ``multiprocessing.Manager`` dict (trial id -> per-epoch val_loss) shared
+    by all workers.
+    """
+
+    def __init__(self, history, trial_id: int, *, warmup_epochs: int, min_trials: int):
+        super().__init__()
+        self.history = history
+        self.trial_id = trial_id
+        self.warmup_epochs = warmup_epochs
+        self.min_trials = min_trials
+        self.pruned = False
+
+    def on_epoch_end(self, epoch, logs=None):
+        value = float((logs or {})["val_loss"])
+        self.history[self.trial_id] = list(self.history.get(self.trial_id, [])) + [value]
+        if epoch + 1 < self.warmup_epochs:
+            return
+        others = [losses[epoch] for tid, losses in self.history.items() if tid != self.trial_id and len(losses) > epoch]
+        if len(others) >= self.min_trials and value > float(np.median(others)):
+            self.pruned = True
+            self.model.stop_training = True
+
+
+def _limit_threads(threads: int) -> None:
+    # The OpenMP/BLAS caps come from ``worker_thread_limits``; only TF's own pools can be sized here.
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(threads)
+
+
+def run_trial(
+    trial: SweepTrial,
+    *,
+    base_model: Dict[str, object],
+    base_training: Dict[str, object],
+    data_dir: str,
+    history=None,
+    prune: Optional[Dict[str, int]] = None,
+) -> Dict[str, object]:
+    """Train one configuration on the shared split; returns a leaderboard row."""
+    data = {name: np.load(Path(data_dir) / f"{name}.npy", mmap_mode="r") for name in _SPLIT_ARRAYS}
+    config = replace(DualStreamConfig(**base_model), **trial.model_params)
+    training = {**base_training, **trial.training_params}
+
+    seed_everything(training.get("random_state", 42))
+    with precision_policy(resolve_policy(training.get("precision_policy", "float32"))):
+        model = build_model(config, compile=False)
+    model.compile(
+        optimizer=tf.keras.optimizers.Adam(learning_rate=training["learning_rate"]),
+        loss="binary_crossentropy",
+        metrics=["accuracy"],
+        jit_compile=training.get("jit_compile", False),
+        steps_per_execution=training.get("steps_per_execution", 1),
+    )
+    callbacks: List[tf.keras.callbacks.Callback] = []
+    patience = training.get("patience")
+    if patience is not None:
+        callbacks.append(
+            tf.keras.callbacks.EarlyStopping(monitor="val_loss", patience=int(patience), restore_best_weights=True)
+        )
+    pruner = None
+    if history is not None and prune:
+        pruner = _MedianPruner(history, trial.trial_id, **prune)
+        callbacks.append(pruner)
+
+    # Keras copies array inputs into tensors, so the memmaps go through a block-reading
+    # tf.data pipeline instead; each trial then holds a few blocks, not the whole split.
+    blocks = partial(
+        make_block_dataset,
+        batch_size=training["batch_size"],
+        block_size=training.get("streaming_chunk_size") or _BLOCK_SIZE,
+        seed=training.get("random_state", 42),
+    )
+    train_ds = blocks(
+        data["train_context"], data["train_response"], data["train_labels"], shuffle_buffer=training.get("shuffle_buffer", 10_000)
+    )
+    val_ds = blocks(data["val_context"], data["val_response"], data["val_labels"])
+    start = time.perf_counter()
+    fit = model.fit(train_ds, validation_data=val_ds, epochs=training["epochs"], callbacks=callbacks, verbose=0)
+    probs = np.asarray(model.predict(val_ds, verbose=0)).reshape(-1)
+    labels = read_rows(data["val_labels"], 0, len(data["val_labels"]))
+    return {
+        "trial_id": trial.trial_id,
+        "status": "ok",
+        "val_loss": float(min(fit.history["val_loss"])),
+        "val_accuracy": float(max(fit.history["val_accuracy"])),
+        "val_roc_auc": float(roc_auc_score(labels, probs)),
+        "epochs_run": len(fit.history["val_loss"]),
+        "pruned": bool(pruner and pruner.pruned),
+        "seconds": time.perf_counter() - start,
+        # High-water mark of the worker process, which may have run earlier trials.
+        "worker_peak_rss_mb": peak_rss_mb(),
+        **{f"model.{k}": v for k, v in trial.model_params.items()},
+        **{f"training.{k}": v for k, v in trial.training_params.items()},
+    }
+
+
+def _failed_row(trial: SweepTrial, exc: BaseException) -> Dict[str, object]:
+    return {
+        "trial_id": trial.trial_id,
+        "status": "failed",
+        "error": f"{type(exc).__name__}: {exc}",
+        "val_loss": float("nan"),
+        **{f"model.{k}": v for k, v in trial.model_params.items()},
+        **{f"training.{k}": v for k, v in trial.training_params.items()},
+    }
+
+
+def _write_leaderboard(rows: List[Dict[str, object]], path: Path) -> pd.DataFrame:
+    board = pd.DataFrame(rows).sort_values("val_loss").reset_index(drop=True)
+    board.to_csv(path, index=False)
+    return board
+
+
+def run_sweep(
+    data_path: str | Path = "data/processed/train.csv",
+    *,
+    sweep_cfg_path: str | Path = "configs/sweep_config.yaml",
+    model_cfg_path: str | Path = "configs/model_config.yaml",
+    training_cfg_path: str | Path = "configs/training_config.yaml",
+    output_dir: str | Path = "artifacts/sweep",
+) -> pd.DataFrame:
+    """Run every trial of the sweep in a process pool and write ``leaderboard.csv``.
+
+    The leaderboard is rewritten as each trial finishes, so an interrupted sweep keeps the
+    results it already has. Rows are sorted by best validation loss; a trial that raised
+    is kept with ``status="failed"``, its ``error`` and a NaN loss, and the sweep goes on.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    sweep_cfg = load_yaml(sweep_cfg_path)
+    model_cfg = DualStreamConfig(**load_yaml(model_cfg_path))
+    training_cfg = {**load_yaml(training_cfg_path), **(sweep_cfg.get("training_overrides") or {})}
+
+    trials = expand_space(
+        sweep_cfg["space"],
+        strategy=sweep_cfg.get("strategy", "grid"),
+        n_trials=sweep_cfg.get("n_trials", 20),
+        seed=training_cfg.get("random_state", 42),
+    )
+    data_dir = prepare_sweep_data(data_path, model_cfg, training_cfg, output_dir)
+    (output_dir / "sweep_space.json").write_text(json.dumps([asdict(trial) for trial in trials], indent=2), encoding="utf-8")
+
+    threads = int(sweep_cfg.get("threads_per_worker", 1))
+    workers = sweep_cfg.get("max_workers") or max(1, (os.cpu_count() or 1) // threads)
+    prune = sweep_cfg.get("pruning") or {}
+    LOGGER.info("Sweeping %d trials on %d workers x %d threads", len(trials), workers, threads)
+
+    leaderboard_path = output_dir / LEADERBOARD_FILENAME
+    rows: List[Dict[str, object]] = []
+    with multiprocessing.get_context("spawn").Manager() as manager:
+        history = manager.dict() if prune.get("enabled", True) else None
+        task = partial(
+            run_trial,
+            base_model=asdict(model_cfg),
+            base_training=training_cfg,
+            data_dir=str(data_dir),
+            history=history,
+            prune={"warmup_epochs": prune.get("warmup_epochs", 2), "min_trials": prune.get("min_trials", 2)},
+        )
+        # spawn: forking a process that already initialised TensorFlow is unsafe.
+        with worker_thread_limits(threads), ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_limit_threads,
+            initargs=(threads,),
+        ) as pool:
+            futures = {pool.submit(task, trial): trial for trial in trials}
+            for future in as_completed(futures):
+                trial = futures[future]
+                try:
+                    row = future.result()
+                except Exception as exc:  # one bad grid point (or a crashed worker) must not end the sweep
+                    LOGGER.exception("Trial %d failed", trial.trial_id)
+                    row = _failed_row(trial, exc)
+                else:
+                    LOGGER.info(
+                        "Trial %d: val_loss %.4f (%s)",
+                        row["trial_id"],
+                        row["val_loss"],
+                        "pruned" if row["pruned"] else f"{row['epochs_run']} epochs",
+                    )
+                rows.append(row)
+                _write_leaderboard(rows, leaderboard_path)
+
+    board = _write_leaderboard(rows, leaderboard_path)
+    LOGGER.info("Sweep complete. Leaderboard saved to %s", leaderboard_path)
+    return board
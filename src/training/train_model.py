@@ -3,15 +3,39 @@
 from __future__ import annotations
 
 import json
+import shutil
+from dataclasses import asdict
+from functools import partial
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional, Sequence, Tuple
 
+import numpy as np
+import pandas as pd
 import tensorflow as tf
 
-from src.analysis import chi_square_text_category, compute_text_length_tests, plot_distributions, run_regression
+from src.analysis import DistributionSummary, PilotStatsAccumulator, bootstrap_cohens_d, permutation_chi_square, plot_distributions
+from src.models.bucketing import DEFAULT_BOUNDARIES, make_bucketed_dataset, predict_bucketed
 from src.models.dual_attention_model import DualStreamConfig, build_model
-from src.training.dataset import add_rule_sentiment, load_dataset, stratified_train_test_split, tokenize_streams
+from src.models.export import run_export
+from src.models.predictor import MODEL_CONFIG_FILENAME, WEIGHTS_FILENAME
+from src.sentiment.polarity_features import engine_settings
+from src.training.checkpointing import run_fingerprint, training_checkpoints
+from src.training.corpus_cache import TokenizedCorpus, cached_entry, corpus_key, load_or_build_corpus
+from src.training.dataset import (
+    SPLIT_TEST,
+    SPLIT_TRAIN,
+    SPLIT_VALIDATION,
+    iter_blocks,
+    load_streaming_corpus,
+    make_streaming_datasets,
+    read_rows,
+    spill_streaming_corpus,
+    stratified_train_test_split,
+    tokenize_corpus,
+)
 from src.training.evaluate_model import evaluate_predictions
+from src.training.input_pipeline import make_input_datasets
+from src.training.precision import precision_policy, resolve_policy
 from src.utils import configure_logging, load_yaml, seed_everything
 
 LOGGER = configure_logging(name=__name__)
@@ -33,59 +57,272 @@ def run_training_job(
 
     seed_everything(training_cfg.get("random_state", 42))
 
-    data = load_dataset(data_path)
-    data = add_rule_sentiment(data)
-
-    tokenizer, context_seq, response_seq = tokenize_streams(
-        data["Context"],
-        data["Response"],
+    policy = resolve_policy(training_cfg.get("precision_policy", "float32"))
+    with precision_policy(policy):
+        model = build_model(model_cfg, compile=False)
+    optimizer = tf.keras.optimizers.Adam(learning_rate=training_cfg["learning_rate"])
+    model.compile(
+        optimizer=optimizer,
+        loss="binary_crossentropy",
+        metrics=["accuracy"],
+        jit_compile=training_cfg.get("jit_compile", False),
+        steps_per_execution=training_cfg.get("steps_per_execution", 1),
+    )
+    LOGGER.info("Training with %s precision", policy)
+    # A backup is only resumed by a run on the same model config, training config and data.
+    data_key = corpus_key(
+        data_path,
         vocab_size=model_cfg.vocab_size,
         seq_length=model_cfg.seq_length,
+        tokenization=training_cfg.get("tokenization", "keras"),
+        sentiment_engine=engine_settings()["engine"],
+        lexicon_path=engine_settings()["lexicon_path"],
     )
-
-    split = stratified_train_test_split(
-        context_seq,
-        response_seq,
-        data["sentiment"],
-        test_size=training_cfg["test_size"],
-        random_state=training_cfg["random_state"],
+    checkpoints = training_checkpoints(
+        training_cfg, artifacts_dir, fingerprint=run_fingerprint(asdict(model_cfg), training_cfg, data_key)
     )
 
-    model = build_model(model_cfg)
-    optimizer = tf.keras.optimizers.Adam(learning_rate=training_cfg["learning_rate"])
-    model.compile(optimizer=optimizer, loss="binary_crossentropy", metrics=["accuracy"])
+    streaming_chunk_size = training_cfg.get("streaming_chunk_size")
+    if streaming_chunk_size:
+        if training_cfg.get("input_pipeline", "numpy") == "bucketed":
+            raise ValueError("input_pipeline 'bucketed' is not supported with streaming_chunk_size")
+        splits = _streaming_corpus(data_path, model_cfg, training_cfg, artifacts_dir)
+        if not len(splits[SPLIT_TEST].labels):
+            raise ValueError(f"test_size={training_cfg['test_size']} left no test rows in {data_path}; raise it or add data")
+        tokenizer = splits[SPLIT_TRAIN].tokenizer
+        datasets = make_streaming_datasets(
+            splits,
+            batch_size=training_cfg["batch_size"],
+            block_size=streaming_chunk_size,
+            shuffle_buffer=training_cfg.get("shuffle_buffer", 10_000),
+            seed=training_cfg["random_state"],
+        )
+        history = model.fit(
+            datasets[SPLIT_TRAIN],
+            validation_data=datasets[SPLIT_VALIDATION],
+            epochs=training_cfg["epochs"],
+            callbacks=checkpoints.callbacks,
+            verbose=2,
+        )
+        checkpoints.restore_best(model)
+        y_test, y_pred_probs, pilot_stats = _evaluate_streaming(
+            model,
+            splits,
+            block_size=streaming_chunk_size,
+            boundaries=(training_cfg.get("bucket_boundaries") or DEFAULT_BOUNDARIES) if model_cfg.mask_padding else None,
+        )
+        # The plots and the bootstrap read per-group length counts, never the rows.
+        data = pilot_stats.distribution_summaries()
+        plot_mode = "summary"
+        held_out = iter_blocks(splits[SPLIT_TEST], streaming_chunk_size)
+        calibration = (splits[SPLIT_TRAIN].context[:200], splits[SPLIT_TRAIN].response[:200])
+    else:
+        build = partial(tokenize_corpus, data_path, model_cfg, training_cfg)
+        corpus_cache_dir = training_cfg.get("corpus_cache_dir")
+        if corpus_cache_dir:
+            corpus = load_or_build_corpus(
+                data_path,
+                corpus_cache_dir,
+                build,
+                vocab_size=model_cfg.vocab_size,
+                seq_length=model_cfg.seq_length,
+                tokenization=training_cfg.get("tokenization", "keras"),
+                sentiment_engine=engine_settings()["engine"],
+                lexicon_path=engine_settings()["lexicon_path"],
+            )
+        else:
+            corpus = build()
+        tokenizer = corpus.tokenizer
+        data = corpus.analysis_frame()
+        plot_mode = training_cfg.get("plot_mode", "auto")
+        pilot_stats = PilotStatsAccumulator().update(corpus.text_length, corpus.labels)
 
-    history = model.fit(
-        [split.X_train_context, split.X_train_response],
-        split.y_train,
-        epochs=training_cfg["epochs"],
-        batch_size=training_cfg["batch_size"],
-        validation_split=training_cfg["validation_split"],
-        verbose=2,
-    )
+        split = stratified_train_test_split(
+            corpus.context,
+            corpus.response,
+            corpus.labels,
+            test_size=training_cfg["test_size"],
+            random_state=training_cfg["random_state"],
+        )
 
-    y_pred_probs = model.predict([split.X_test_context, split.X_test_response], verbose=0)
-    metrics = evaluate_predictions(split.y_test, y_pred_probs, report_dir=artifacts_dir)
+        input_pipeline = training_cfg.get("input_pipeline", "numpy")
+        if input_pipeline == "bucketed":
+            if not model_cfg.mask_padding:
+                raise ValueError("input_pipeline 'bucketed' needs mask_padding: true in the model config")
+            boundaries = training_cfg.get("bucket_boundaries") or DEFAULT_BOUNDARIES
+            n_val = int(len(split.y_train) * training_cfg["validation_split"])
+            n_train = len(split.y_train) - n_val
+            bucketed = partial(make_bucketed_dataset, batch_size=training_cfg["batch_size"], boundaries=boundaries)
+            train_ds = bucketed(
+                split.X_train_context[:n_train],
+                split.X_train_response[:n_train],
+                split.y_train[:n_train],
+                seed=training_cfg["random_state"],
+            )
+            val_ds = bucketed(
+                split.X_train_context[n_train:], split.X_train_response[n_train:], split.y_train[n_train:], shuffle=False
+            )
+            history = model.fit(
+                train_ds,
+                validation_data=val_ds,
+                epochs=training_cfg["epochs"],
+                callbacks=checkpoints.callbacks,
+                verbose=2,
+            )
+        elif input_pipeline == "tfdata":
+            train_ds, val_ds = make_input_datasets(
+                split,
+                batch_size=training_cfg["batch_size"],
+                validation_split=training_cfg["validation_split"],
+                shuffle_buffer=training_cfg.get("shuffle_buffer", 10_000),
+                cache_dir=training_cfg.get("tfdata_cache_dir"),
+                seed=training_cfg["random_state"],
+            )
+            history = model.fit(
+                train_ds,
+                validation_data=val_ds,
+                epochs=training_cfg["epochs"],
+                callbacks=checkpoints.callbacks,
+                verbose=2,
+            )
+        else:
+            history = model.fit(
+                [split.X_train_context, split.X_train_response],
+                split.y_train,
+                epochs=training_cfg["epochs"],
+                batch_size=training_cfg["batch_size"],
+                validation_split=training_cfg["validation_split"],
+                callbacks=checkpoints.callbacks,
+                verbose=2,
+            )
+        checkpoints.restore_best(model)
 
-    stats = compute_text_length_tests(data)
-    regression = run_regression(data)
-    chi_square = chi_square_text_category(data)
-    plot_distributions(data, plots_dir)
+        y_test = split.y_test
+        held_out = [(split.X_test_context, split.X_test_response, split.y_test)]
+        calibration = (split.X_train_context[:200], split.X_train_response[:200])
+        if model_cfg.mask_padding:
+            boundaries = training_cfg.get("bucket_boundaries") or DEFAULT_BOUNDARIES
+            y_pred_probs = predict_bucketed(model, split.X_test_context, split.X_test_response, boundaries=boundaries)
+        else:
+            y_pred_probs = model.predict([split.X_test_context, split.X_test_response], verbose=0)
+
+    metrics = evaluate_predictions(y_test, y_pred_probs, report_dir=artifacts_dir)
+
+    regression = pilot_stats.regression()
+    chi_square = pilot_stats.chi_square()
+    plot_distributions(data, plots_dir, mode=plot_mode)
 
     report = {
         "training_history": history.history,
         "metrics": metrics,
-        "text_length_stats": stats,
-        "regression_summary": regression.summary().as_text(),
+        "text_length_stats": pilot_stats.text_length_tests(),
+        "regression": regression.to_dict(),
+        "regression_summary": regression.summary(),
         "chi_square": chi_square,
+        "resampling": _resampling_report(data, chi_square, training_cfg),
     }
+    tokenizer_path = artifacts_dir / "tokenizer.json"
+    with open(tokenizer_path, "w", encoding="utf-8") as fp:
+        fp.write(tokenizer.to_json())
+    weights_path = artifacts_dir / WEIGHTS_FILENAME
+    model.save_weights(weights_path)
+    with open(artifacts_dir / MODEL_CONFIG_FILENAME, "w", encoding="utf-8") as fp:
+        json.dump(asdict(model_cfg), fp, indent=2)
+
+    export_quantization = training_cfg.get("export_quantization")
+    if export_quantization:
+        report["export"] = run_export(
+            model,
+            tokenizer,
+            model_cfg,
+            artifacts_dir,
+            quantization=export_quantization,
+            calibration=calibration,
+            held_out=held_out,
+            weights_path=weights_path,
+            measure_rss=training_cfg.get("export_measure_rss", True),
+        )
+
     report_path = artifacts_dir / "pilot_report.json"
     with open(report_path, "w", encoding="utf-8") as fp:
         json.dump(report, fp, indent=2)
 
-    tokenizer_path = artifacts_dir / "tokenizer.json"
-    with open(tokenizer_path, "w", encoding="utf-8") as fp:
-        json.dump(tokenizer.to_json(), fp)
-
     LOGGER.info("Training complete. Report saved to %s", report_path)
     return report
+
+
+def _resampling_report(
+    data: pd.DataFrame | Dict[int, DistributionSummary], chi_square: Dict[str, object], training_cfg: Dict[str, object]
+) -> Dict[str, Dict[str, float]]:
+    seed = training_cfg.get("random_state", 42)
+    report = {}
+    bootstrap_resamples = training_cfg.get("bootstrap_resamples", 2000)
+    if bootstrap_resamples:
+        report["cohens_d_bootstrap"] = bootstrap_cohens_d(
+            data, resamples=bootstrap_resamples, seed=seed, workers=training_cfg.get("resampling_workers", 1)
+        )
+    permutation_resamples = training_cfg.get("permutation_resamples", 10_000)
+    if permutation_resamples:
+        report["chi_square_permutation"] = permutation_chi_square(
+            chi_square["contingency"], resamples=permutation_resamples, seed=seed
+        )
+    return report
+
+
+def _streaming_corpus(
+    data_path: str | Path, model_cfg: DualStreamConfig, training_cfg: Dict[str, object], artifacts_dir: Path
+) -> Dict[int, TokenizedCorpus]:
+    """Label and tokenize the CSV once into per-split memmaps; with ``corpus_cache_dir`` set
+    the spill is a cache entry reused by later runs, otherwise it is rebuilt under ``artifacts_dir``."""
+    params = dict(
+        vocab_size=model_cfg.vocab_size,
+        seq_length=model_cfg.seq_length,
+        chunk_size=training_cfg["streaming_chunk_size"],
+        test_size=training_cfg["test_size"],
+        validation_split=training_cfg["validation_split"],
+        random_state=training_cfg["random_state"],
+    )
+    build_into = partial(
+        spill_streaming_corpus, data_path, labeling_workers=training_cfg.get("labeling_workers", 1), **params
+    )
+    corpus_cache_dir = training_cfg.get("corpus_cache_dir")
+    if corpus_cache_dir:
+        directory = cached_entry(
+            data_path,
+            corpus_cache_dir,
+            build_into,
+            layout="streaming_splits",
+            sentiment_engine=engine_settings()["engine"],
+            lexicon_path=engine_settings()["lexicon_path"],
+            **params,
+        )
+    else:
+        directory = artifacts_dir / "streaming_corpus"
+        shutil.rmtree(directory, ignore_errors=True)
+        build_into(directory)
+    return load_streaming_corpus(directory)
+
+
+def _evaluate_streaming(
+    model: tf.keras.Model,
+    splits: Dict[int, TokenizedCorpus],
+    *,
+    block_size: int,
+    boundaries: Optional[Sequence[int]] = None,
+) -> Tuple[np.ndarray, np.ndarray, PilotStatsAccumulator]:
+    """Predict the test split and fold every split into the pilot statistics, ``block_size``
+    spilled rows at a time; with ``boundaries`` (a masked model) each block is predicted bucket by bucket."""
+    test = splits[SPLIT_TEST]
+    if boundaries is None:
+        probs = [model.predict([context, response], verbose=0) for context, response, _ in iter_blocks(test, block_size)]
+    else:
+        probs = [
+            predict_bucketed(model, context, response, boundaries=boundaries)
+            for context, response, _ in iter_blocks(test, block_size)
+        ]
+    pilot_stats = PilotStatsAccumulator()
+    for corpus in splits.values():
+        for start in range(0, len(corpus.labels), block_size):
+            stop = start + block_size
+            pilot_stats.update(read_rows(corpus.text_length, start, stop), read_rows(corpus.labels, start, stop))
+    return read_rows(test.labels, 0, len(test.labels)).astype(np.float32), np.concatenate(probs), pilot_stats
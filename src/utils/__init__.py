@@ -1,5 +1,16 @@
+from .cache import CacheStats, TTLCache
 from .config import load_yaml
 from .logging_utils import configure_logging
-from .seed_everything import seed_everything
+from .seed_everything import seed_everything, spawn_seeds
+from .threads import peak_rss_mb, worker_thread_limits
 
-__all__ = ["load_yaml", "configure_logging", "seed_everything"]
+__all__ = [
+    "CacheStats",
+    "TTLCache",
+    "load_yaml",
+    "configure_logging",
+    "seed_everything",
+    "spawn_seeds",
+    "worker_thread_limits",
+    "peak_rss_mb",
+]
@@ -0,0 +1,87 @@
+"""Thread-safe bounded LRU cache with TTL expiry and hit/miss counters."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TTLCache:
+    """LRU eviction once ``maxsize`` entries are held; entries older than ``ttl`` seconds expire.
+
+    ``ttl=None`` means entries never expire; ``maxsize=0`` disables caching.
+
+    ``compute`` runs outside the lock, so a slow miss never blocks hits from other
+    threads; two threads missing the same key at once may both compute it.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 100_000,
+        ttl: Optional[float] = 3600.0,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if maxsize < 0:
+            raise ValueError("maxsize must be >= 0")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be > 0, or None for no expiry")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        now = self._clock()
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                expires, value = item
+                if expires is None or expires > now:
+                    self._data.move_to_end(key)
+                    self._hits += 1
+                    return value
+                del self._data[key]
+                self._evictions += 1
+            self._misses += 1
+        value = compute()
+        if self.maxsize == 0:
+            return value
+        with self._lock:
+            self._data[key] = (None if self.ttl is None else now + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._evictions += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(hits=self._hits, misses=self._misses, evictions=self._evictions, size=len(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
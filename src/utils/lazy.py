@@ -0,0 +1,36 @@
+"""Module-level ``__getattr__`` for packages whose exports pull in heavy dependencies."""
+
+from __future__ import annotations
+
+from importlib import import_module
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """``__getattr__`` / ``__dir__`` for ``package`` that import ``exports[name]`` on first use.
+
+    ``exports`` maps each public name to the relative submodule defining it. The first
+    access imports that submodule and caches all of its exported values in the package
+    namespace, so ``import src.x`` stays cheap and later lookups skip the hook.
+
+    A name may not equal its submodule's name: importing the submodule binds the module
+    object to that attribute, and the hook would never run.
+    """
+    clashes = sorted(name for name, submodule in exports.items() if submodule == f".{name}")
+    if clashes:
+        raise ValueError(f"Lazy exports {clashes} shadow their own submodules; import them eagerly")
+    namespace = import_module(package).__dict__
+
+    def __getattr__(name: str) -> Any:
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module = import_module(exports[name], package)
+        for other, submodule in exports.items():
+            if submodule == exports[name]:
+                namespace[other] = getattr(module, other)
+        return namespace[name]
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
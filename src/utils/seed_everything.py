@@ -4,25 +4,29 @@ from __future__ import annotations
 
 import os
 import random
-from typing import Optional
+from typing import List, Optional
 
 import numpy as np
 
-try:
-    import tensorflow as tf
-except ImportError:  # pragma: no cover
-    tf = None  # type: ignore
 
-try:
-    import torch
-except ImportError:  # pragma: no cover
-    torch = None  # type: ignore
-
-
-def seed_everything(seed: int, deterministic: bool = True) -> None:
+def seed_everything(seed: int, deterministic: bool = True, *, frameworks: bool = True) -> None:
+    """``frameworks=False`` seeds only Python and NumPy, without importing TensorFlow or torch."""
     random.seed(seed)
     np.random.seed(seed)
     os.environ["PYTHONHASHSEED"] = str(seed)
+    if not frameworks:
+        return
+    # TensorFlow and torch are imported here, not at module level, so importing src.utils
+    # (e.g. for the game) does not load either framework.
+    try:
+        import tensorflow as tf
+    except ImportError:  # pragma: no cover
+        tf = None  # type: ignore
+    try:
+        import torch
+    except ImportError:  # pragma: no cover
+        torch = None  # type: ignore
+
     if tf is not None:
         tf.random.set_seed(seed)
     if torch is not None:
@@ -32,3 +36,12 @@ def seed_everything(seed: int, deterministic: bool = True) -> None:
             if deterministic:
                 torch.backends.cudnn.deterministic = True
                 torch.backends.cudnn.benchmark = False
+
+
+def spawn_seeds(seed: int, count: int) -> List[np.random.SeedSequence]:
+    """``count`` independent, reproducible child seeds of ``seed`` (one per worker or block).
+
+    Feed each to ``np.random.default_rng``; the streams do not overlap, and the same
+    ``(seed, count)`` always gives the same children regardless of which process uses them.
+    """
+    return np.random.SeedSequence(seed).spawn(count)
@@ -0,0 +1,45 @@
+"""Thread-pool caps and memory accounting for spawned worker processes."""
+
+from __future__ import annotations
+
+import os
+import re
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+# Read once when each runtime starts its pools: OpenMP (torch intra-op), MKL / OpenBLAS
+# (NumPy, scikit-learn) and TensorFlow's intra/inter-op executors.
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "TF_NUM_INTRAOP_THREADS",
+    "TF_NUM_INTEROP_THREADS",
+)
+
+
+@contextmanager
+def worker_thread_limits(threads: int) -> Iterator[None]:
+    """Set ``THREAD_ENV_VARS`` to ``threads`` while the block runs.
+
+    A spawned worker copies ``os.environ`` when it starts and re-imports the parent's main
+    module (and so TensorFlow / torch) before any pool initializer runs, so the caps have
+    to be in the environment it inherits. Workers must therefore start inside the block.
+    """
+    saved: Dict[str, Optional[str]] = {name: os.environ.get(name) for name in THREAD_ENV_VARS}
+    os.environ.update({name: str(threads) for name in THREAD_ENV_VARS})
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def peak_rss_mb() -> float:
+    """This process's peak resident set size in MiB."""
+    # VmHWM rather than ru_maxrss: Linux carries ru_maxrss across the spawn's exec.
+    with open("/proc/self/status", encoding="utf-8") as fp:
+        return int(re.search(r"VmHWM:\s+(\d+)", fp.read()).group(1)) / 1024
@@ -0,0 +1,29 @@
+"""Export of the dual-stream model to TFLite."""
+
+import pytest
+
+pytest.importorskip("tensorflow")
+
+import numpy as np  # noqa: E402
+from tensorflow.keras.preprocessing.text import Tokenizer  # noqa: E402
+
+from src.models.dual_attention_model import DualStreamConfig, build_model  # noqa: E402
+from src.models.export import export_lite_model  # noqa: E402
+from src.serving.lite_runtime import LitePredictor  # noqa: E402
+
+TINY = dict(vocab_size=50, seq_length=12, embedding_dim=8, lstm_units=4, conv_filters=4, dense_units=4, memory_units=8)
+
+
+def test_masked_model_exports_at_fixed_length(tmp_path):
+    config = DualStreamConfig(**TINY, mask_padding=True)
+    model = build_model(config, compile=False)
+    tokenizer = Tokenizer(num_words=config.vocab_size)
+    tokenizer.fit_on_texts(["I look awful today", "it went fine"])
+
+    export_lite_model(model, tokenizer, config, tmp_path, quantization="float32")
+
+    rng = np.random.default_rng(0)
+    context, response = (rng.integers(0, config.vocab_size, (3, config.seq_length)).astype(np.int32) for _ in range(2))
+    context[:, :5] = 0  # left padding, as pad_sequences writes it
+    expected = np.asarray(model.predict([context, response], verbose=0)).reshape(-1)
+    np.testing.assert_allclose(LitePredictor.from_export(tmp_path).predict_ids(context, response), expected, atol=1e-5)
@@ -0,0 +1,54 @@
+"""End-to-end smoke test of the hyperparameter sweep."""
+
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("tensorflow")
+pytest.importorskip("textblob")
+
+import pandas as pd  # noqa: E402
+import yaml  # noqa: E402
+
+from src.training.sweep import run_sweep  # noqa: E402
+
+CONFIGS = Path(__file__).resolve().parents[1] / "configs"
+
+
+def _write_yaml(path: Path, payload: dict) -> Path:
+    path.write_text(yaml.safe_dump(payload), encoding="utf-8")
+    return path
+
+
+def test_run_sweep_keeps_going_past_a_failed_trial(tmp_path):
+    rows = [("How was today?", "I feel great and happy"), ("How was today?", "I feel terrible and sad")] * 20
+    csv_path = tmp_path / "train.csv"
+    pd.DataFrame(rows, columns=["Context", "Response"]).to_csv(csv_path, index=False)
+    model_cfg = _write_yaml(tmp_path / "model.yaml", {"vocab_size": 50, "seq_length": 8, "embedding_dim": 8, "lstm_units": 4})
+    training = yaml.safe_load((CONFIGS / "training_config.yaml").read_text(encoding="utf-8"))
+    training_cfg = _write_yaml(tmp_path / "training.yaml", {**training, "batch_size": 8})
+    sweep_cfg = _write_yaml(
+        tmp_path / "sweep.yaml",
+        {
+            "strategy": "grid",
+            "max_workers": 2,
+            "pruning": {"enabled": False},
+            "training_overrides": {"epochs": 1},
+            # A dropout rate above 1 is rejected by Keras, so the second trial fails.
+            "space": {"model": {"dropout_rate": [0.2, 1.5]}},
+        },
+    )
+
+    board = run_sweep(
+        csv_path,
+        sweep_cfg_path=sweep_cfg,
+        model_cfg_path=model_cfg,
+        training_cfg_path=training_cfg,
+        output_dir=tmp_path / "sweep",
+    )
+
+    assert sorted(board["status"]) == ["failed", "ok"]
+    ok = board[board["status"] == "ok"].iloc[0]
+    assert ok["model.dropout_rate"] == 0.2 and ok["val_loss"] == ok["val_loss"]
+    assert board[board["status"] == "failed"]["val_loss"].isna().all()
+    assert (tmp_path / "sweep" / "leaderboard.csv").exists()